@@ -0,0 +1,253 @@
+"""
+Offline latency and throughput benchmark against a local CoinGecko stand-in.
+
+Starts ``FakeCoinGeckoServer`` and drives ``CryptoInfo``, ``CoinGeckoClient``
+and ``lambda_handler`` through a set of scenarios, reporting p50/p95/p99
+latency, operations per second, failed operations and memory allocated per
+operation (measured with tracemalloc in a separate pass, so tracing does not
+skew the timings).
+
+Usage:
+    python benchmarks/bench_client.py [--iterations 200] [--latency-ms 5] [--rate-429 0.01]
+    python benchmarks/bench_client.py --scenario single_price --scenario batched_prices
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+from benchmarks.fake_server import FakeCoinGeckoServer
+from crypto_info import CryptoInfo
+from crypto_info.coingecko_client import CoinGeckoClient
+from crypto_info.connection import get_shared_session
+from crypto_info.rate_limit import RetryPolicy
+from crypto_info.symbol_index import SymbolIndex
+
+# Set by --shared-session: every client uses one connection pool
+SHARED_SESSION = False
+
+# Builds an operation to time from the server, returning a callable run once per iteration
+Scenario = Callable[[FakeCoinGeckoServer], Callable[[], object]]
+
+def make_client(server: FakeCoinGeckoServer) -> CoinGeckoClient:
+    """Create a client for the stand-in server, without client-side rate limiting."""
+    return CoinGeckoClient(
+        base_url=server.base_url,
+        requests_per_minute=None,
+        retry_policy=RetryPolicy(max_retries=3, backoff_base=0.01, backoff_max=0.1),
+        session=get_shared_session("benchmark") if SHARED_SESSION else None
+    )
+
+def make_crypto_info(server: FakeCoinGeckoServer, symbol_index: Optional[SymbolIndex] = None) -> CryptoInfo:
+    """Create a CryptoInfo for the stand-in server, with an empty symbol index by default."""
+    return CryptoInfo(api_client=make_client(server),
+                      symbol_index=symbol_index or SymbolIndex.from_coins([]))
+
+def single_price(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """One /simple/price request per call, symbol already resolved."""
+    crypto_info = make_crypto_info(server)
+    crypto_info.get_price("btc")
+    return lambda: crypto_info.get_price("btc")
+
+def batched_prices(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """Prices of 100 symbols in batched /simple/price requests."""
+    crypto_info = make_crypto_info(server)
+    symbols = [fixtures.coin_symbol(i) for i in range(100)]
+    crypto_info.get_prices(symbols)
+    return lambda: crypto_info.get_prices(symbols)
+
+def full_info(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """Full /coins/{id} document per call."""
+    crypto_info = make_crypto_info(server)
+    crypto_info.get_crypto_info("btc")
+    return lambda: crypto_info.get_crypto_info("btc")
+
+def cold_symbol_search(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """Symbol resolution through /search on a new CryptoInfo per call."""
+    client = make_client(server)
+    return lambda: CryptoInfo(api_client=client, symbol_index=SymbolIndex.from_coins([]))._get_coin_id("eth")
+
+def cold_symbol_index(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """Symbol resolution through a loaded local index on a new CryptoInfo per call."""
+    client = make_client(server)
+    index = SymbolIndex.from_coins(fixtures.coins_list(len(server._coins)))
+    index.lookup("btc")
+    return lambda: CryptoInfo(api_client=client, symbol_index=index)._get_coin_id("eth")
+
+def warm_symbol(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """Symbol resolution from the resolved-symbol cache."""
+    crypto_info = make_crypto_info(server)
+    crypto_info._get_coin_id("eth")
+    return lambda: crypto_info._get_coin_id("eth")
+
+def coins_list(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """Full /coins/list download and decode."""
+    client = make_client(server)
+    return client.get_coins_list
+
+def lambda_single(server: FakeCoinGeckoServer) -> Callable[[], object]:
+    """lambda_handler for ?symbol=BTC with a warm module-level CryptoInfo."""
+    import lambda_function
+
+    lambda_function.crypto_info = make_crypto_info(server)
+    event = {"queryStringParameters": {"symbol": "BTC"}}
+    lambda_function.lambda_handler(event, None)
+    return lambda: lambda_function.lambda_handler(event, None)
+
+SCENARIOS: Dict[str, Scenario] = {
+    "single_price": single_price,
+    "batched_prices": batched_prices,
+    "full_info": full_info,
+    "cold_symbol_search": cold_symbol_search,
+    "cold_symbol_index": cold_symbol_index,
+    "warm_symbol": warm_symbol,
+    "coins_list": coins_list,
+    "lambda_single": lambda_single,
+}
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get a percentile of sorted values by the nearest-rank method."""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run(operation: Callable[[], object], iterations: int, concurrency: int = 1) -> Dict[str, float]:
+    """
+    Time an operation.
+
+    Args:
+        operation: Callable to time, or with concurrency > 1 a factory
+            returning a per-thread callable
+        iterations: Calls per thread
+        concurrency: Number of threads calling concurrently
+
+    Returns:
+        Dictionary of latency percentiles in milliseconds, throughput and errors
+    """
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(call: Callable[[], object]):
+        local = []
+        failed = 0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            try:
+                call()
+            except Exception:
+                failed += 1
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    calls = [operation() for _ in range(concurrency)] if concurrency > 1 else [operation]
+    threads = [threading.Thread(target=worker, args=(call,)) for call in calls]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "errors": errors[0],
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": statistics.fmean(latencies) if latencies else float("nan"),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else float("nan"),
+    }
+
+def allocations(operation: Callable[[], object], iterations: int) -> Dict[str, float]:
+    """
+    Measure memory allocated by an operation with tracemalloc.
+
+    Returns:
+        Dictionary with the peak traced memory per call in KiB and the
+        memory still allocated after all calls (retained) in KiB
+    """
+    iterations = max(1, min(iterations, 50))
+    operation()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            operation()
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - before)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib": peak / 1024, "retained_kib": (current - baseline) / 1024}
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark and return the process exit code."""
+    parser = argparse.ArgumentParser(description="Benchmark crypto_info against a local CoinGecko stand-in")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default all)")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per scenario (and per thread)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Threads for the concurrent variant of single_price, each with its own client")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=2.0, help="Maximum extra random server latency")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--coins", type=int, default=15000, help="Coins served by the stand-in")
+    parser.add_argument("--shared-session", action="store_true",
+                        help="Share one connection pool between all clients")
+    parser.add_argument("--no-alloc", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args(argv)
+
+    global SHARED_SESSION
+    SHARED_SESSION = args.shared_session
+    names = args.scenario or list(SCENARIOS)
+    with FakeCoinGeckoServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                             rate_429=args.rate_429, coins=args.coins) as server:
+        runs = [(name, 1) for name in names]
+        if "single_price" in names and args.concurrency > 1:
+            runs.append(("single_price", args.concurrency))
+
+        if not args.json:
+            print(f"{'scenario':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ops/s':>9} "
+                  f"{'errors':>6} {'peak KiB':>9} {'kept KiB':>9}")
+        for name, concurrency in runs:
+            scenario = SCENARIOS[name]
+            if concurrency > 1:
+                result = run(lambda: scenario(server), args.iterations, concurrency)
+            else:
+                operation = scenario(server)
+                result = run(operation, args.iterations)
+                if not args.no_alloc:
+                    result.update(allocations(operation, args.iterations))
+
+            label = name if concurrency == 1 else f"{name} x{concurrency} threads"
+            if args.json:
+                print(json.dumps(dict(result, scenario=label)))
+            else:
+                print(f"{label:<28} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['p99_ms']:8.2f} "
+                      f"{result['ops_per_sec']:9.1f} {result['errors']:6d} "
+                      f"{result.get('peak_kib', float('nan')):9.1f} {result.get('retained_kib', float('nan')):9.1f}")
+
+        if not args.json:
+            print(f"\nServer: {server.stats['requests']} requests, {server.stats['throttled']} throttled, "
+                  f"{server.stats['bytes'] / 1024 / 1024:.1f} MiB sent")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+JSON decoder micro-benchmark on CoinGecko-shaped payloads.
+
+Compares every installed backend decoding from bytes, the stdlib decoding
+from str (what ``response.json()`` does after building the text), and the
+incremental array parser used by the streaming list endpoints.
+
+Usage:
+    python benchmarks/bench_decoders.py [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+from crypto_info.decoders import available_decoders, iter_json_array
+
+PAYLOADS = {
+    "/coins/{id}": lambda: fixtures.encode(fixtures.coin_document()),
+    "/search": lambda: fixtures.encode(fixtures.search()),
+    "/simple/price (250 ids)": lambda: fixtures.encode(fixtures.simple_price(
+        [fixtures.coin_id(i) for i in range(250)], ["usd", "eur", "btc"])),
+    "/coins/markets (250)": lambda: fixtures.encode(fixtures.markets_page()),
+    "/coins/list": lambda: fixtures.encode(fixtures.coins_list()),
+}
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    """Get the fastest of several runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def _chunks(body: bytes, size: int = 65536) -> List[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark and return the process exit code."""
+    parser = argparse.ArgumentParser(description="Compare JSON decoders on CoinGecko payloads")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement")
+    args = parser.parse_args(argv)
+
+    decoders = available_decoders()
+    print(f"Backends: {', '.join(decoders)}")
+
+    for name, build in PAYLOADS.items():
+        body = build()
+        print(f"\n{name}: {len(body) / 1024:.0f} KiB")
+        print(f"  {'json (str, like response.json())':<36} {best_time(lambda: json.loads(body.decode('utf-8')), args.repeat):8.3f} ms")
+        for backend, decode in decoders.items():
+            print(f"  {backend + ' (bytes)':<36} {best_time(lambda: decode(body), args.repeat):8.3f} ms")
+        if body.startswith(b"["):
+            chunks = _chunks(body)
+            print(f"  {'iter_json_array (64 KiB chunks)':<36} "
+                  f"{best_time(lambda: sum(1 for _ in iter_json_array(chunks)), args.repeat):8.3f} ms")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Local stand-in for the CoinGecko API used by the benchmarks.
+
+Serves the payloads from ``benchmarks.fixtures`` on the endpoints the
+package calls, with configurable latency, jitter, 429 rate and payload size,
+so client performance can be measured without network access:
+
+    with FakeCoinGeckoServer(latency=0.02, jitter=0.005, rate_429=0.01) as server:
+        client = CoinGeckoClient(base_url=server.base_url, requests_per_minute=None)
+
+Usage:
+    python benchmarks/fake_server.py [--port 8080] [--latency-ms 20]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures
+
+API_PREFIX = "/api/v3"
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler dispatching to the owning FakeCoinGeckoServer."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs add ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, headers, body = self.server.app.handle(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeCoinGeckoServer:
+    """
+    Threaded HTTP server answering like the CoinGecko API.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, rate_429: float = 0.0, retry_after: float = 0.0,
+                 coins: int = 15000, description_bytes: int = 4000, seed: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Delay in seconds added before every response
+            jitter: Maximum extra random delay in seconds
+            rate_429: Fraction of requests answered with 429 Too Many Requests
+            retry_after: Retry-After value in seconds sent with 429 responses
+            coins: Number of coins in /coins/list and /coins/markets
+            description_bytes: Size of the description in /coins/{id} documents
+            seed: Seed for payload values and injected failures
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.description_bytes = description_bytes
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._coins = fixtures.coins_list(coins, seed)
+        self._by_symbol: Dict[str, List[int]] = {}
+        for i, coin in enumerate(self._coins):
+            self._by_symbol.setdefault(coin["symbol"], []).append(i)
+        self._index = {coin["id"]: i for i, coin in enumerate(self._coins)}
+        self._coins_list_body = fixtures.encode(self._coins)
+        self._documents: Dict[int, bytes] = {}
+        self.stats = {"requests": 0, "throttled": 0, "bytes": 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """API root to pass as the client's base_url."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "FakeCoinGeckoServer":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-coingecko", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeCoinGeckoServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def handle(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one request.
+
+        Args:
+            path: Request path including the query string
+
+        Returns:
+            Tuple of (status code, extra headers, body)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            throttled = self._random.random() < self.rate_429
+            if throttled:
+                self.stats["throttled"] += 1
+        if delay > 0:
+            time.sleep(delay)
+
+        if throttled:
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, b'{"status":{"error_code":429}}'
+
+        url = urlsplit(path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        route = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        status, body = self._route(route, params)
+        with self._lock:
+            self.stats["bytes"] += len(body)
+        return status, {}, body
+
+    def _route(self, route: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+        """Build the response for an endpoint."""
+        if route == "/ping":
+            return 200, b'{"gecko_says":"(V3) To the Moon!"}'
+        if route == "/coins/list":
+            return 200, self._coins_list_body
+        if route == "/coins/markets":
+            page = int(params.get("page", 1))
+            per_page = int(params.get("per_page", 100))
+            vs_currency = params.get("vs_currency", "usd")
+            if params.get("ids"):
+                # A page of one record per requested coin, in rank order
+                rows = sorted(self._index[cid] for cid in params["ids"].split(",") if cid in self._index)
+                records = [
+                    fixtures.markets_page(i + 1, 1, len(self._coins), vs_currency, self.seed)[0]
+                    for i in rows[(page - 1) * per_page:page * per_page]
+                ]
+            else:
+                records = fixtures.markets_page(page, per_page, len(self._coins), vs_currency, self.seed)
+            return 200, fixtures.encode(records)
+        if route == "/simple/price":
+            ids = [cid for cid in params.get("ids", "").split(",") if cid in self._index]
+            vs_currencies = params.get("vs_currencies", "usd").split(",")
+            return 200, fixtures.encode(fixtures.simple_price(ids, vs_currencies, self.seed))
+        if route == "/search":
+            query = params.get("query", "").lower()
+            matches = self._by_symbol.get(query, [])
+            payload = fixtures.search(query, count=0)
+            payload["coins"] = [
+                {"id": self._coins[i]["id"], "name": self._coins[i]["name"],
+                 "symbol": self._coins[i]["symbol"].upper(), "market_cap_rank": i + 1}
+                for i in matches
+            ]
+            return 200, fixtures.encode(payload)
+        if route.startswith("/coins/"):
+            i = self._index.get(route[len("/coins/"):])
+            if i is None:
+                return 404, b'{"error":"coin not found"}'
+            return 200, self._document(i)
+        return 404, b'{"error":"unknown endpoint"}'
+
+    def _document(self, i: int) -> bytes:
+        """Get the encoded /coins/{id} document of a coin, generating it once."""
+        body = self._documents.get(i)
+        if body is None:
+            body = fixtures.encode(fixtures.coin_document(i, self.seed, self.description_bytes))
+            self._documents[i] = body
+        return body
+
+def main(argv: List[str] = None) -> int:
+    """Run the server in the foreground."""
+    parser = argparse.ArgumentParser(description="Serve a local CoinGecko stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--coins", type=int, default=15000)
+    args = parser.parse_args(argv)
+
+    server = FakeCoinGeckoServer(args.host, args.port, args.latency_ms / 1000, args.jitter_ms / 1000,
+                                 args.rate_429, coins=args.coins)
+    print(f"Serving on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+CoinGecko-shaped response payloads for benchmarks.
+
+The payloads are generated deterministically with the structure and field
+names of real API responses (a /coins/{id} document has every per-currency
+market data field for ~60 currencies, /coins/list has ~15k coins), so
+benchmarks run offline and give the same sizes on every machine.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+CURRENCIES = [
+    "usd", "eur", "gbp", "jpy", "cny", "krw", "inr", "aud", "cad", "chf", "brl", "rub",
+    "try", "sek", "nok", "dkk", "pln", "czk", "huf", "ils", "mxn", "nzd", "sgd", "hkd",
+    "twd", "thb", "php", "idr", "myr", "vnd", "zar", "ngn", "pkr", "bdt", "lkr", "uah",
+    "aed", "sar", "kwd", "bhd", "clp", "ars", "mmk", "gel", "btc", "eth", "ltc", "bch",
+    "bnb", "eos", "xrp", "xlm", "link", "dot", "yfi", "xdr", "xag", "xau", "bits", "sats",
+]
+
+PER_CURRENCY_FIELDS = [
+    "current_price", "market_cap", "total_volume", "high_24h", "low_24h", "ath", "atl",
+    "fully_diluted_valuation", "price_change_24h_in_currency",
+    "price_change_percentage_24h_in_currency", "market_cap_change_24h_in_currency",
+]
+
+def coin_id(i: int) -> str:
+    """Get the CoinGecko ID of the i-th synthetic coin (0 and 1 are bitcoin and ethereum)."""
+    return ["bitcoin", "ethereum"][i] if i < 2 else f"coin-{i}"
+
+def coin_symbol(i: int) -> str:
+    """Get the symbol of the i-th synthetic coin."""
+    return ["btc", "eth"][i] if i < 2 else f"c{i}"
+
+def coins_list(count: int = 15000, seed: int = 0) -> List[Dict[str, Any]]:
+    """Payload of /coins/list."""
+    return [
+        {"id": coin_id(i), "symbol": coin_symbol(i), "name": coin_id(i).replace("-", " ").title()}
+        for i in range(count)
+    ]
+
+def coin_document(i: int = 0, seed: int = 0, description_bytes: int = 4000) -> Dict[str, Any]:
+    """Payload of /coins/{id} for the i-th synthetic coin."""
+    rng = random.Random(seed * 1000003 + i)
+    price = rng.uniform(0.001, 50000)
+    market_data = {
+        field: {currency: rng.uniform(0, price * 1e6) for currency in CURRENCIES}
+        for field in PER_CURRENCY_FIELDS
+    }
+    market_data["current_price"]["usd"] = price
+    market_data.update({
+        "price_change_24h": rng.uniform(-price / 10, price / 10),
+        "price_change_percentage_24h": rng.uniform(-10, 10),
+        "price_change_percentage_7d": rng.uniform(-20, 20),
+        "circulating_supply": rng.uniform(1e6, 1e9),
+        "total_supply": rng.uniform(1e6, 1e9),
+        "last_updated": "2024-01-01T00:00:00.000Z",
+    })
+    return {
+        "id": coin_id(i),
+        "symbol": coin_symbol(i),
+        "name": coin_id(i).replace("-", " ").title(),
+        "market_cap_rank": i + 1,
+        "description": {"en": ("Lorem ipsum dolor sit amet. " * (description_bytes // 28 + 1))[:description_bytes]},
+        "image": {size: f"https://assets.coingecko.com/coins/images/{i}/{size}/coin.png"
+                  for size in ("thumb", "small", "large")},
+        "links": {"homepage": [f"https://{coin_id(i)}.org", "", ""]},
+        "tickers": [
+            {"base": coin_symbol(i).upper(), "target": currency.upper(), "last": rng.uniform(0, price),
+             "volume": rng.uniform(0, 1e9), "market": {"name": f"Exchange {n}"}}
+            for n, currency in enumerate(CURRENCIES[:40])
+        ],
+        "market_data": market_data,
+        "last_updated": "2024-01-01T00:00:00.000Z",
+    }
+
+def search(query: str = "btc", count: int = 25) -> Dict[str, Any]:
+    """Payload of /search."""
+    return {
+        "coins": [
+            {"id": coin_id(i), "name": coin_id(i).title(), "api_symbol": coin_id(i),
+             "symbol": coin_symbol(i).upper(), "market_cap_rank": i + 1,
+             "thumb": f"https://assets.coingecko.com/coins/images/{i}/thumb/coin.png"}
+            for i in range(count)
+        ],
+        "exchanges": [], "icos": [], "categories": [], "nfts": [],
+    }
+
+def simple_price(ids: List[str], vs_currencies: List[str], seed: int = 0) -> Dict[str, Any]:
+    """Payload of /simple/price with market cap, volume, 24h change and timestamps."""
+    rng = random.Random(seed)
+    result = {}
+    for cid in ids:
+        entry = {}
+        for currency in vs_currencies:
+            entry[currency] = rng.uniform(0.001, 50000)
+            entry[f"{currency}_market_cap"] = rng.uniform(1e6, 1e12)
+            entry[f"{currency}_24h_vol"] = rng.uniform(1e3, 1e10)
+            entry[f"{currency}_24h_change"] = rng.uniform(-10, 10)
+        entry["last_updated_at"] = 1704067200
+        result[cid] = entry
+    return result
+
+def markets_page(page: int = 1, per_page: int = 250, total: int = 15000,
+                 vs_currency: str = "usd", seed: int = 0) -> List[Dict[str, Any]]:
+    """Payload of one /coins/markets page."""
+    rng = random.Random(seed * 1000003 + page)
+    records = []
+    for i in range((page - 1) * per_page, min(page * per_page, total)):
+        price = rng.uniform(0.001, 50000)
+        records.append({
+            "id": coin_id(i), "symbol": coin_symbol(i), "name": coin_id(i).title(),
+            "image": f"https://assets.coingecko.com/coins/images/{i}/large/coin.png",
+            "current_price": price, "market_cap": price * 1e6, "market_cap_rank": i + 1,
+            "fully_diluted_valuation": price * 2e6, "total_volume": price * 1e5,
+            "high_24h": price * 1.05, "low_24h": price * 0.95,
+            "price_change_24h": price * 0.01, "price_change_percentage_24h": 1.0,
+            "market_cap_change_24h": price * 1e4, "market_cap_change_percentage_24h": 1.0,
+            "circulating_supply": 1e7, "total_supply": 2e7, "max_supply": None,
+            "ath": price * 2, "ath_change_percentage": -50.0, "ath_date": "2021-11-10T14:24:11.849Z",
+            "atl": price / 100, "atl_change_percentage": 9900.0, "atl_date": "2013-07-06T00:00:00.000Z",
+            "roi": None, "last_updated": "2024-01-01T00:00:00.000Z",
+        })
+    return records
+
+def encode(payload: Any) -> bytes:
+    """Serialize a payload the way the API does (compact UTF-8 JSON)."""
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,90 @@
+"""
+Import-time benchmark based on ``python -X importtime``.
+
+Measures the cumulative import time of the package for a few import
+statements, each in a fresh interpreter, and fails when a budget is exceeded
+or when ``import crypto_info`` loads the HTTP stack.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--budget-ms 50]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+STATEMENTS = [
+    "import crypto_info",
+    "from crypto_info import CryptoInfo",
+    "from crypto_info import CryptoInfo; CryptoInfo()",
+]
+
+# Modules that must not be imported by a bare ``import crypto_info``
+FORBIDDEN_ON_PACKAGE_IMPORT = ["requests", "urllib3", "aiohttp"]
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(statement: str) -> Tuple[float, Dict[str, int]]:
+    """
+    Import in a fresh interpreter and parse the ``-X importtime`` report.
+
+    Args:
+        statement: Python statement to run
+
+    Returns:
+        Tuple of (total cumulative milliseconds of top-level imports made by the
+        statement, cumulative microseconds per module)
+    """
+    # Imports done by interpreter startup are excluded by importing them first
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True
+    )
+    baseline = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True, text=True, check=True
+    )
+    startup_modules = {m.group(4) for m in _LINE_RE.finditer(baseline.stderr)}
+
+    cumulative: Dict[str, int] = {}
+    total_us = 0
+    for match in _LINE_RE.finditer(result.stderr):
+        module, depth = match.group(4), len(match.group(3))
+        cumulative[module] = int(match.group(2))
+        if depth == 1 and module not in startup_modules:
+            total_us += int(match.group(2))
+
+    return total_us / 1000, cumulative
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmark and return the process exit code."""
+    parser = argparse.ArgumentParser(description="Measure crypto_info import time")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per statement")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="Maximum median import time of 'import crypto_info'")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for statement in STATEMENTS:
+        timings = []
+        for _ in range(args.runs):
+            total_ms, cumulative = measure(statement)
+            timings.append(total_ms)
+        median = statistics.median(timings)
+        print(f"{statement:<50} median {median:7.1f} ms  min {min(timings):7.1f} ms")
+
+        if statement == "import crypto_info":
+            loaded = [name for name in FORBIDDEN_ON_PACKAGE_IMPORT if name in cumulative]
+            if loaded:
+                print(f"  FAIL: 'import crypto_info' loaded {', '.join(loaded)}")
+                failed = True
+            if median > args.budget_ms:
+                print(f"  FAIL: over the {args.budget_ms:.0f} ms budget")
+                failed = True
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
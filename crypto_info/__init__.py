@@ -1,14 +1,18 @@
 """
 Crypto Info package for retrieving cryptocurrency information and prices.
+
+Public classes are loaded lazily on first attribute access, so importing the
+package does not pull in the HTTP stack. Logging is left to the application;
+the package only installs a NullHandler.
 """
 import logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-from .crypto_info import CryptoInfo
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __all__ = ['CryptoInfo']
+
+def __getattr__(name):
+    if name == 'CryptoInfo':
+        from .crypto_info import CryptoInfo
+        return CryptoInfo
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
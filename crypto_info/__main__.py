@@ -0,0 +1,8 @@
+"""
+Run the bulk pricing command with ``python -m crypto_info``.
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
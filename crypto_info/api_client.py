@@ -2,27 +2,68 @@
 API client for interacting with cryptocurrency data providers.
 """
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple, Union
 import requests
 from requests.exceptions import RequestException, Timeout, HTTPError
 
+from . import deadline
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+from .connection import PooledSession
+from .decoders import iter_json_array
+from .metrics import MetricsSink
+from .rate_limit import TokenBucket, RetryPolicy, parse_retry_after
+from .singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 class APIClient:
     """
     Base API client for making HTTP requests to cryptocurrency data providers.
     """
-    def __init__(self, base_url: str, timeout: int = 30):
+    def __init__(self, base_url: str, timeout: float = 30,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 json_decoder: Optional[Callable[[bytes], Any]] = None,
+                 metrics: Optional[MetricsSink] = None,
+                 session: Optional[requests.Session] = None,
+                 connect_timeout: Optional[float] = None,
+                 endpoint_timeouts: Optional[Dict[str, float]] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         """
         Initialize the API client.
         
         Args:
             base_url: Base URL for the API
-            timeout: Request timeout in seconds
+            timeout: Read timeout in seconds (also the connect timeout unless
+                connect_timeout is given)
+            rate_limiter: Optional token bucket every request must take a token from
+            retry_policy: Optional policy for retrying 429/5xx responses and timeouts
+            single_flight: Optional group coalescing concurrent identical GET requests
+            json_decoder: Optional function decoding the raw response body (see
+                decoders.get_decoder); defaults to response.json()
+            metrics: Optional sink for request latency, bytes, decode time and
+                retries (instrumentation is skipped when None)
+            session: Optional session to send requests with, e.g. one shared
+                between clients (defaults to a new connection.PooledSession)
+            connect_timeout: Optional separate timeout for opening a connection
+            endpoint_timeouts: Read timeouts overriding timeout, by endpoint
+                label (see _endpoint_label)
+            circuit_breaker: Optional breaker failing requests fast with
+                CircuitOpenError after consecutive upstream failures
         """
         self.base_url = base_url
         self.timeout = timeout
-        self.session = requests.Session()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.single_flight = single_flight
+        self.json_decoder = json_decoder
+        self.metrics = metrics
+        self.session = session if session is not None else PooledSession()
+        self.connect_timeout = connect_timeout
+        self.endpoint_timeouts = dict(endpoint_timeouts or {})
+        self.circuit_breaker = circuit_breaker
     
     def _make_request(self, endpoint: str, method: str = "GET", 
                      params: Optional[Dict[str, Any]] = None,
@@ -30,6 +71,10 @@ class APIClient:
         """
         Make an HTTP request to the API.
         
+        Identical concurrent GET requests share one call when a single-flight
+        group is configured, and failed attempts are retried according to the
+        retry policy.
+        
         Args:
             endpoint: API endpoint to call
             method: HTTP method (GET, POST, etc.)
@@ -47,23 +92,235 @@ class APIClient:
         """
         url = f"{self.base_url}{endpoint}"
         
+        if self.single_flight is not None and method == "GET":
+            key = (
+                url,
+                tuple(sorted((params or {}).items())),
+                tuple(sorted((headers or {}).items()))
+            )
+            return self.single_flight.do(
+                key, lambda: self._request_with_retries(url, method, params, headers)
+            )
+        
+        return self._request_with_retries(url, method, params, headers)
+    
+    def _request_with_retries(self, url: str, method: str, params: Optional[Dict[str, Any]],
+                              headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Make an HTTP request, retrying according to the retry policy.
+        
+        Args:
+            url: Full URL to call
+            method: HTTP method (GET, POST, etc.)
+            params: Query parameters
+            headers: HTTP headers
+            
+        Returns:
+            API response as a dictionary
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceeded: If the call's deadline passes before an attempt
+        """
+        if self.retry_policy is not None:
+            self.retry_policy.budget.deposit()
+        
+        attempt = 0
+        while True:
+            deadline.check(f"{method} {url}")
+            breaker = self.circuit_breaker
+            # Fail fast without waiting for a rate limiter token
+            if breaker is not None and breaker.state == OPEN:
+                raise CircuitOpenError(breaker.name, breaker.retry_after())
+            
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(timeout=deadline.remaining()):
+                raise deadline.DeadlineExceeded(f"Deadline exceeded waiting for the rate limiter for {url}")
+            
+            if breaker is not None and not breaker.allow_request():
+                raise CircuitOpenError(breaker.name, breaker.retry_after())
+            
+            try:
+                result = self._send(url, method, params, headers)
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_error(e)
+                if not isinstance(e, (Timeout, HTTPError, ConnectionError)):
+                    raise
+                delay = self._get_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                left = deadline.remaining()
+                if left is not None and delay >= left:
+                    logger.warning("Not retrying %s %s, %.2f seconds left before the deadline", method, url, left)
+                    raise
+                logger.warning("Retrying %s %s in %.2f seconds (retry %d of %d): %s",
+                               method, url, delay, attempt + 1, self.retry_policy.max_retries, e)
+                if self.metrics is not None:
+                    self.metrics.increment('crypto_info_retries_total', labels={
+                        'endpoint': self._endpoint_label(url),
+                        'reason': self._retry_reason(e),
+                    })
+                time.sleep(delay)
+                attempt += 1
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+    
+    def _endpoint_label(self, url: str) -> str:
+        """
+        Get the endpoint label used in metrics for a request URL.
+        
+        Subclasses collapse path parameters (such as coin IDs) so the number
+        of metric series stays bounded.
+        
+        Args:
+            url: Full URL of the request
+            
+        Returns:
+            Endpoint path relative to the base URL
+        """
+        return url[len(self.base_url):] if url.startswith(self.base_url) else url
+    
+    def _timeout_for(self, url: str) -> Union[float, Tuple[float, float]]:
+        """
+        Get the requests timeout of a request, capped at the call's remaining deadline.
+        
+        The read timeout bounds each wait for data rather than the whole
+        response, so a response trickling in may still overrun the deadline
+        slightly.
+        
+        Args:
+            url: Full URL of the request
+            
+        Returns:
+            Read timeout, or (connect, read) timeouts when connect_timeout is set
+            
+        Raises:
+            DeadlineExceeded: If the call's deadline has passed
+        """
+        read = self.endpoint_timeouts.get(self._endpoint_label(url), self.timeout) if self.endpoint_timeouts else self.timeout
+        connect = self.connect_timeout
+        
+        left = deadline.remaining()
+        if left is not None:
+            if left <= 0:
+                raise deadline.DeadlineExceeded(f"Deadline exceeded before request to {url}")
+            read = min(read, left)
+            if connect is not None:
+                connect = min(connect, left)
+        
+        return read if connect is None else (connect, read)
+    
+    @staticmethod
+    def _retry_reason(error: Exception) -> str:
+        """Get the reason label of a retried error: the status code, 'timeout' or 'connection_error'."""
+        if isinstance(error, HTTPError):
+            return str(getattr(getattr(error, 'response', None), 'status_code', 'http_error'))
+        if isinstance(error, Timeout):
+            return 'timeout'
+        return 'connection_error'
+    
+    def _get_retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Decide whether a failed request is retried.
+        
+        A 429 response also pauses the shared rate limiter, so every client
+        in the process backs off instead of only the one that was throttled.
+        
+        Args:
+            error: Exception raised by the failed attempt
+            attempt: Number of retries already made
+            
+        Returns:
+            Delay in seconds before the retry, or None if it must not be retried
+        """
+        policy = self.retry_policy
+        if policy is None or attempt >= policy.max_retries:
+            return None
+        
+        status_code = None
+        retry_after = None
+        if isinstance(error, HTTPError):
+            response = getattr(error, 'response', None)
+            status_code = getattr(response, 'status_code', None)
+            if status_code not in policy.retry_statuses:
+                return None
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        elif not policy.retry_on_timeout:
+            return None
+        
+        if not policy.budget.try_withdraw():
+            logger.warning("Retry budget exhausted, not retrying")
+            return None
+        
+        delay = policy.compute_delay(attempt, retry_after)
+        if status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.penalize(delay)
+        return delay
+    
+    def _send(self, url: str, method: str, params: Optional[Dict[str, Any]],
+              headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Make a single HTTP request attempt.
+        
+        Args:
+            url: Full URL to call
+            method: HTTP method (GET, POST, etc.)
+            params: Query parameters
+            headers: HTTP headers
+            
+        Returns:
+            API response as a dictionary
+            
+        Raises:
+            ValueError: If the API returns an error
+            ConnectionError: If there's a network issue
+            Timeout: If the request times out
+            HTTPError: If the API returns a non-200 status code
+        """
+        metrics = self.metrics
+        timeout = self._timeout_for(url)
+        if metrics is not None:
+            endpoint = self._endpoint_label(url)
+            start = time.perf_counter()
+        
         try:
-            logger.debug(f"Making {method} request to {url} with params: {params}")
+            logger.debug("Making %s request to %s with params: %s", method, url, params)
             
             response = self.session.request(
                 method=method,
                 url=url,
                 params=params,
                 headers=headers,
-                timeout=self.timeout
+                timeout=timeout
             )
             
+            if metrics is not None:
+                body = response.content
+                metrics.observe('crypto_info_request_seconds', time.perf_counter() - start,
+                                {'endpoint': endpoint, 'status': str(response.status_code)})
+                metrics.increment('crypto_info_response_bytes_total', len(body), {'endpoint': endpoint})
+            
             response.raise_for_status()
             
-            return response.json()
+            if metrics is None:
+                return self._decode(response)
+            
+            start = time.perf_counter()
+            result = self._decode(response)
+            metrics.observe('crypto_info_decode_seconds', time.perf_counter() - start,
+                            {'endpoint': endpoint})
+            return result
             
         except Timeout:
-            logger.error(f"Request to {url} timed out after {self.timeout} seconds")
+            if metrics is not None:
+                metrics.observe('crypto_info_request_seconds', time.perf_counter() - start,
+                                {'endpoint': endpoint, 'status': 'timeout'})
+            logger.error(f"Request to {url} timed out after {timeout} seconds")
+            if deadline.remaining() == 0.0:
+                # Cut short by the caller's deadline rather than a slow upstream
+                raise deadline.DeadlineExceeded(f"Deadline exceeded during request to {url}")
             raise Timeout(f"Request to {url} timed out")
             
         except HTTPError as e:
@@ -86,9 +343,70 @@ class APIClient:
                 raise
             
         except RequestException as e:
+            if metrics is not None:
+                metrics.observe('crypto_info_request_seconds', time.perf_counter() - start,
+                                {'endpoint': endpoint, 'status': 'connection_error'})
             logger.error(f"Request error: {e}")
             raise ConnectionError(f"Failed to connect to {url}: {e}")
             
         except ValueError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             raise ValueError(f"Invalid response format: {e}")
+    
+    def _decode(self, response: requests.Response) -> Any:
+        """Decode a JSON response body."""
+        if self.json_decoder is not None:
+            # Decode straight from the raw bytes, skipping the str copy
+            return self.json_decoder(response.content)
+        return response.json()
+    
+    def _stream_json_array(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                           headers: Optional[Dict[str, str]] = None,
+                           chunk_size: int = 65536) -> Iterator[Any]:
+        """
+        Stream the elements of a JSON array response as they arrive.
+        
+        The body is parsed incrementally, so large list endpoints are never
+        held in memory as a whole. The request is rate limited but not
+        retried, since elements may already have been consumed.
+        
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters
+            headers: HTTP headers
+            chunk_size: Size of the chunks read from the connection
+            
+        Yields:
+            Decoded array elements
+            
+        Raises:
+            ValueError: If the response is not a well-formed JSON array
+            ConnectionError: If there's a network issue
+            Timeout: If the request times out
+            HTTPError: If the API returns a non-200 status code
+        """
+        url = f"{self.base_url}{endpoint}"
+        
+        if self.rate_limiter is not None and not self.rate_limiter.acquire(timeout=deadline.remaining()):
+            raise deadline.DeadlineExceeded(f"Deadline exceeded waiting for the rate limiter for {url}")
+        timeout = self._timeout_for(url)
+        
+        try:
+            logger.debug("Streaming GET request to %s with params: %s", url, params)
+            
+            with self.session.request(method="GET", url=url, params=params, headers=headers,
+                                      timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                yield from iter_json_array(response.iter_content(chunk_size=chunk_size))
+        
+        except Timeout:
+            logger.error(f"Request to {url} timed out after {timeout} seconds")
+            raise Timeout(f"Request to {url} timed out")
+        
+        except HTTPError as e:
+            logger.error(f"HTTP error: {e}")
+            raise
+        
+        except RequestException as e:
+            logger.error(f"Request error: {e}")
+            raise ConnectionError(f"Failed to connect to {url}: {e}")
@@ -0,0 +1,238 @@
+"""
+Asyncio API clients for interacting with cryptocurrency data providers.
+
+Requires the optional ``aiohttp`` dependency (``pip install crypto_info[async]``).
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+class AsyncAPIClient:
+    """
+    Base asyncio API client sharing one connection pool across all requests.
+
+    The connection pool and concurrency limiter belong to the event loop that
+    created them. When the client is used from another loop (e.g. a second
+    ``asyncio.run``), the old session is closed and both are created again
+    for that loop; a session passed in by the caller must belong to the loop
+    the client is used from.
+    """
+    def __init__(self, base_url: str, timeout: int = 30, max_concurrency: int = 50,
+                 session: Optional['aiohttp.ClientSession'] = None):
+        """
+        Initialize the async API client.
+
+        The HTTP session is created on the first request, inside the running
+        event loop.
+
+        Args:
+            base_url: Base URL for the API
+            timeout: Request timeout in seconds
+            max_concurrency: Maximum number of requests in flight at once
+            session: Optional aiohttp session to share between clients
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        """Drop the semaphore and close the owned session created on another event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self._loop is not None and self._owns_session:
+            # Its connections belong to the previous loop; a new session is created
+            self._discard_session()
+        self._semaphore = None
+        self._loop = loop
+
+    def _discard_session(self):
+        """Close the owned session left behind by another event loop, without awaiting."""
+        session, self._session = self._session, None
+        if session is None or session.closed:
+            return
+        # session.close() cannot be awaited once its loop is gone, so close the
+        # connector's transports directly; on a closed loop this only marks it closed
+        close = getattr(session.connector, '_close', None)
+        if close is None:
+            logger.debug("Detached session %r of a previous event loop without closing it", session)
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Failed to close session of a previous event loop: {e}")
+
+    async def _get_session(self) -> 'aiohttp.ClientSession':
+        """Get the shared HTTP session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            if aiohttp is None:
+                raise ImportError("AsyncAPIClient requires aiohttp: pip install crypto_info[async]")
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+            self._owns_session = True
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency limiter, created lazily so it binds to the running loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _make_request(self, endpoint: str, method: str = "GET",
+                            params: Optional[Dict[str, Any]] = None,
+                            headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Make an HTTP request to the API.
+
+        Args:
+            endpoint: API endpoint to call
+            method: HTTP method (GET, POST, etc.)
+            params: Query parameters
+            headers: HTTP headers
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            ValueError: If the response is not valid JSON
+            ConnectionError: If there's a network issue
+            TimeoutError: If the request times out
+            aiohttp.ClientResponseError: If the API returns a non-2xx status code
+        """
+        url = f"{self.base_url}{endpoint}"
+        # aiohttp only accepts string query values
+        if params is not None:
+            params = {key: str(value) for key, value in params.items()}
+
+        self._bind_loop()
+        session = await self._get_session()
+
+        async with self._get_semaphore():
+            try:
+                logger.debug("Making async %s request to %s with params: %s", method, url, params)
+
+                async with session.request(method, url, params=params, headers=headers) as response:
+                    if response.status >= 400:
+                        error_detail = await response.text()
+                        logger.error(f"HTTP error: {response.status} for {url}")
+                        raise aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=f"API error: {error_detail}",
+                            headers=response.headers
+                        )
+
+                    return await response.json(content_type=None)
+
+            except asyncio.TimeoutError:
+                logger.error(f"Request to {url} timed out after {self.timeout} seconds")
+                raise TimeoutError(f"Request to {url} timed out")
+
+            except aiohttp.ClientResponseError:
+                raise
+
+            except aiohttp.ClientError as e:
+                logger.error(f"Request error: {e}")
+                raise ConnectionError(f"Failed to connect to {url}: {e}")
+
+            except ValueError as e:
+                logger.error(f"Failed to parse JSON response: {e}")
+                raise ValueError(f"Invalid response format: {e}")
+
+    async def close(self):
+        """Close the HTTP session if this client created it."""
+        if self._session is not None and self._owns_session and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> 'AsyncAPIClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+class AsyncCoinGeckoClient(AsyncAPIClient):
+    """
+    Asyncio client for interacting with the CoinGecko API.
+    """
+    def __init__(self, timeout: int = 30, max_concurrency: int = 50,
+                 session: Optional['aiohttp.ClientSession'] = None,
+                 base_url: str = "https://api.coingecko.com/api/v3"):
+        """
+        Initialize the async CoinGecko API client.
+
+        Args:
+            timeout: Request timeout in seconds
+            max_concurrency: Maximum number of requests in flight at once
+            session: Optional aiohttp session to share between clients
+            base_url: API root, e.g. a local stand-in server for benchmarks
+        """
+        super().__init__(base_url=base_url, timeout=timeout,
+                         max_concurrency=max_concurrency, session=session)
+
+    async def get_coin_by_id(self, coin_id: str, localization: bool = False,
+                             tickers: bool = False, market_data: bool = True,
+                             community_data: bool = False, developer_data: bool = False,
+                             sparkline: bool = False) -> Dict[str, Any]:
+        """
+        Get current data for a coin by its CoinGecko ID.
+
+        See CoinGeckoClient.get_coin_by_id for the arguments.
+        """
+        params = {
+            'localization': str(localization).lower(),
+            'tickers': str(tickers).lower(),
+            'market_data': str(market_data).lower(),
+            'community_data': str(community_data).lower(),
+            'developer_data': str(developer_data).lower(),
+            'sparkline': str(sparkline).lower()
+        }
+
+        return await self._make_request(f"/coins/{coin_id}", params=params)
+
+    async def get_coin_price(self, coin_ids: List[str], vs_currencies: List[str],
+                             include_market_cap: bool = False,
+                             include_24hr_vol: bool = False,
+                             include_24hr_change: bool = False,
+                             include_last_updated_at: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Get current price of coins in the specified currencies.
+
+        See CoinGeckoClient.get_coin_price for the arguments.
+        """
+        params = {
+            'ids': ','.join(coin_ids),
+            'vs_currencies': ','.join(vs_currencies),
+            'include_market_cap': str(include_market_cap).lower(),
+            'include_24hr_vol': str(include_24hr_vol).lower(),
+            'include_24hr_change': str(include_24hr_change).lower(),
+            'include_last_updated_at': str(include_last_updated_at).lower()
+        }
+
+        return await self._make_request("/simple/price", params=params)
+
+    async def search_coins(self, query: str) -> Dict[str, Any]:
+        """
+        Search for coins, categories and markets listed on CoinGecko.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Search results as a dictionary
+        """
+        params = {'query': query}
+        return await self._make_request("/search", params=params)
@@ -0,0 +1,227 @@
+"""
+Asyncio counterpart of the CryptoInfo class.
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List
+
+from .async_client import AsyncCoinGeckoClient
+from .crypto_info import CryptoInfo
+from .symbol_index import SymbolIndex
+
+logger = logging.getLogger(__name__)
+
+class AsyncCryptoInfo:
+    """
+    Asyncio class for retrieving cryptocurrency information.
+
+    Mirrors CryptoInfo, with batch helpers that run many lookups concurrently
+    on one event loop.
+    """
+    def __init__(self, api_client=None, symbol_index: Optional[SymbolIndex] = None):
+        """
+        Initialize the AsyncCryptoInfo class.
+
+        Args:
+            api_client: Optional async API client to use (defaults to AsyncCoinGeckoClient)
+            symbol_index: Optional symbol index consulted before network search
+                (defaults to the lazily loaded index at DEFAULT_INDEX_PATH)
+        """
+        self.api_client = api_client or AsyncCoinGeckoClient()
+        self.symbol_index = symbol_index if symbol_index is not None else SymbolIndex()
+        self._id_cache = {}  # Cache for symbol to ID mapping
+
+    async def _get_coin_id(self, symbol: str) -> str:
+        """
+        Get the CoinGecko ID for a cryptocurrency symbol.
+
+        Args:
+            symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+
+        Returns:
+            CoinGecko ID for the symbol
+
+        Raises:
+            ValueError: If the symbol cannot be found
+        """
+        symbol = symbol.lower()
+
+        if symbol in self._id_cache:
+            return self._id_cache[symbol]
+
+        if not self.symbol_index.loaded:
+            # Reading and decompressing the index file blocks, keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.symbol_index.load)
+
+        coin_id = self.symbol_index.lookup(symbol)
+        if coin_id:
+            self._id_cache[symbol] = coin_id
+            return coin_id
+
+        try:
+            search_results = await self.api_client.search_coins(symbol)
+            coins = search_results.get('coins', [])
+
+            # Find exact match for symbol
+            for coin in coins:
+                if coin.get('symbol', '').lower() == symbol:
+                    self._id_cache[symbol] = coin.get('id')
+                    return coin.get('id')
+
+            # If no exact match, use the first result if available
+            if coins:
+                self._id_cache[symbol] = coins[0].get('id')
+                logger.warning(f"No exact match for symbol '{symbol}', using '{coins[0].get('id')}'")
+                return coins[0].get('id')
+
+            raise ValueError(f"Could not find cryptocurrency with symbol '{symbol}'")
+
+        except Exception as e:
+            logger.error(f"Error finding coin ID for symbol '{symbol}': {e}")
+            raise ValueError(f"Could not find cryptocurrency with symbol '{symbol}': {e}")
+
+    async def get_crypto_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Get detailed information about a cryptocurrency by its symbol.
+
+        Args:
+            symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+
+        Returns:
+            Dictionary containing cryptocurrency information
+
+        Raises:
+            ValueError: If the symbol cannot be found
+        """
+        try:
+            coin_id = await self._get_coin_id(symbol)
+            coin_data = await self.api_client.get_coin_by_id(coin_id)
+            return CryptoInfo._extract_crypto_info(coin_data)
+
+        except Exception as e:
+            logger.error(f"Error getting information for symbol '{symbol}': {e}")
+            raise ValueError(f"Failed to get information for cryptocurrency '{symbol}': {e}")
+
+    async def get_price(self, symbol: str, vs_currencies: List[str] = None) -> Dict[str, float]:
+        """
+        Get the current price of a cryptocurrency in various currencies.
+
+        Args:
+            symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+            vs_currencies: List of currencies to get prices in (defaults to ['usd', 'eur', 'gbp'])
+
+        Returns:
+            Dictionary of prices by currency
+
+        Raises:
+            ValueError: If the symbol cannot be found
+        """
+        if vs_currencies is None:
+            vs_currencies = ['usd', 'eur', 'gbp']
+
+        try:
+            coin_id = await self._get_coin_id(symbol)
+            price_data = await self.api_client.get_coin_price(
+                [coin_id],
+                vs_currencies,
+                include_24hr_change=True,
+                include_market_cap=True
+            )
+
+            if coin_id in price_data:
+                return price_data[coin_id]
+            else:
+                raise ValueError(f"No price data found for cryptocurrency '{symbol}'")
+
+        except Exception as e:
+            logger.error(f"Error getting price for symbol '{symbol}': {e}")
+            raise ValueError(f"Failed to get price for cryptocurrency '{symbol}': {e}")
+
+    async def get_prices(self, symbols: List[str],
+                         vs_currencies: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current prices of several cryptocurrencies at once.
+
+        Symbols are resolved concurrently, then the ID chunks are requested
+        from /simple/price concurrently. Failures are reported per symbol.
+
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            vs_currencies: List of currencies to get prices in (defaults to ['usd', 'eur', 'gbp'])
+
+        Returns:
+            Dictionary keyed by the requested symbols. Each value is either the
+            price dictionary returned by get_price or ``{'error': message}``.
+        """
+        if vs_currencies is None:
+            vs_currencies = ['usd', 'eur', 'gbp']
+
+        unique_symbols = list(dict.fromkeys(symbols))
+        coin_ids = await asyncio.gather(
+            *(self._get_coin_id(symbol) for symbol in unique_symbols),
+            return_exceptions=True
+        )
+
+        results: Dict[str, Dict[str, Any]] = {}
+        symbols_by_id: Dict[str, List[str]] = {}
+        for symbol, coin_id in zip(unique_symbols, coin_ids):
+            if isinstance(coin_id, Exception):
+                results[symbol] = {'error': str(coin_id)}
+            else:
+                symbols_by_id.setdefault(coin_id, []).append(symbol)
+
+        chunks = CryptoInfo._chunk_coin_ids(list(symbols_by_id))
+        responses = await asyncio.gather(
+            *(self.api_client.get_coin_price(chunk, vs_currencies,
+                                             include_24hr_change=True,
+                                             include_market_cap=True)
+              for chunk in chunks),
+            return_exceptions=True
+        )
+
+        for chunk, price_data in zip(chunks, responses):
+            for coin_id in chunk:
+                for symbol in symbols_by_id[coin_id]:
+                    if isinstance(price_data, Exception):
+                        results[symbol] = {'error': f"Failed to get price for cryptocurrency '{symbol}': {price_data}"}
+                    elif coin_id in price_data:
+                        results[symbol] = price_data[coin_id]
+                    else:
+                        results[symbol] = {'error': f"No price data found for cryptocurrency '{symbol}'"}
+
+        return {symbol: results[symbol] for symbol in unique_symbols}
+
+    async def get_crypto_info_many(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information for several cryptocurrencies concurrently.
+
+        /coins/{id} cannot be batched, so one request per symbol is issued and
+        the client's concurrency limit bounds how many are in flight.
+
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+
+        Returns:
+            Dictionary keyed by the requested symbols. Each value is either the
+            dictionary returned by get_crypto_info or ``{'error': message}``.
+        """
+        unique_symbols = list(dict.fromkeys(symbols))
+        infos = await asyncio.gather(
+            *(self.get_crypto_info(symbol) for symbol in unique_symbols),
+            return_exceptions=True
+        )
+
+        return {
+            symbol: {'error': str(info)} if isinstance(info, Exception) else info
+            for symbol, info in zip(unique_symbols, infos)
+        }
+
+    async def close(self):
+        """Close the underlying API client."""
+        await self.api_client.close()
+
+    async def __aenter__(self) -> 'AsyncCryptoInfo':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,268 @@
+"""
+Response cache for cryptocurrency data, in process or shared through a backend.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Hashable, Iterable, List, Tuple
+
+from .metrics import MetricsSink
+
+logger = logging.getLogger(__name__)
+
+FRESH = 'fresh'
+STALE = 'stale'
+MISS = 'miss'
+
+# Time-to-live in seconds per endpoint
+DEFAULT_TTLS = {
+    'price': 30.0,
+    'coin': 60.0,
+    # Symbol to coin ID resolutions rarely change
+    'symbol': 86400.0,
+}
+
+class ResponseCache:
+    """
+    Bounded LRU cache with per-endpoint TTLs and stale-while-revalidate.
+
+    An entry is fresh for the TTL of its endpoint, then stale for another
+    ``stale_ttl`` seconds. Stale entries are still returned to callers while a
+    single background refresh per key replaces them. With ``stale_if_error``
+    an entry is kept that much longer again and served when loading a new
+    value fails, e.g. while the upstream's circuit breaker is open. Cached
+    values are shared between callers and must not be mutated.
+
+    Entries live in a ``CacheBackend`` (see crypto_info.cache_backends): an
+    in-process LRU by default, or a SQLite file or Redis server shared with
+    other processes.
+    """
+    def __init__(self, max_entries: int = 1024, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 30.0, stale_ttl: float = 60.0,
+                 stale_if_error: float = 0.0,
+                 clock: Optional[Callable[[], float]] = None,
+                 metrics: Optional[MetricsSink] = None,
+                 backend: Optional['CacheBackend'] = None):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted
+            ttls: Time-to-live in seconds per endpoint (merged over DEFAULT_TTLS)
+            default_ttl: Time-to-live for endpoints missing from ttls
+            stale_ttl: How long an expired entry may still be served while it is refreshed
+            stale_if_error: How long after that an entry may still be served
+                when loading a new value fails (0 disables)
+            clock: Time source (defaults to time.monotonic, or time.time for
+                a shared backend whose deadlines other processes read)
+            metrics: Optional sink counting lookups by result (see crypto_info.metrics)
+            backend: Entry storage (defaults to a MemoryBackend of max_entries)
+        """
+        if backend is None:
+            # Imported here so importing this module does not load sqlite3 and socket
+            from .cache_backends import MemoryBackend
+            backend = MemoryBackend(max_entries)
+        self.max_entries = max_entries
+        self.backend = backend
+        if clock is None:
+            clock = time.time if self.backend.shared else time.monotonic
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.stale_if_error = stale_if_error
+        self._clock = clock
+        self.metrics = metrics
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'errors_served_stale': 0,
+        }
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Get the time-to-live in seconds for an endpoint."""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: Hashable, namespace: Optional[str] = None) -> Tuple[str, Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+            namespace: Optional name under which the lookup is counted instead
+                of the main hit counters (e.g. 'symbol' gives 'symbol_hits'),
+                so lookups of other kinds do not skew the response hit rate
+
+        Returns:
+            Tuple of (state, value) where state is FRESH, STALE or MISS
+        """
+        return self._classify(key, self.backend.get(key), self._clock(), namespace)
+
+    def get_many(self, keys: List[Hashable]) -> List[Tuple[str, Any]]:
+        """
+        Look up several cached values, in one backend round trip where possible.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Tuple of (state, value) for each key, in order
+        """
+        entries = self.backend.get_many(keys)
+        now = self._clock()
+        return [self._classify(key, entry, now) for key, entry in zip(keys, entries)]
+
+    def _classify(self, key: Hashable, entry: Optional[Tuple[Any, float, float]], now: float,
+                  namespace: Optional[str] = None) -> Tuple[str, Any]:
+        """Get the state of a backend entry and update the hit counters."""
+        state, value = MISS, None
+        if entry is not None:
+            if now < entry[1]:
+                state, value = FRESH, entry[0]
+            elif now < entry[2]:
+                state, value = STALE, entry[0]
+            elif now >= entry[2] + self.stale_if_error:
+                self.backend.delete(key)
+
+        counter = {FRESH: 'hits', STALE: 'stale_hits', MISS: 'misses'}[state]
+        metric = 'crypto_info_cache_lookups_total'
+        if namespace is not None:
+            counter = f"{namespace}_{counter}"
+            metric = f"crypto_info_cache_{namespace}_lookups_total"
+        with self._lock:
+            self._stats[counter] = self._stats.get(counter, 0) + 1
+        if self.metrics is not None:
+            self.metrics.increment(metric, labels={'result': state})
+        return state, value
+
+    def get_if_error(self, key: Hashable) -> Tuple[str, Any]:
+        """
+        Look up a value to serve because loading a new one failed.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (state, value) where state is STALE if an entry within
+            the stale_if_error window exists, otherwise MISS
+        """
+        entry = self.backend.get(key)
+        if entry is None or self._clock() >= entry[2] + self.stale_if_error:
+            return MISS, None
+        with self._lock:
+            self._stats['errors_served_stale'] += 1
+        return STALE, entry[0]
+
+    def set(self, key: Hashable, value: Any, endpoint: str):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            endpoint: Endpoint name used to pick the TTL
+        """
+        ttl = self.ttl_for(endpoint)
+        fresh_until = self._clock() + ttl
+        self.backend.set(key, (value, fresh_until, fresh_until + self.stale_ttl),
+                         ttl + self.stale_ttl + self.stale_if_error)
+
+    def get_or_load(self, key: Hashable, endpoint: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, loading it on a miss and refreshing it in the background when stale.
+
+        Args:
+            key: Cache key
+            endpoint: Endpoint name used to pick the TTL
+            loader: Callable returning a fresh value
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        state, value = self.get(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            self.refresh_many([key], endpoint, lambda: {key: loader()})
+            return value
+
+        try:
+            value = loader()
+        except Exception as e:
+            state, value = self.get_if_error(key)
+            if state == MISS:
+                raise
+            logger.warning("Serving stale cached value after load failure: %s", e)
+            return value
+        self.set(key, value, endpoint)
+        return value
+
+    def refresh_many(self, keys: Iterable[Hashable], endpoint: str,
+                     loader: Callable[[], Dict[Hashable, Any]]) -> Optional['Future']:
+        """
+        Refresh keys in the background with one loader call.
+
+        Keys that already have a refresh in flight are skipped, so each key is
+        refreshed by at most one background call at a time.
+
+        Args:
+            keys: Keys to refresh
+            endpoint: Endpoint name used to pick the TTL
+            loader: Callable returning a dictionary of new values by key
+
+        Returns:
+            Future of the background refresh, or None if every key was already refreshing
+        """
+        with self._lock:
+            keys = [key for key in keys if key not in self._refreshing]
+            if not keys:
+                return None
+            self._refreshing.update(keys)
+            self._stats['refreshes'] += 1
+            if self._executor is None:
+                # Imported lazily, most processes never refresh in the background
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+
+        def run():
+            try:
+                for key, value in loader().items():
+                    self.set(key, value, endpoint)
+            except Exception as e:
+                logger.warning(f"Background refresh of {len(keys)} cache entries failed: {e}")
+                with self._lock:
+                    self._stats['refresh_errors'] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(keys)
+
+        return self._executor.submit(run)
+
+    def clear(self):
+        """Remove all entries."""
+        self.backend.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Hit, miss, eviction and refresh counters of this process plus the current size.
+
+        Lookups made with a namespace are counted as '<namespace>_hits',
+        '<namespace>_stale_hits' and '<namespace>_misses'.
+
+        The size of a Redis backend is counted with a key scan, so avoid
+        reading stats on hot paths.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['evictions'] = getattr(self.backend, 'evictions', 0)
+        stats['size'] = len(self.backend)
+        return stats
+
+    def __len__(self) -> int:
+        return len(self.backend)
@@ -0,0 +1,523 @@
+"""
+Storage backends of the response cache.
+
+``MemoryBackend`` keeps entries as Python objects in an LRU dictionary of one
+process. The shared backends let every worker process (gunicorn workers,
+Lambda containers) reuse the prices and symbol resolutions fetched by any of
+them, so upstream traffic no longer grows with the number of workers:
+
+- ``SQLiteBackend``: a SQLite file in WAL mode, for processes on one host
+- ``RedisBackend``: any server speaking the Redis protocol (RESP), across hosts;
+  the client is built in, no Redis package is needed
+
+Shared backends store an entry as a 16-byte header holding its fresh and
+stale deadlines, followed by the value as compact JSON written and read with
+the fastest installed JSON backend (see ``crypto_info.decoders``). Their
+errors are logged and treated as cache misses, so an unavailable cache never
+fails a lookup.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from .decoders import get_decoder, get_encoder
+
+logger = logging.getLogger(__name__)
+
+# (value, fresh_until, stale_until)
+Entry = Tuple[Any, float, float]
+
+_ENTRY_HEADER = struct.Struct('<dd')
+
+def encode_key(key: Hashable) -> str:
+    """
+    Convert a cache key to a string usable by shared backends.
+
+    Args:
+        key: String, or tuple of strings and tuples
+
+    Returns:
+        The string itself, or the compact JSON array of a tuple
+    """
+    if isinstance(key, str):
+        return key
+    return json.dumps(key, separators=(',', ':'))
+
+class CacheBackend:
+    """
+    Base class of response cache storage.
+
+    ``set`` is given how long the entry must be retained; a backend may drop
+    it after that, or earlier to bound its size. ``shared`` backends are
+    visible to other processes, so entry deadlines use wall-clock time.
+    """
+    shared = False
+
+    def get(self, key: Hashable) -> Optional[Entry]:
+        """
+        Get an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Entry, or None if it is not stored
+        """
+        raise NotImplementedError
+
+    def get_many(self, keys: List[Hashable]) -> List[Optional[Entry]]:
+        """
+        Get several entries, in one round trip where the backend allows it.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Entry or None for each key, in order
+        """
+        return [self.get(key) for key in keys]
+
+    def set(self, key: Hashable, entry: Entry, retain: float):
+        """
+        Store an entry.
+
+        Args:
+            key: Cache key
+            entry: Tuple of (value, fresh_until, stale_until)
+            retain: Seconds the entry must be kept
+        """
+        raise NotImplementedError
+
+    def delete(self, key: Hashable):
+        """Remove an entry if it is stored."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all entries."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+class MemoryBackend(CacheBackend):
+    """
+    Thread-safe bounded LRU dictionary in this process.
+    """
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the backend.
+
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, entry: Entry, retain: float):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class _SerializingBackend(CacheBackend):
+    """Backend storing entries as bytes visible to other processes."""
+    shared = True
+
+    def __init__(self, json_backend: Optional[str] = None):
+        self._encode = get_encoder(json_backend)
+        self._decode = get_decoder(json_backend)
+
+    def _dump(self, entry: Entry) -> bytes:
+        """Serialize an entry."""
+        value, fresh_until, stale_until = entry
+        return _ENTRY_HEADER.pack(fresh_until, stale_until) + self._encode(value)
+
+    def _load(self, data: Optional[bytes]) -> Optional[Entry]:
+        """Deserialize an entry, or return None for missing or corrupt data."""
+        if data is None:
+            return None
+        try:
+            fresh_until, stale_until = _ENTRY_HEADER.unpack_from(data)
+            return self._decode(data[_ENTRY_HEADER.size:]), fresh_until, stale_until
+        except (struct.error, ValueError) as e:
+            logger.warning("Ignoring corrupt cache entry: %s", e)
+            return None
+
+class SQLiteBackend(_SerializingBackend):
+    """
+    Cache in a SQLite file shared by the processes of one host.
+    """
+    # Expired rows are purged after this many writes
+    PURGE_EVERY = 1000
+    # Keys per SELECT ... IN query, below SQLite's default variable limit
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str, json_backend: Optional[str] = None, timeout: float = 5.0):
+        """
+        Initialize the backend. The file is created on first use.
+
+        Args:
+            path: Database file path
+            json_backend: JSON backend for values ('orjson', 'ujson' or 'json')
+            timeout: Seconds to wait for another process holding the write lock
+        """
+        super().__init__(json_backend)
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it and creating the table on first use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                         check_same_thread=False)
+            # WAL lets readers in other processes proceed while one process writes
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID'
+            )
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def get(self, key: Hashable) -> Optional[Entry]:
+        try:
+            row = self._connection().execute(
+                'SELECT value FROM cache WHERE key = ? AND expires_at > ?', (encode_key(key), time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache read failed: %s", e)
+            return None
+        return self._load(row[0]) if row else None
+
+    def get_many(self, keys: List[Hashable]) -> List[Optional[Entry]]:
+        encoded = [encode_key(key) for key in keys]
+        found = {}
+        try:
+            connection = self._connection()
+            now = time.time()
+            for i in range(0, len(encoded), self.BATCH_SIZE):
+                batch = encoded[i:i + self.BATCH_SIZE]
+                rows = connection.execute(
+                    'SELECT key, value FROM cache WHERE expires_at > ? AND key IN (%s)' % ','.join('?' * len(batch)),
+                    [now] + batch
+                )
+                found.update(rows)
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache read failed: %s", e)
+            return [None] * len(keys)
+        return [self._load(found.get(key)) for key in encoded]
+
+    def set(self, key: Hashable, entry: Entry, retain: float):
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                               (encode_key(key), self._dump(entry), now + retain))
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % self.PURGE_EVERY == 0
+            if purge:
+                connection.execute('DELETE FROM cache WHERE expires_at <= ?', (now,))
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache write failed: %s", e)
+
+    def delete(self, key: Hashable):
+        try:
+            self._connection().execute('DELETE FROM cache WHERE key = ?', (encode_key(key),))
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache delete failed: %s", e)
+
+    def clear(self):
+        try:
+            self._connection().execute('DELETE FROM cache')
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache clear failed: %s", e)
+
+    def __len__(self) -> int:
+        try:
+            return self._connection().execute(
+                'SELECT COUNT(*) FROM cache WHERE expires_at > ?', (time.time(),)
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning("SQLite cache count failed: %s", e)
+            return 0
+
+    def close(self):
+        """Close the connections of all threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+class RESPError(Exception):
+    """Error reply from a RESP server."""
+
+class _RESPConnection:
+    """Blocking connection speaking the Redis serialization protocol (RESP2)."""
+    def __init__(self, host: str, port: int, timeout: Optional[float]):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile('rb')
+
+    def command(self, *args) -> Any:
+        """Send a command and read its reply."""
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self.sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        """Read one reply."""
+        line = self.file.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b'+':
+            return body.decode('utf-8')
+        if kind == b'-':
+            raise RESPError(body.decode('utf-8', 'replace'))
+        if kind == b':':
+            return int(body)
+        if kind == b'$':
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.file.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by the cache server")
+            return data[:-2]
+        if kind == b'*':
+            length = int(body)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RESPError(f"Unexpected reply type {kind!r}")
+
+    def close(self):
+        try:
+            self.file.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+class RedisBackend(_SerializingBackend):
+    """
+    Cache in a Redis-compatible server, shared by processes on any host.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, prefix: str = 'crypto_info:',
+                 socket_timeout: Optional[float] = 1.0, max_connections: int = 8,
+                 json_backend: Optional[str] = None):
+        """
+        Initialize the backend. Connections are opened on first use.
+
+        Args:
+            host: Server host
+            port: Server port
+            db: Database number selected on each connection
+            password: Optional password sent with AUTH
+            prefix: Prefix of every key, so clear() only removes this cache's keys
+            socket_timeout: Seconds to wait for the server before treating the
+                lookup as a miss
+            max_connections: Idle connections kept for reuse
+            json_backend: JSON backend for values ('orjson', 'ujson' or 'json')
+        """
+        super().__init__(json_backend)
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.socket_timeout = socket_timeout
+        self.max_connections = max_connections
+        self._idle: List[_RESPConnection] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisBackend':
+        """
+        Create a backend from a URL such as redis://:password@host:6379/0.
+
+        Args:
+            url: Server URL
+            **kwargs: Other RedisBackend arguments
+
+        Returns:
+            RedisBackend
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != 'redis':
+            raise ValueError(f"Unsupported cache URL scheme '{parsed.scheme}', expected 'redis'")
+        db = parsed.path.lstrip('/')
+        return cls(host=parsed.hostname or '127.0.0.1', port=parsed.port or 6379,
+                   db=int(db) if db else 0,
+                   password=unquote(parsed.password) if parsed.password else None, **kwargs)
+
+    def _connect(self) -> _RESPConnection:
+        """Open and set up a new connection."""
+        connection = _RESPConnection(self.host, self.port, self.socket_timeout)
+        try:
+            if self.password:
+                connection.command('AUTH', self.password)
+            if self.db:
+                connection.command('SELECT', self.db)
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def _execute(self, *args) -> Any:
+        """
+        Run a command on a pooled connection.
+
+        A pooled connection the server has closed is replaced once.
+
+        Raises:
+            OSError: If the server cannot be reached
+            RESPError: If the server replies with an error
+        """
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        reused = connection is not None
+        if connection is None:
+            connection = self._connect()
+
+        try:
+            result = connection.command(*args)
+        except OSError:
+            connection.close()
+            if not reused:
+                raise
+            connection = self._connect()
+            try:
+                result = connection.command(*args)
+            except Exception:
+                connection.close()
+                raise
+        except RESPError:
+            # The connection is still in a consistent state after an error reply
+            self._release(connection)
+            raise
+        except Exception:
+            connection.close()
+            raise
+
+        self._release(connection)
+        return result
+
+    def _release(self, connection: _RESPConnection):
+        """Return a connection to the pool, or close it if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.max_connections:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def _key(self, key: Hashable) -> str:
+        return self.prefix + encode_key(key)
+
+    def get(self, key: Hashable) -> Optional[Entry]:
+        try:
+            return self._load(self._execute('GET', self._key(key)))
+        except (OSError, RESPError) as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return None
+
+    def get_many(self, keys: List[Hashable]) -> List[Optional[Entry]]:
+        if not keys:
+            return []
+        try:
+            values = self._execute('MGET', *[self._key(key) for key in keys])
+        except (OSError, RESPError) as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return [None] * len(keys)
+        return [self._load(value) for value in values]
+
+    def set(self, key: Hashable, entry: Entry, retain: float):
+        try:
+            self._execute('SET', self._key(key), self._dump(entry), 'PX', max(1, int(retain * 1000)))
+        except (OSError, RESPError) as e:
+            logger.warning("Redis cache write failed: %s", e)
+
+    def delete(self, key: Hashable):
+        try:
+            self._execute('DEL', self._key(key))
+        except (OSError, RESPError) as e:
+            logger.warning("Redis cache delete failed: %s", e)
+
+    def _scan(self) -> List[bytes]:
+        """Get all keys with this cache's prefix."""
+        keys: List[bytes] = []
+        cursor = b'0'
+        while True:
+            cursor, batch = self._execute('SCAN', cursor, 'MATCH', self.prefix + '*', 'COUNT', 1000)
+            keys.extend(batch)
+            if cursor in (b'0', 0, '0'):
+                return keys
+
+    def clear(self):
+        try:
+            keys = self._scan()
+            for i in range(0, len(keys), 1000):
+                self._execute('DEL', *keys[i:i + 1000])
+        except (OSError, RESPError) as e:
+            logger.warning("Redis cache clear failed: %s", e)
+
+    def __len__(self) -> int:
+        try:
+            return len(self._scan())
+        except (OSError, RESPError) as e:
+            logger.warning("Redis cache count failed: %s", e)
+            return 0
+
+    def close(self):
+        """Close the pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,220 @@
+"""
+Circuit breaker for calls to an upstream provider.
+
+After ``failure_threshold`` consecutive failures the breaker opens and calls
+fail immediately with ``CircuitOpenError`` instead of waiting on a degraded
+upstream. Once ``reset_timeout`` has passed it lets a limited number of probe
+calls through (half-open); a successful probe closes it again and a failed
+one reopens it for another ``reset_timeout``.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from requests.exceptions import HTTPError
+
+from .deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+    def __init__(self, name: str, retry_after: float = 0.0):
+        super().__init__(f"Circuit breaker '{name}' is open, retry in {retry_after:.1f} seconds")
+        self.name = name
+        self.retry_after = retry_after
+
+def is_failure(error: BaseException) -> bool:
+    """
+    Decide whether an error counts against the upstream's health.
+
+    Client errors such as 404 for an unknown coin are the caller's fault and
+    do not trip the breaker, nor does running out of the caller's deadline;
+    429, 5xx, timeouts, connection errors and other open breakers do.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        True if the error is a failure of the upstream
+    """
+    if isinstance(error, DeadlineExceeded):
+        # The caller ran out of time, which says nothing about the upstream
+        return False
+    if isinstance(error, HTTPError):
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status_code is None or status_code == 429 or status_code >= 500
+    # ConnectionError, requests' Timeout and other network errors are all OSErrors
+    return isinstance(error, OSError)
+
+def is_upstream_response(error: BaseException) -> bool:
+    """
+    Decide whether an error carries a response from the upstream.
+
+    Such errors (e.g. a 404 for an unknown coin) show the upstream is
+    answering; others that are not failures, such as the caller's deadline
+    cutting a read short, say nothing about it either way.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        True if the upstream answered
+    """
+    return isinstance(error, HTTPError) and getattr(error, 'response', None) is not None
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure circuit breaker with half-open probing.
+    """
+    def __init__(self, name: str = 'default', failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, half_open_max_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            name: Name used in errors and logs (e.g. the provider name)
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before probing
+            half_open_max_calls: Probe calls allowed at once while half-open
+            clock: Monotonic time source
+        """
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise ValueError("failure_threshold and half_open_max_calls must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _update_state(self, now: float):
+        """Move from open to half-open once the reset timeout has passed."""
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            logger.info("Circuit breaker '%s' half-open, probing", self.name)
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            self._update_state(self._clock())
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through (0 unless open)."""
+        with self._lock:
+            now = self._clock()
+            self._update_state(now)
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - now)
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may go ahead, taking a probe slot when half-open.
+
+        Every allowed call must be followed by record_success, record_failure
+        or record_ignored (or record_error, which picks one of them).
+
+        Returns:
+            True if the call may be made
+        """
+        with self._lock:
+            self._update_state(self._clock())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful call, closing the breaker."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit breaker '%s' closed", self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        """Record a failed call, opening the breaker after too many in a row."""
+        with self._lock:
+            now = self._clock()
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                logger.warning("Circuit breaker '%s' open after %d consecutive failures",
+                               self.name, self._failures)
+                self._state = OPEN
+                self._opened_at = now
+                self._probes = 0
+
+    def record_ignored(self):
+        """
+        Record a call whose outcome says nothing about the upstream's health.
+
+        Only the probe slot taken while half-open is released, so another
+        probe may decide whether the breaker closes.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_error(self, error: BaseException):
+        """
+        Record a call that raised, as a failure, a success or neither.
+
+        Args:
+            error: Exception raised by the call
+        """
+        if is_failure(error):
+            self.record_failure()
+        elif is_upstream_response(error):
+            self.record_success()
+        else:
+            self.record_ignored()
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call a function through the breaker.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments of fn
+            **kwargs: Keyword arguments of fn
+
+        Returns:
+            Result of fn
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: Whatever fn raised
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.record_error(e)
+            raise
+        self.record_success()
+        return result
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """State and number of consecutive failures."""
+        with self._lock:
+            self._update_state(self._clock())
+            return {'state': self._state, 'failures': self._failures}
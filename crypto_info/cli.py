@@ -0,0 +1,311 @@
+"""
+Command-line bulk pricing.
+
+Reads symbols from files or stdin, prices them in batches with a bounded
+number of batches in flight and writes one record per symbol to stdout (or
+--output) as soon as its batch completes:
+
+    crypto-info symbols.txt --currencies usd,eur --format csv > prices.csv
+    cat symbols.txt | python -m crypto_info --checkpoint run.ckpt --output prices.ndjson
+
+With --checkpoint, symbols priced successfully are appended to the checkpoint
+file after their records are written and flushed, so an interrupted run
+started again with the same arguments skips them and appends to --output.
+Symbols that failed are retried, so their records go to a separate errors
+file (--errors, default CHECKPOINT.errors) rewritten by every run, and the
+output holds each symbol once. A throughput summary is printed to stderr.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Symbols per get_prices call; /simple/price takes about 250 IDs per request
+DEFAULT_BATCH_SIZE = 250
+# Batches priced at once
+DEFAULT_WORKERS = 4
+
+FORMATS = ['ndjson', 'csv']
+
+def read_symbols(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Parse symbols separated by whitespace or commas, skipping '#' comments.
+
+    Args:
+        lines: Lines of text
+
+    Yields:
+        Symbols in upper case, each once
+    """
+    seen: Set[str] = set()
+    for line in lines:
+        line = line.split('#', 1)[0]
+        for symbol in line.replace(',', ' ').split():
+            symbol = symbol.upper()
+            if symbol not in seen:
+                seen.add(symbol)
+                yield symbol
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Read the symbols completed by an earlier run.
+
+    Args:
+        path: Checkpoint file path
+
+    Returns:
+        Set of completed symbols (empty if the file does not exist)
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+def batches(symbols: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split symbols into lists of at most size symbols."""
+    batch: List[str] = []
+    for symbol in symbols:
+        batch.append(symbol)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class RecordWriter:
+    """Writes price records as NDJSON or CSV."""
+    def __init__(self, stream: IO[str], output_format: str, currencies: List[str], header: bool = True):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Text stream to write to
+            output_format: 'ndjson' or 'csv'
+            currencies: Currencies priced, which determine the CSV columns
+            header: Write the CSV header row
+        """
+        self.stream = stream
+        self.output_format = output_format
+        self._csv = None
+        if output_format == 'csv':
+            columns = ['symbol']
+            for currency in currencies:
+                columns += [currency, f"{currency}_market_cap", f"{currency}_24h_change"]
+            columns.append('error')
+            self._csv = csv.DictWriter(stream, fieldnames=columns, extrasaction='ignore')
+            if header:
+                self._csv.writeheader()
+
+    def write(self, symbol: str, price: Dict[str, Any]):
+        """Write the record of one symbol."""
+        record = {'symbol': symbol, **price}
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def flush(self):
+        self.stream.flush()
+
+class BulkPricer:
+    """
+    Prices a stream of symbols in concurrent batches.
+    """
+    def __init__(self, crypto_client, currencies: List[str],
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_WORKERS):
+        """
+        Initialize the pricer.
+
+        Args:
+            crypto_client: CryptoInfo used for pricing
+            currencies: Currencies to price in
+            batch_size: Symbols per get_prices call
+            workers: Batches priced at once
+        """
+        if batch_size < 1 or workers < 1:
+            raise ValueError("batch_size and workers must be at least 1")
+        self.crypto_client = crypto_client
+        self.currencies = currencies
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def _price_batch(self, batch: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Price one batch, turning a failure of the whole batch into per-symbol errors."""
+        try:
+            return self.crypto_client.get_prices(batch, self.currencies)
+        except Exception as e:
+            logger.warning("Batch of %d symbols failed: %s", len(batch), e)
+            return {symbol: {'error': str(e)} for symbol in batch}
+
+    def run(self, symbols: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Price symbols, yielding results in batch completion order.
+
+        At most ``workers`` batches are in flight, so the input is read
+        lazily and memory stays bounded for any number of symbols.
+
+        Args:
+            symbols: Symbols to price
+
+        Yields:
+            Tuples of (symbol, price dictionary or {'error': message})
+        """
+        pending: Dict[Future, List[str]] = {}
+        batch_iter = batches(symbols, self.batch_size)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='crypto-info-cli') as executor:
+            try:
+                while True:
+                    while len(pending) < self.workers:
+                        batch = next(batch_iter, None)
+                        if batch is None:
+                            break
+                        pending[executor.submit(self._price_batch, batch)] = batch
+                    if not pending:
+                        return
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch = pending.pop(future)
+                        prices = future.result()
+                        for symbol in batch:
+                            yield symbol, prices.get(symbol, {'error': 'No result'})
+            finally:
+                # Interrupted: do not start the batches still queued
+                for future in pending:
+                    future.cancel()
+
+def _build_client(args: argparse.Namespace):
+    """Create the CryptoInfo used by the command."""
+    from .crypto_info import CryptoInfo
+    from .coingecko_client import CoinGeckoClient
+
+    client_kwargs = {}
+    if args.requests_per_minute is not None:
+        client_kwargs['requests_per_minute'] = args.requests_per_minute
+    return CryptoInfo(api_client=CoinGeckoClient(**client_kwargs), timeout=args.timeout)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command-line arguments."""
+    parser = argparse.ArgumentParser(prog='crypto-info', description="Price cryptocurrency symbols in bulk")
+    parser.add_argument('inputs', nargs='*', metavar='FILE',
+                        help="Files with symbols separated by whitespace, commas or newlines ('-' for stdin, the default)")
+    parser.add_argument('-s', '--symbols', help="Comma-separated symbols, instead of reading files")
+    parser.add_argument('-c', '--currencies', default='usd', help="Comma-separated currencies (default: usd)")
+    parser.add_argument('-f', '--format', choices=FORMATS, default='ndjson', help="Output format (default: ndjson)")
+    parser.add_argument('-o', '--output', help="Output file (default: stdout); appended to when resuming")
+    parser.add_argument('--checkpoint', help="File recording completed symbols, to resume an interrupted run")
+    parser.add_argument('--errors', help="File for the error records of a run with --checkpoint "
+                                         "(default: the checkpoint path with '.errors' appended)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Symbols per price request batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Batches priced at once (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--timeout', type=float, help="Deadline in seconds of each batch")
+    parser.add_argument('--requests-per-minute', type=float,
+                        help="Client-side rate limit (default: the CoinGecko free plan's)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Do not print the summary")
+    return parser.parse_args(argv)
+
+def _iter_input(args: argparse.Namespace) -> Iterator[str]:
+    """Yield the input lines of the symbols option or the input files."""
+    if args.symbols is not None:
+        yield args.symbols
+        return
+    for path in args.inputs or ['-']:
+        if path == '-':
+            yield from sys.stdin
+        else:
+            with open(path, encoding='utf-8') as f:
+                yield from f
+
+def main(argv: Optional[List[str]] = None, crypto_client=None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+        crypto_client: CryptoInfo to use instead of one built from the arguments
+
+    Returns:
+        Process exit code: 0 if every symbol was priced, 1 if some failed,
+        130 if interrupted
+    """
+    args = parse_args(argv)
+    currencies = [currency.strip().lower() for currency in args.currencies.split(',') if currency.strip()]
+
+    completed = load_checkpoint(args.checkpoint) if args.checkpoint else set()
+    skipped = 0
+
+    def pending_symbols() -> Iterator[str]:
+        nonlocal skipped
+        for symbol in read_symbols(_iter_input(args)):
+            if symbol in completed:
+                skipped += 1
+            else:
+                yield symbol
+
+    if args.output:
+        resuming = bool(completed) and os.path.exists(args.output)
+        output = open(args.output, 'a' if resuming else 'w', encoding='utf-8', newline='')
+    else:
+        resuming = False
+        output = sys.stdout
+    checkpoint = open(args.checkpoint, 'a', encoding='utf-8') if args.checkpoint else None
+    # Failed symbols are retried on resume, so their records stay out of the output
+    errors_output = None
+    if checkpoint is not None:
+        errors_output = open(args.errors or f"{args.checkpoint}.errors", 'w', encoding='utf-8', newline='')
+
+    if crypto_client is None:
+        crypto_client = _build_client(args)
+    pricer = BulkPricer(crypto_client, currencies, batch_size=args.batch_size, workers=args.workers)
+    writer = RecordWriter(output, args.format, currencies, header=not resuming)
+    error_writer = RecordWriter(errors_output, args.format, currencies) if errors_output else writer
+
+    priced = failed = 0
+    interrupted = False
+    start = time.perf_counter()
+    try:
+        for symbol, price in pricer.run(pending_symbols()):
+            if 'error' in price:
+                error_writer.write(symbol, price)
+                failed += 1
+                continue
+            writer.write(symbol, price)
+            priced += 1
+            if checkpoint is not None:
+                # Records reach the output before the checkpoint marks them done
+                writer.flush()
+                checkpoint.write(symbol + '\n')
+                checkpoint.flush()
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        writer.flush()
+        if output is not sys.stdout:
+            output.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if errors_output is not None:
+            errors_output.close()
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = (priced + failed) / elapsed if elapsed > 0 else 0.0
+        print(f"{'Interrupted after' if interrupted else 'Done:'} {priced} priced, {failed} failed, "
+              f"{skipped} skipped from checkpoint in {elapsed:.1f} s ({rate:.1f} symbols/s)",
+              file=sys.stderr)
+
+    if interrupted:
+        return 130
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
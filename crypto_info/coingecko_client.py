@@ -2,24 +2,134 @@
 CoinGecko API client for fetching cryptocurrency data.
 """
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from typing import Dict, Any, Optional, List, Iterator, Union
+import requests
 from .api_client import APIClient
+from .circuit_breaker import CircuitBreaker
+from .connection import DEFAULT_POOL_MAXSIZE, PooledSession
+from .decoders import get_decoder
+from .metrics import MetricsSink
+from .providers import PriceProvider
+from .rate_limit import TokenBucket, RetryPolicy, get_shared_limiter
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-class CoinGeckoClient(APIClient):
+# CoinGecko's public API allows roughly 30 calls per minute
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_BURST = 10
+
+DEFAULT_BASE_URL = "https://api.coingecko.com/api/v3"
+
+# Slightly above a multiple of 3 s, the TCP SYN retransmission interval
+DEFAULT_CONNECT_TIMEOUT = 3.05
+
+# Read timeouts in seconds of endpoints with small responses; the rest use timeout
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    '/ping': 5.0,
+    '/simple/price': 10.0,
+    '/search': 10.0,
+}
+
+# Consecutive failures that open the circuit breaker, and seconds it stays open
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# Path segments after /coins/ that are endpoints rather than coin IDs
+_COINS_ENDPOINTS = {'list', 'markets', 'categories'}
+_COIN_ID_RE = re.compile(r'^/coins/([^/?]+)')
+
+class CoinGeckoClient(APIClient, PriceProvider):
     """
     Client for interacting with the CoinGecko API.
     """
-    def __init__(self, timeout: int = 30):
+    name = 'coingecko'
+    
+    def __init__(self, timeout: int = 30,
+                 requests_per_minute: Optional[float] = DEFAULT_REQUESTS_PER_MINUTE,
+                 max_retries: int = 3,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 coalesce_requests: bool = True,
+                 json_backend: Optional[str] = None,
+                 base_url: str = DEFAULT_BASE_URL,
+                 metrics: Optional[MetricsSink] = None,
+                 session: Optional[requests.Session] = None,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+                 endpoint_timeouts: Optional[Dict[str, float]] = None,
+                 failure_threshold: Optional[int] = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         """
         Initialize the CoinGecko API client.
         
+        By default all CoinGeckoClient instances in the process share one
+        token bucket, so together they stay under the provider's rate limit.
+        
         Args:
-            timeout: Request timeout in seconds
+            timeout: Read timeout in seconds of endpoints missing from endpoint_timeouts
+            requests_per_minute: Rate of the shared limiter (None or 0 disables rate limiting)
+            max_retries: Retries for 429/5xx responses and timeouts (0 disables retries)
+            rate_limiter: Explicit token bucket, overriding requests_per_minute
+            retry_policy: Explicit retry policy, overriding max_retries
+            coalesce_requests: Share one in-flight request between concurrent identical calls
+            json_backend: JSON backend for responses ('orjson', 'ujson' or 'json'),
+                defaults to the fastest installed one
+            base_url: API root, e.g. a local stand-in server for benchmarks
+            metrics: Optional instrumentation sink (see crypto_info.metrics)
+            session: Session to send requests with; pass
+                connection.get_shared_session('coingecko') to share one
+                connection pool between clients
+            pool_maxsize: Connections kept open to the API when no session is given
+            connect_timeout: Timeout in seconds for opening a connection
+            endpoint_timeouts: Read timeouts by endpoint label, merged over
+                DEFAULT_ENDPOINT_TIMEOUTS
+            failure_threshold: Consecutive upstream failures after which
+                requests fail fast with CircuitOpenError (None or 0 disables
+                the circuit breaker)
+            reset_timeout: Seconds the breaker stays open before a probe request
+            circuit_breaker: Explicit breaker, overriding failure_threshold
         """
-        super().__init__(base_url="https://api.coingecko.com/api/v3", timeout=timeout)
+        if rate_limiter is None and requests_per_minute:
+            rate_limiter = get_shared_limiter('coingecko', requests_per_minute / 60.0, DEFAULT_BURST)
+        if circuit_breaker is None and failure_threshold:
+            circuit_breaker = CircuitBreaker(self.name, failure_threshold=failure_threshold,
+                                             reset_timeout=reset_timeout)
+        if retry_policy is None and max_retries > 0:
+            retry_policy = RetryPolicy(max_retries=max_retries)
         
+        if session is None:
+            session = PooledSession(pool_maxsize=pool_maxsize)
+        
+        super().__init__(base_url=base_url, timeout=timeout,
+                         rate_limiter=rate_limiter, retry_policy=retry_policy,
+                         single_flight=SingleFlight() if coalesce_requests else None,
+                         json_decoder=get_decoder(json_backend), metrics=metrics,
+                         session=session, connect_timeout=connect_timeout,
+                         endpoint_timeouts=dict(DEFAULT_ENDPOINT_TIMEOUTS, **(endpoint_timeouts or {})),
+                         circuit_breaker=circuit_breaker)
+    
+    def _endpoint_label(self, url: str) -> str:
+        """Get the endpoint label of a URL, with coin IDs collapsed to {id}."""
+        path = super()._endpoint_label(url)
+        match = _COIN_ID_RE.match(path)
+        if match and match.group(1) not in _COINS_ENDPOINTS:
+            return f"/coins/{{id}}{path[match.end():]}"
+        return path
+        
+    def ping(self) -> Dict[str, Any]:
+        """
+        Check the API server status.
+        
+        Also useful to open the pooled TLS connection ahead of real requests.
+        
+        Returns:
+            Status response as a dictionary
+        """
+        return self._make_request("/ping")
+    
     def get_coin_by_id(self, coin_id: str, localization: bool = False, 
                       tickers: bool = False, market_data: bool = True,
                       community_data: bool = False, developer_data: bool = False,
@@ -80,6 +190,80 @@ class CoinGeckoClient(APIClient):
         
         return self._make_request("/simple/price", params=params)
     
+    def get_market_chart(self, coin_id: str, vs_currency: str, days: Union[int, str],
+                         interval: Optional[str] = None,
+                         precision: Optional[str] = None) -> Dict[str, List[List[float]]]:
+        """
+        Get historical prices, market caps and volumes for the last days.
+        
+        Granularity is automatic (5-minutely up to 1 day, hourly up to 90
+        days, daily beyond) unless interval is given.
+        
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the values
+            days: Number of days back from now, or 'max'
+            interval: Optional fixed granularity ('daily')
+            precision: Optional number of decimal places of the values
+            
+        Returns:
+            Dictionary with 'prices', 'market_caps' and 'total_volumes' lists of
+            [timestamp_ms, value] pairs
+        """
+        params = {'vs_currency': vs_currency, 'days': str(days)}
+        if interval:
+            params['interval'] = interval
+        if precision:
+            params['precision'] = precision
+        return self._make_request(f"/coins/{coin_id}/market_chart", params=params)
+    
+    def get_market_chart_range(self, coin_id: str, vs_currency: str, from_timestamp: int,
+                               to_timestamp: int,
+                               precision: Optional[str] = None) -> Dict[str, List[List[float]]]:
+        """
+        Get historical prices, market caps and volumes between two times.
+        
+        Granularity is automatic: 5-minutely for ranges up to 1 day, hourly up
+        to 90 days, daily beyond.
+        
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the values
+            from_timestamp: Start of the range as a Unix timestamp in seconds
+            to_timestamp: End of the range as a Unix timestamp in seconds
+            precision: Optional number of decimal places of the values
+            
+        Returns:
+            Dictionary with 'prices', 'market_caps' and 'total_volumes' lists of
+            [timestamp_ms, value] pairs
+        """
+        params = {'vs_currency': vs_currency, 'from': str(int(from_timestamp)), 'to': str(int(to_timestamp))}
+        if precision:
+            params['precision'] = precision
+        return self._make_request(f"/coins/{coin_id}/market_chart/range", params=params)
+    
+    def get_ohlc(self, coin_id: str, vs_currency: str, days: Union[int, str],
+                 precision: Optional[str] = None) -> List[List[float]]:
+        """
+        Get open, high, low and close prices for the last days.
+        
+        Candle size is automatic: 30 minutes up to 2 days, 4 hours up to 30
+        days, 4 days beyond.
+        
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the prices
+            days: Number of days back from now (1, 7, 14, 30, 90, 180, 365 or 'max')
+            precision: Optional number of decimal places of the values
+            
+        Returns:
+            List of [timestamp_ms, open, high, low, close] candles
+        """
+        params = {'vs_currency': vs_currency, 'days': str(days)}
+        if precision:
+            params['precision'] = precision
+        return self._make_request(f"/coins/{coin_id}/ohlc", params=params)
+    
     def search_coins(self, query: str) -> Dict[str, Any]:
         """
         Search for coins, categories and markets listed on CoinGecko.
@@ -92,3 +276,94 @@ class CoinGeckoClient(APIClient):
         """
         params = {'query': query}
         return self._make_request("/search", params=params)
+    
+    def get_coins_list(self, include_platform: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the list of all supported coins with their ID, symbol and name.
+        
+        Args:
+            include_platform: Include platform contract addresses
+            
+        Returns:
+            List of coins as dictionaries with 'id', 'symbol' and 'name' keys
+        """
+        params = {'include_platform': str(include_platform).lower()}
+        return self._make_request("/coins/list", params=params)
+    
+    def iter_coins_list(self, include_platform: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the list of all supported coins, parsing the response incrementally.
+        
+        Args:
+            include_platform: Include platform contract addresses
+            
+        Yields:
+            Coins as dictionaries with 'id', 'symbol' and 'name' keys
+        """
+        params = {'include_platform': str(include_platform).lower()}
+        return self._stream_json_array("/coins/list", params=params)
+    
+    def get_coins_markets(self, vs_currency: str, ids: Optional[List[str]] = None,
+                          order: str = "market_cap_desc", per_page: int = 100,
+                          page: int = 1, sparkline: bool = False,
+                          price_change_percentage: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get market data (price, market cap, volume, rank) for a page of coins.
+        
+        Args:
+            vs_currency: Currency to get market data in
+            ids: Optional list of CoinGecko IDs to restrict the results to
+            order: Sort order of the results
+            per_page: Number of results per page (1-250)
+            page: Page number, starting at 1
+            sparkline: Include 7-day sparkline data
+            price_change_percentage: Extra price change intervals (e.g., ['1h', '7d'])
+            
+        Returns:
+            List of market data dictionaries, one per coin
+        """
+        params = {
+            'vs_currency': vs_currency,
+            'order': order,
+            'per_page': per_page,
+            'page': page,
+            'sparkline': str(sparkline).lower()
+        }
+        if ids:
+            params['ids'] = ','.join(ids)
+        if price_change_percentage:
+            params['price_change_percentage'] = ','.join(price_change_percentage)
+        
+        return self._make_request("/coins/markets", params=params)
+    
+    def iter_markets(self, vs_currency: str, per_page: int = 250,
+                     max_pages: Optional[int] = None, start_page: int = 1,
+                     **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page lazily through /coins/markets.
+        
+        Each page is requested only when the previous one has been consumed,
+        and iteration stops at the first short page.
+        
+        Args:
+            vs_currency: Currency to get market data in
+            per_page: Number of results per page (1-250)
+            max_pages: Maximum number of pages to fetch (None for all)
+            start_page: First page to fetch
+            **kwargs: Extra arguments for get_coins_markets (e.g., order, ids)
+            
+        Yields:
+            Lists of market data dictionaries, one list per page
+        """
+        page = start_page
+        pages_fetched = 0
+        
+        while max_pages is None or pages_fetched < max_pages:
+            markets = self.get_coins_markets(vs_currency, per_page=per_page, page=page, **kwargs)
+            pages_fetched += 1
+            
+            if markets:
+                yield markets
+            if len(markets) < per_page:
+                return
+            page += 1
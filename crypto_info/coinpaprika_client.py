@@ -0,0 +1,236 @@
+"""
+CoinPaprika API client, a secondary price provider with CoinGecko-shaped results.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+import requests
+from requests.exceptions import HTTPError
+from .api_client import APIClient
+from .connection import DEFAULT_POOL_MAXSIZE, PooledSession
+from .decoders import get_decoder
+from .metrics import MetricsSink
+from .providers import PriceProvider
+from .rate_limit import TokenBucket, RetryPolicy, get_shared_limiter
+
+logger = logging.getLogger(__name__)
+
+# CoinPaprika's free API allows roughly 10 calls per second; stay well below
+DEFAULT_REQUESTS_PER_MINUTE = 120
+DEFAULT_BURST = 10
+
+DEFAULT_BASE_URL = "https://api.coinpaprika.com/v1"
+
+# Price requests for more coins than this fetch all tickers in one request
+BULK_TICKERS_THRESHOLD = 20
+
+class CoinPaprikaClient(APIClient, PriceProvider):
+    """
+    Client for the CoinPaprika API, translating to CoinGecko IDs and response shapes.
+
+    CoinPaprika IDs are '<symbol>-<slug>' (e.g. 'btc-bitcoin') and the slug
+    matches the CoinGecko ID for most coins. The slug map is built from
+    /coins on first use; id_map overrides it for coins whose IDs differ.
+    """
+    name = 'coinpaprika'
+
+    def __init__(self, timeout: int = 30,
+                 requests_per_minute: Optional[float] = DEFAULT_REQUESTS_PER_MINUTE,
+                 max_retries: int = 1,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 json_backend: Optional[str] = None,
+                 base_url: str = DEFAULT_BASE_URL,
+                 metrics: Optional[MetricsSink] = None,
+                 session: Optional[requests.Session] = None,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 id_map: Optional[Dict[str, str]] = None):
+        """
+        Initialize the CoinPaprika API client.
+
+        Args:
+            timeout: Request timeout in seconds
+            requests_per_minute: Rate of the shared limiter (None or 0 disables rate limiting)
+            max_retries: Retries for 429/5xx responses and timeouts (0 disables retries)
+            rate_limiter: Explicit token bucket, overriding requests_per_minute
+            retry_policy: Explicit retry policy, overriding max_retries
+            json_backend: JSON backend for responses ('orjson', 'ujson' or 'json')
+            base_url: API root
+            metrics: Optional instrumentation sink (see crypto_info.metrics)
+            session: Session to send requests with
+            pool_maxsize: Connections kept open to the API when no session is given
+            id_map: CoinPaprika IDs by CoinGecko ID, overriding the slug match
+        """
+        if rate_limiter is None and requests_per_minute:
+            rate_limiter = get_shared_limiter('coinpaprika', requests_per_minute / 60.0, DEFAULT_BURST)
+        if retry_policy is None and max_retries > 0:
+            retry_policy = RetryPolicy(max_retries=max_retries)
+
+        if session is None:
+            session = PooledSession(pool_maxsize=pool_maxsize)
+
+        super().__init__(base_url=base_url, timeout=timeout,
+                         rate_limiter=rate_limiter, retry_policy=retry_policy,
+                         json_decoder=get_decoder(json_backend), metrics=metrics,
+                         session=session)
+        self.id_map = dict(id_map or {})
+        self._slug_map: Optional[Dict[str, str]] = None
+        self._slug_lock = threading.Lock()
+
+    def _endpoint_label(self, url: str) -> str:
+        """Get the endpoint label of a URL, with coin IDs collapsed to {id}."""
+        path = super()._endpoint_label(url)
+        for prefix in ('/tickers/', '/coins/'):
+            if path.startswith(prefix):
+                return f"{prefix}{{id}}"
+        return path
+
+    @staticmethod
+    def _coingecko_id(coin: Dict[str, Any]) -> str:
+        """Get the CoinGecko-style ID of a CoinPaprika coin: its ID without the symbol prefix."""
+        paprika_id = coin.get('id', '')
+        prefix = f"{coin.get('symbol', '').lower()}-"
+        return paprika_id[len(prefix):] if paprika_id.startswith(prefix) else paprika_id
+
+    def _load_slug_map(self) -> Dict[str, str]:
+        """Map CoinGecko-style IDs to CoinPaprika IDs, loading /coins on first use."""
+        with self._slug_lock:
+            if self._slug_map is None:
+                slug_map: Dict[str, str] = {}
+                ranks: Dict[str, int] = {}
+                for coin in self._make_request("/coins"):
+                    if not coin.get('is_active', True):
+                        continue
+                    slug = self._coingecko_id(coin)
+                    # Unranked coins have rank 0; prefer the best ranked coin per slug
+                    rank = coin.get('rank') or float('inf')
+                    if slug not in slug_map or rank < ranks[slug]:
+                        slug_map[slug] = coin['id']
+                        ranks[slug] = rank
+                self._slug_map = slug_map
+            return self._slug_map
+
+    def paprika_id(self, coin_id: str) -> Optional[str]:
+        """
+        Translate a CoinGecko ID to a CoinPaprika ID.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+
+        Returns:
+            CoinPaprika ID, or None if the coin is not listed
+        """
+        if coin_id in self.id_map:
+            return self.id_map[coin_id]
+        return self._load_slug_map().get(coin_id)
+
+    def ping(self) -> Dict[str, Any]:
+        """
+        Check the API server status.
+
+        Returns:
+            Global market overview as a dictionary
+        """
+        return self._make_request("/global")
+
+    def get_coin_price(self, coin_ids: List[str], vs_currencies: List[str],
+                      include_market_cap: bool = False,
+                      include_24hr_vol: bool = False,
+                      include_24hr_change: bool = False,
+                      include_last_updated_at: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Get current price of coins in the specified currencies.
+
+        Prices come from /tickers/{id}, or from a single /tickers request for
+        more than BULK_TICKERS_THRESHOLD coins. Currencies CoinPaprika does
+        not quote are left out.
+
+        Args:
+            coin_ids: List of CoinGecko IDs of the coins
+            vs_currencies: List of currencies to get prices in
+            include_market_cap: Include market cap data
+            include_24hr_vol: Include 24h volume data
+            include_24hr_change: Include 24h price change data
+            include_last_updated_at: Include last updated timestamp
+
+        Returns:
+            Dictionary of coin prices by currency, keyed by CoinGecko ID
+        """
+        ids = {}
+        for coin_id in coin_ids:
+            paprika_id = self.paprika_id(coin_id)
+            if paprika_id is None:
+                logger.debug("Coin '%s' is not listed on CoinPaprika", coin_id)
+            else:
+                ids[paprika_id] = coin_id
+
+        params = {'quotes': ','.join(currency.upper() for currency in vs_currencies)}
+        if len(ids) > BULK_TICKERS_THRESHOLD:
+            tickers = [ticker for ticker in self._make_request("/tickers", params=params)
+                       if ticker.get('id') in ids]
+        else:
+            tickers = []
+            for paprika_id in ids:
+                try:
+                    tickers.append(self._make_request(f"/tickers/{paprika_id}", params=params))
+                except HTTPError as e:
+                    if getattr(e.response, 'status_code', None) != 404:
+                        raise
+                    logger.debug("No ticker for '%s' on CoinPaprika", paprika_id)
+
+        prices = {}
+        for ticker in tickers:
+            prices[ids[ticker['id']]] = self._normalize_ticker(
+                ticker, vs_currencies, include_market_cap, include_24hr_vol,
+                include_24hr_change, include_last_updated_at
+            )
+        return prices
+
+    @staticmethod
+    def _normalize_ticker(ticker: Dict[str, Any], vs_currencies: List[str],
+                          include_market_cap: bool, include_24hr_vol: bool,
+                          include_24hr_change: bool, include_last_updated_at: bool) -> Dict[str, Any]:
+        """Convert a CoinPaprika ticker to a CoinGecko /simple/price entry."""
+        quotes = ticker.get('quotes') or {}
+        entry: Dict[str, Any] = {}
+        for currency in vs_currencies:
+            quote = quotes.get(currency.upper())
+            if quote is None:
+                continue
+            currency = currency.lower()
+            entry[currency] = quote.get('price')
+            if include_market_cap:
+                entry[f"{currency}_market_cap"] = quote.get('market_cap')
+            if include_24hr_vol:
+                entry[f"{currency}_24h_vol"] = quote.get('volume_24h')
+            if include_24hr_change:
+                entry[f"{currency}_24h_change"] = quote.get('percent_change_24h')
+        if include_last_updated_at and ticker.get('last_updated'):
+            # Python < 3.11 does not parse the 'Z' suffix
+            updated = datetime.fromisoformat(ticker['last_updated'].replace('Z', '+00:00'))
+            entry['last_updated_at'] = int(updated.timestamp())
+        return entry
+
+    def search_coins(self, query: str) -> Dict[str, Any]:
+        """
+        Search for coins by name or symbol.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Dictionary with a 'coins' list in CoinGecko's /search shape
+        """
+        params = {'q': query, 'c': 'currencies', 'limit': 25}
+        results = self._make_request("/search", params=params)
+        coingecko_ids = {paprika_id: coin_id for coin_id, paprika_id in self.id_map.items()}
+        coins = []
+        for coin in results.get('currencies', []):
+            coins.append({
+                'id': coingecko_ids.get(coin.get('id')) or self._coingecko_id(coin),
+                'symbol': coin.get('symbol', '').lower(),
+                'name': coin.get('name'),
+                'market_cap_rank': coin.get('rank') or None,
+            })
+        return {'coins': coins}
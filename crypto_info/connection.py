@@ -0,0 +1,131 @@
+"""
+Pooled HTTP sessions for API clients.
+
+A bare ``requests.Session`` keeps at most 10 connections per host, so
+concurrent lookups beyond that open (and TLS-handshake) a new connection for
+every request that does not fit in the pool. Sessions created here size the
+pool for the expected concurrency, negotiate response compression, enable TCP
+keep-alive and drop connections that have been idle long enough for the
+server to have closed them.
+
+Sessions are safe to share between threads: urllib3's pools hand each
+request its own connection, and the only other shared state (the cookie jar
+and the idle timestamp) is locked.
+
+HTTP/2 is not available: requests and urllib3 speak HTTP/1.1 only. With a
+large enough pool, concurrent requests reuse warm connections instead.
+"""
+import logging
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util import make_headers
+
+logger = logging.getLogger(__name__)
+
+# Number of hosts with a connection pool
+DEFAULT_POOL_CONNECTIONS = 10
+# Maximum connections kept open per host
+DEFAULT_POOL_MAXSIZE = 32
+# Pooled connections unused for longer than this are closed before the next
+# request; servers and load balancers commonly drop idle connections after 60 s
+DEFAULT_IDLE_TIMEOUT = 50.0
+
+def accept_encoding() -> str:
+    """
+    Get the Accept-Encoding header value for the installed decoders.
+
+    Brotli (and zstd) are only offered when urllib3 can decode them, i.e. the
+    ``brotli``/``brotlicffi`` (or ``zstandard``) package is installed.
+
+    Returns:
+        Comma-separated content codings
+    """
+    return make_headers(accept_encoding=True)['accept-encoding']
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTP adapter enabling TCP keep-alive probes on pooled sockets."""
+    def init_poolmanager(self, *args, **kwargs):
+        options = list(kwargs.pop('socket_options', HTTPConnection.default_socket_options))
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10))
+        kwargs['socket_options'] = options
+        super().init_poolmanager(*args, **kwargs)
+
+class PooledSession(requests.Session):
+    """
+    requests Session with a tuned connection pool and idle connection refresh.
+    """
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, pool_block: bool = False,
+                 idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+                 compression: bool = True, tcp_keepalive: bool = True):
+        """
+        Initialize the session.
+
+        Args:
+            pool_connections: Number of hosts with a connection pool
+            pool_maxsize: Maximum connections kept open per host
+            pool_block: Wait for a free connection instead of opening an extra,
+                unpooled one when all pooled connections are busy
+            idle_timeout: Close pooled connections after this many idle seconds
+                (None keeps them until the server closes them)
+            compression: Ask for compressed responses (gzip, deflate and br when available)
+            tcp_keepalive: Enable TCP keep-alive probes on pooled sockets
+        """
+        super().__init__()
+        adapter_class = _KeepAliveAdapter if tcp_keepalive else HTTPAdapter
+        adapter = adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                pool_block=pool_block)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.headers['Accept-Encoding'] = accept_encoding() if compression else 'identity'
+        self.idle_timeout = idle_timeout
+        self._last_used: Optional[float] = None
+        self._idle_lock = threading.Lock()
+
+    def request(self, *args, **kwargs):
+        if self.idle_timeout:
+            now = time.monotonic()
+            with self._idle_lock:
+                idle = self._last_used is not None and now - self._last_used > self.idle_timeout
+                self._last_used = now
+            if idle:
+                self.refresh()
+        return super().request(*args, **kwargs)
+
+    def refresh(self):
+        """Close all pooled connections; the next requests open new ones."""
+        logger.debug("Closing idle pooled connections")
+        for adapter in self.adapters.values():
+            adapter.poolmanager.clear()
+
+_shared_sessions: Dict[str, PooledSession] = {}
+_shared_sessions_lock = threading.Lock()
+
+def get_shared_session(name: str, **kwargs) -> PooledSession:
+    """
+    Get a process-wide session by name, creating it on first use.
+
+    Clients given the same shared session reuse one connection pool, so
+    connections opened by one client are warm for the others.
+
+    Args:
+        name: Session name (e.g. the provider name)
+        **kwargs: PooledSession arguments, used only when the session is created
+
+    Returns:
+        Shared PooledSession
+    """
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(name)
+        if session is None:
+            session = _shared_sessions[name] = PooledSession(**kwargs)
+        return session
@@ -1,25 +1,136 @@
 """
 Main module for the crypto_info package.
 """
+import copy
+import functools
 import logging
-from typing import Dict, Any, Optional, List
-from .coingecko_client import CoinGeckoClient
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Callable, Union
+from .cache import ResponseCache, FRESH, STALE, MISS
+from .deadline import deadline, propagate, check as check_deadline
+from .metrics import MetricsSink
+from .poller import PricePoller, PriceChange
+from .symbol_index import SymbolIndex
 
 logger = logging.getLogger(__name__)
 
+# Fields returned by get_crypto_info, in order
+CRYPTO_INFO_FIELDS = [
+    'id', 'name', 'symbol', 'description', 'image', 'current_price', 'market_cap',
+    'market_cap_rank', 'total_volume', 'high_24h', 'low_24h', 'price_change_24h',
+    'price_change_percentage_24h', 'last_updated'
+]
+
+# Fields holding one value per currency
+PER_CURRENCY_FIELDS = ['current_price', 'market_cap', 'total_volume', 'high_24h', 'low_24h']
+
+# Fields that come from the market_data section of /coins/{id}
+MARKET_DATA_INFO_FIELDS = PER_CURRENCY_FIELDS + ['price_change_24h', 'price_change_percentage_24h']
+
+# Fields available from /simple/price
+SIMPLE_PRICE_INFO_FIELDS = [
+    'id', 'current_price', 'market_cap', 'total_volume', 'price_change_percentage_24h', 'last_updated'
+]
+
+# /simple/price key suffix for the per-currency fields it provides
+SIMPLE_PRICE_SUFFIXES = {
+    'current_price': '',
+    'market_cap': '_market_cap',
+    'total_volume': '_24h_vol',
+}
+
+# Fields available from /coins/markets
+MARKETS_INFO_FIELDS = [field for field in CRYPTO_INFO_FIELDS if field != 'description']
+
+# Fields kept from each /coins/markets record by stream_market_snapshot
+MARKET_FIELDS = [
+    'current_price', 'market_cap', 'market_cap_rank', 'total_volume', 'high_24h',
+    'low_24h', 'price_change_24h', 'price_change_percentage_24h', 'last_updated'
+]
+
+# Maximum length of the URL-encoded ``ids`` query parameter sent to
+# /simple/price in a single request. Commas are encoded as ``%2C`` so they
+# count three characters each. Kept well below the ~8KB URL limit enforced by
+# common proxies and CDNs.
+MAX_IDS_PARAM_LENGTH = 2000
+
+# Default thread pool size of get_prices_parallel and get_crypto_info_many
+DEFAULT_MAX_WORKERS = 8
+
+def _format_timestamp(timestamp: Optional[float]) -> Optional[str]:
+    """Format a Unix timestamp like the 'last_updated' fields of CoinGecko documents."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+def _with_deadline(method: Callable) -> Callable:
+    """Run a public CryptoInfo method within the instance's per-call timeout."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.timeout is None:
+            return method(self, *args, **kwargs)
+        with deadline(self.timeout):
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class CryptoInfo:
     """
     Main class for retrieving cryptocurrency information.
+    
+    Instances are thread-safe: one CryptoInfo (with its resolved-symbol
+    cache, response cache and pooled HTTP session) can be shared by all
+    threads of a server instead of creating one per thread.
     """
-    def __init__(self, api_client=None):
+    def __init__(self, api_client=None, symbol_index: Optional[SymbolIndex] = None,
+                 cache: Optional[ResponseCache] = None,
+                 metrics: Optional[MetricsSink] = None,
+                 history_store: Optional['HistoryStore'] = None,
+                 timeout: Optional[float] = None,
+                 stream_transport: Optional['StreamTransport'] = None):
         """
         Initialize the CryptoInfo class.
         
         Args:
             api_client: Optional API client to use (defaults to CoinGeckoClient)
+            symbol_index: Optional symbol index consulted before network search
+                (defaults to the lazily loaded index at DEFAULT_INDEX_PATH)
+            cache: Optional response cache for prices and coin data (disabled by default)
+            metrics: Optional sink for symbol resolution timings; also used by the
+                default API client (see crypto_info.metrics)
+            history_store: Optional store for get_history (defaults to a
+                HistoryStore at DEFAULT_HISTORY_DIR, created on first use)
+            timeout: Optional deadline in seconds for each public method call,
+                covering symbol resolution, retries and rate limiter waits
+                (see crypto_info.deadline); None leaves calls bounded only by
+                the API client's request timeouts
+            stream_transport: Optional push price feed used by subscribe()
+                (see crypto_info.streaming); without one, subscriptions poll
         """
-        self.api_client = api_client or CoinGeckoClient()
+        if api_client is None:
+            # Imported here so importing this module does not load the HTTP stack
+            from .coingecko_client import CoinGeckoClient
+            api_client = CoinGeckoClient(metrics=metrics)
+        
+        self.api_client = api_client
+        self.symbol_index = symbol_index if symbol_index is not None else SymbolIndex()
+        self.cache = cache
+        self.metrics = metrics
+        self.history_store = history_store
+        self._history_store_lock = threading.Lock()
+        self.timeout = timeout
+        self.stream_transport = stream_transport
+        self._feeds: Dict[Tuple[str, ...], 'PriceFeed'] = {}
+        self._feeds_lock = threading.Lock()
         self._id_cache = {}  # Cache for symbol to ID mapping
+        self._id_cache_lock = threading.Lock()
+    
+    def _remember_coin_id(self, symbol: str, coin_id: str) -> str:
+        """Store a resolved symbol in the symbol to ID cache."""
+        with self._id_cache_lock:
+            self._id_cache[symbol] = coin_id
+        return coin_id
         
     def _get_coin_id(self, symbol: str) -> str:
         """
@@ -31,85 +142,381 @@ class CryptoInfo:
         Returns:
             CoinGecko ID for the symbol
             
+        Raises:
+            ValueError: If the symbol cannot be found
+        """
+        if self.metrics is None:
+            return self._resolve_coin_id(symbol)[0]
+        
+        start = time.perf_counter()
+        source = 'error'
+        try:
+            coin_id, source = self._resolve_coin_id(symbol)
+            return coin_id
+        finally:
+            self.metrics.observe('crypto_info_symbol_resolution_seconds', time.perf_counter() - start,
+                                 {'source': source})
+    
+    def _resolve_coin_id(self, symbol: str) -> Tuple[str, str]:
+        """
+        Resolve a symbol from the resolved-symbol cache, the symbol index,
+        the response cache (where other processes share their searches) or
+        network search.
+        
+        Args:
+            symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+            
+        Returns:
+            Tuple of (CoinGecko ID, source) where source is 'cache', 'index' or 'search'
+            
         Raises:
             ValueError: If the symbol cannot be found
         """
         symbol = symbol.lower()
         
         # Check cache first
-        if symbol in self._id_cache:
-            return self._id_cache[symbol]
+        coin_id = self._id_cache.get(symbol)
+        if coin_id is not None:
+            return coin_id, 'cache'
+        
+        # Then the local symbol index, which avoids a network round trip
+        coin_id = self.symbol_index.lookup(symbol)
+        if coin_id:
+            return self._remember_coin_id(symbol, coin_id), 'index'
+        
+        # Then a resolution found by another process sharing the response cache
+        if self.cache is not None:
+            state, coin_id = self.cache.get(('symbol', symbol), namespace='symbol')
+            if state != MISS:
+                return self._remember_coin_id(symbol, coin_id), 'cache'
         
         # Search for the coin
         try:
+            check_deadline(f"searching for symbol '{symbol}'")
             search_results = self.api_client.search_coins(symbol)
             coins = search_results.get('coins', [])
             
-            # Find exact match for symbol
-            for coin in coins:
-                if coin.get('symbol', '').lower() == symbol:
-                    self._id_cache[symbol] = coin.get('id')
-                    return coin.get('id')
-            
-            # If no exact match, use the first result if available
-            if coins:
-                self._id_cache[symbol] = coins[0].get('id')
-                logger.warning(f"No exact match for symbol '{symbol}', using '{coins[0].get('id')}'")
-                return coins[0].get('id')
-                
-            raise ValueError(f"Could not find cryptocurrency with symbol '{symbol}'")
+            # Find exact match for symbol, or use the first result if available
+            match = next((coin for coin in coins if coin.get('symbol', '').lower() == symbol), None)
+            if match is None and coins:
+                match = coins[0]
+                logger.warning("No exact match for symbol '%s', using '%s'", symbol, match.get('id'))
+            
+            if match is None:
+                raise ValueError(f"Could not find cryptocurrency with symbol '{symbol}'")
             
         except Exception as e:
             logger.error(f"Error finding coin ID for symbol '{symbol}': {e}")
             raise ValueError(f"Could not find cryptocurrency with symbol '{symbol}': {e}")
-    
-    def get_crypto_info(self, symbol: str) -> Dict[str, Any]:
+        
+        coin_id = match.get('id')
+        if self.cache is not None:
+            self.cache.set(('symbol', symbol), coin_id, 'symbol')
+        return self._remember_coin_id(symbol, coin_id), 'search'
+
+    @_with_deadline
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search cryptocurrencies by symbol, name or ID, for autocomplete and typo-tolerant lookup.
+
+        Matches come from the local symbol index: exact symbols, exact names,
+        prefixes, then names within a few typos, each ordered by market cap
+        rank. Only when no index is available is the network /search used.
+
+        Args:
+            query: Search text (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            List of coins as dictionaries with 'id', 'symbol', 'name' and
+            'market_cap_rank' keys, best match first
+        """
+        if len(self.symbol_index):
+            return self.symbol_index.search(query, limit)
+
+        if not query.strip() or limit <= 0:
+            return []
+        check_deadline(f"searching for '{query}'")
+        coins = self.api_client.search_coins(query).get('coins', [])
+        return [
+            {key: coin.get(key) for key in ('id', 'symbol', 'name', 'market_cap_rank')}
+            for coin in coins[:limit]
+        ]
+
+    @_with_deadline
+    def get_crypto_info(self, symbol: str, fields: Optional[List[str]] = None,
+                        currencies: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get detailed information about a cryptocurrency by its symbol.
         
+        Without a projection the full /coins/{id} document is fetched. When
+        fields or currencies are given, only those are returned and the
+        cheapest endpoint that provides them is used: /simple/price for
+        prices, market caps, volumes and the 24h change, /coins/markets for
+        the other market fields in a single currency, and /coins/{id}
+        (without market data when none is requested) otherwise.
+        
         Args:
             symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+            fields: Optional subset of CRYPTO_INFO_FIELDS to return ('id' is always included)
+            currencies: Optional currencies to keep in the per-currency fields
             
         Returns:
             Dictionary containing cryptocurrency information
             
         Raises:
-            ValueError: If the symbol cannot be found
+            ValueError: If the symbol cannot be found or a field is unknown
         """
+        if fields is not None:
+            unknown = [field for field in fields if field not in CRYPTO_INFO_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown cryptocurrency information fields: {', '.join(unknown)}")
+            fields = ['id'] + [field for field in CRYPTO_INFO_FIELDS if field in fields and field != 'id']
+        if currencies is not None:
+            currencies = [currency.lower() for currency in currencies]
+        
         try:
             coin_id = self._get_coin_id(symbol)
-            coin_data = self.api_client.get_coin_by_id(coin_id)
             
-            # Extract relevant information
-            result = {
-                'id': coin_data.get('id'),
-                'name': coin_data.get('name'),
-                'symbol': coin_data.get('symbol', '').upper(),
-                'description': coin_data.get('description', {}).get('en', ''),
-                'image': coin_data.get('image', {}).get('large'),
-                'current_price': {},
-                'market_cap': {},
-                'market_cap_rank': coin_data.get('market_cap_rank'),
-                'total_volume': {},
-                'high_24h': {},
-                'low_24h': {},
-                'price_change_24h': coin_data.get('market_data', {}).get('price_change_24h'),
-                'price_change_percentage_24h': coin_data.get('market_data', {}).get('price_change_percentage_24h'),
-                'last_updated': coin_data.get('last_updated')
-            }
-            
-            # Extract price data for different currencies
-            market_data = coin_data.get('market_data', {})
-            for currency_field in ['current_price', 'market_cap', 'total_volume', 'high_24h', 'low_24h']:
-                for currency, value in market_data.get(currency_field, {}).items():
-                    result[currency_field][currency] = value
-            
-            return result
+            if fields is None and currencies is None:
+                endpoint = 'coin'
+                key = ('coin', coin_id, 'market_data')
+                loader = lambda: self._fetch_crypto_info(coin_id)
+            else:
+                endpoint = self._choose_info_endpoint(fields or CRYPTO_INFO_FIELDS, currencies)
+                key = (endpoint, coin_id, tuple(fields or ()), tuple(currencies or ()))
+                loader = lambda: self._fetch_projected_info(endpoint, coin_id, fields, currencies)
+            
+            if self.cache is None:
+                info = loader()
+            else:
+                info = self.cache.get_or_load(key, endpoint, loader)
+            # A copy, so callers cannot change cached or shared documents
+            return copy.deepcopy(info)
             
         except Exception as e:
             logger.error(f"Error getting information for symbol '{symbol}': {e}")
             raise ValueError(f"Failed to get information for cryptocurrency '{symbol}': {e}")
     
+    @staticmethod
+    def _choose_info_endpoint(fields: List[str], currencies: Optional[List[str]]) -> str:
+        """
+        Choose the cheapest endpoint that provides a projection.
+        
+        Args:
+            fields: Requested fields
+            currencies: Requested currencies (None for all)
+            
+        Returns:
+            'price' for /simple/price, 'markets' for /coins/markets or 'coin' for /coins/{id}
+        """
+        if currencies and all(field in SIMPLE_PRICE_INFO_FIELDS for field in fields):
+            return 'price'
+        
+        # /coins/markets takes one currency and reports the 24h changes in it,
+        # while get_crypto_info reports them in USD
+        usd_only = {'price_change_24h', 'price_change_percentage_24h'}
+        if (currencies and len(currencies) == 1
+                and all(field in MARKETS_INFO_FIELDS for field in fields)
+                and (currencies[0] == 'usd' or not usd_only.intersection(fields))):
+            return 'markets'
+        
+        return 'coin'
+    
+    def _fetch_projected_info(self, endpoint: str, coin_id: str, fields: Optional[List[str]],
+                              currencies: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Fetch a projection of get_crypto_info from the given endpoint.
+        
+        Args:
+            endpoint: Endpoint chosen by _choose_info_endpoint
+            coin_id: CoinGecko ID of the coin
+            fields: Requested fields (None for all)
+            currencies: Requested currencies (None for all)
+            
+        Returns:
+            Dictionary containing the requested cryptocurrency information
+            
+        Raises:
+            ValueError: If the endpoint has no data for the coin
+        """
+        if endpoint == 'price':
+            # The USD 24h change backs price_change_percentage_24h
+            vs_currencies = list(currencies)
+            if 'price_change_percentage_24h' in fields and 'usd' not in vs_currencies:
+                vs_currencies.append('usd')
+            
+            price_data = self.api_client.get_coin_price(
+                [coin_id],
+                vs_currencies,
+                include_market_cap='market_cap' in fields,
+                include_24hr_vol='total_volume' in fields,
+                include_24hr_change='price_change_percentage_24h' in fields,
+                include_last_updated_at='last_updated' in fields
+            )
+            if coin_id not in price_data:
+                raise ValueError(f"No price data found for '{coin_id}'")
+            return self._extract_simple_price_info(coin_id, price_data[coin_id], fields, currencies)
+        
+        if endpoint == 'markets':
+            markets = self.api_client.get_coins_markets(currencies[0], ids=[coin_id], per_page=1)
+            if not markets:
+                raise ValueError(f"No market data found for '{coin_id}'")
+            return self._extract_market_info(markets[0], fields, currencies[0])
+        
+        needs_market_data = fields is None or any(field in MARKET_DATA_INFO_FIELDS for field in fields)
+        if needs_market_data:
+            coin_data = self.api_client.get_coin_by_id(coin_id)
+        else:
+            coin_data = self.api_client.get_coin_by_id(coin_id, market_data=False)
+        return self._extract_crypto_info(coin_data, fields, currencies)
+    
+    @staticmethod
+    def _extract_simple_price_info(coin_id: str, price_data: Dict[str, Any], fields: List[str],
+                                   currencies: List[str]) -> Dict[str, Any]:
+        """
+        Build a get_crypto_info projection from a /simple/price entry.
+        
+        Args:
+            coin_id: CoinGecko ID of the coin
+            price_data: Entry of the /simple/price response for the coin
+            fields: Requested fields
+            currencies: Requested currencies
+            
+        Returns:
+            Dictionary containing the requested cryptocurrency information
+        """
+        result: Dict[str, Any] = {}
+        
+        for field in fields:
+            if field == 'id':
+                result['id'] = coin_id
+            elif field in SIMPLE_PRICE_SUFFIXES:
+                suffix = SIMPLE_PRICE_SUFFIXES[field]
+                result[field] = {
+                    currency: price_data[f"{currency}{suffix}"]
+                    for currency in currencies
+                    if f"{currency}{suffix}" in price_data
+                }
+            elif field == 'price_change_percentage_24h':
+                result[field] = price_data.get('usd_24h_change')
+            elif field == 'last_updated':
+                result[field] = _format_timestamp(price_data.get('last_updated_at'))
+        
+        return result
+    
+    @staticmethod
+    def _extract_market_info(market: Dict[str, Any], fields: List[str],
+                             vs_currency: str) -> Dict[str, Any]:
+        """
+        Build a get_crypto_info projection from a /coins/markets record.
+        
+        Args:
+            market: Market data dictionary from /coins/markets
+            fields: Requested fields
+            vs_currency: Currency the market data is in
+            
+        Returns:
+            Dictionary containing the requested cryptocurrency information
+        """
+        result: Dict[str, Any] = {}
+        
+        for field in fields:
+            if field in PER_CURRENCY_FIELDS:
+                value = market.get(field)
+                result[field] = {vs_currency: value} if value is not None else {}
+            elif field == 'symbol':
+                result[field] = (market.get('symbol') or '').upper()
+            else:
+                result[field] = market.get(field)
+        
+        return result
+    
+    def _fetch_crypto_info(self, coin_id: str) -> Dict[str, Any]:
+        """
+        Fetch a coin document and extract the fields returned by get_crypto_info.
+        
+        Args:
+            coin_id: CoinGecko ID of the coin
+            
+        Returns:
+            Dictionary containing cryptocurrency information
+        """
+        return self._extract_crypto_info(self.api_client.get_coin_by_id(coin_id))
+    
+    @staticmethod
+    def _extract_crypto_info(coin_data: Dict[str, Any], fields: Optional[List[str]] = None,
+                             currencies: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Extract the fields returned by get_crypto_info from a /coins/{id} document.
+        
+        Sections of the document that are not requested are not read.
+        
+        Args:
+            coin_data: Coin data as returned by get_coin_by_id
+            fields: Fields to extract (None for all CRYPTO_INFO_FIELDS)
+            currencies: Currencies to keep in the per-currency fields (None for all)
+            
+        Returns:
+            Dictionary containing cryptocurrency information
+        """
+        market_data = coin_data.get('market_data') or {}
+        result: Dict[str, Any] = {}
+        
+        for field in fields or CRYPTO_INFO_FIELDS:
+            if field in PER_CURRENCY_FIELDS:
+                # Extract price data for different currencies
+                values = market_data.get(field) or {}
+                if currencies is None:
+                    result[field] = dict(values)
+                else:
+                    result[field] = {c: values[c] for c in currencies if c in values}
+            elif field == 'symbol':
+                result[field] = coin_data.get('symbol', '').upper()
+            elif field == 'description':
+                result[field] = (coin_data.get('description') or {}).get('en', '')
+            elif field == 'image':
+                result[field] = (coin_data.get('image') or {}).get('large')
+            elif field in ('price_change_24h', 'price_change_percentage_24h'):
+                result[field] = market_data.get(field)
+            else:
+                result[field] = coin_data.get(field)
+        
+        return result
+    
+    @_with_deadline
+    def get_crypto_info_many(self, symbols: List[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                             fields: Optional[List[str]] = None,
+                             currencies: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information for several cryptocurrencies using a thread pool.
+        
+        /coins/{id} cannot be batched, so one request per symbol is issued and
+        up to max_workers of them are in flight at once.
+        
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            max_workers: Maximum number of requests in flight at once
+            fields: Fields to return for each symbol (see get_crypto_info)
+            currencies: Currencies to keep in per-currency fields (see get_crypto_info)
+            
+        Returns:
+            Dictionary keyed by the requested symbols. Each value is either the
+            dictionary returned by get_crypto_info or ``{'error': message}``.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def fetch(symbol):
+            try:
+                return self.get_crypto_info(symbol, fields=fields, currencies=currencies)
+            except ValueError as e:
+                return {'error': str(e)}
+        
+        unique_symbols = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crypto-info') as executor:
+            return dict(zip(unique_symbols, executor.map(propagate(fetch), unique_symbols)))
+    
+    @_with_deadline
     def get_price(self, symbol: str, vs_currencies: List[str] = None) -> Dict[str, float]:
         """
         Get the current price of a cryptocurrency in various currencies.
@@ -129,19 +536,614 @@ class CryptoInfo:
         
         try:
             coin_id = self._get_coin_id(symbol)
-            price_data = self.api_client.get_coin_price(
-                [coin_id], 
-                vs_currencies,
-                include_24hr_change=True,
-                include_market_cap=True
-            )
+            price = self._get_prices_by_id([coin_id], vs_currencies).get(coin_id)
             
             # Extract price data
-            if coin_id in price_data:
-                return price_data[coin_id]
-            else:
+            if isinstance(price, Exception):
+                raise price
+            if price is None:
                 raise ValueError(f"No price data found for cryptocurrency '{symbol}'")
+            # A copy, so callers cannot change cached or shared prices
+            return dict(price)
                 
         except Exception as e:
             logger.error(f"Error getting price for symbol '{symbol}': {e}")
             raise ValueError(f"Failed to get price for cryptocurrency '{symbol}': {e}")
+
+    @_with_deadline
+    def get_prices(self, symbols: List[str],
+                   vs_currencies: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current prices of several cryptocurrencies at once.
+        
+        All symbols are resolved first, then the CoinGecko IDs are sent to
+        /simple/price in as few requests as the URL length limit allows.
+        A failure for one symbol (unknown symbol, missing price data or a
+        failed request for its chunk) does not fail the whole batch.
+        
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            vs_currencies: List of currencies to get prices in (defaults to ['usd', 'eur', 'gbp'])
+            
+        Returns:
+            Dictionary keyed by the requested symbols. Each value is either the
+            price dictionary returned by get_price or ``{'error': message}``.
+        """
+        return self._get_prices(symbols, vs_currencies, map)
+    
+    @_with_deadline
+    def get_prices_parallel(self, symbols: List[str], vs_currencies: List[str] = None,
+                            max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current prices of several cryptocurrencies using a thread pool.
+        
+        Like get_prices, but symbols missing from the local index are resolved
+        with concurrent /search requests (which cannot be batched), and the
+        /simple/price chunks of very large batches are fetched concurrently.
+        
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            vs_currencies: List of currencies to get prices in (defaults to ['usd', 'eur', 'gbp'])
+            max_workers: Maximum number of requests in flight at once
+            
+        Returns:
+            Dictionary keyed by the requested symbols. Each value is either the
+            price dictionary returned by get_price or ``{'error': message}``.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crypto-info') as executor:
+            return self._get_prices(symbols, vs_currencies,
+                                    lambda fn, items: executor.map(propagate(fn), items))
+    
+    def _get_prices(self, symbols: List[str], vs_currencies: Optional[List[str]],
+                    map_fn: Callable) -> Dict[str, Dict[str, Any]]:
+        """
+        Get prices for symbols, running independent requests through map_fn.
+        
+        Args:
+            symbols: Cryptocurrency symbols
+            vs_currencies: List of currencies to get prices in (defaults to ['usd', 'eur', 'gbp'])
+            map_fn: map, or the map method of an executor to run requests concurrently
+            
+        Returns:
+            Dictionary keyed by the requested symbols as returned by get_prices
+        """
+        if vs_currencies is None:
+            vs_currencies = ['usd', 'eur', 'gbp']
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        symbols_by_id: Dict[str, List[str]] = {}
+        unique_symbols = list(dict.fromkeys(symbols))
+        
+        def resolve(symbol):
+            try:
+                return self._get_coin_id(symbol)
+            except ValueError as e:
+                return e
+        
+        for symbol, coin_id in zip(unique_symbols, map_fn(resolve, unique_symbols)):
+            if isinstance(coin_id, Exception):
+                results[symbol] = {'error': str(coin_id)}
+            else:
+                symbols_by_id.setdefault(coin_id, []).append(symbol)
+        
+        prices = self._get_prices_by_id(list(symbols_by_id), vs_currencies, map_fn)
+        
+        for coin_id, coin_symbols in symbols_by_id.items():
+            price = prices.get(coin_id)
+            for symbol in coin_symbols:
+                if isinstance(price, Exception):
+                    results[symbol] = {'error': f"Failed to get price for cryptocurrency '{symbol}': {price}"}
+                elif price is None:
+                    results[symbol] = {'error': f"No price data found for cryptocurrency '{symbol}'"}
+                else:
+                    # One copy per symbol, so callers cannot change cached or shared prices
+                    results[symbol] = dict(price)
+        
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+    
+    @staticmethod
+    def _price_cache_key(coin_id: str, vs_currencies: List[str]) -> tuple:
+        """Cache key for a /simple/price entry of one coin."""
+        return ('price', coin_id, tuple(sorted(c.lower() for c in vs_currencies)),
+                'include_market_cap', 'include_24hr_change')
+    
+    def _get_prices_by_id(self, coin_ids: List[str], vs_currencies: List[str],
+                          map_fn: Callable = map) -> Dict[str, Any]:
+        """
+        Get prices for CoinGecko IDs, using the response cache when enabled.
+        
+        Args:
+            coin_ids: CoinGecko IDs of the coins
+            vs_currencies: List of currencies to get prices in
+            map_fn: Function mapping the request of each chunk, see _get_prices
+            
+        Returns:
+            Dictionary keyed by CoinGecko ID whose values are price dictionaries,
+            or the exception raised by the request for that ID. IDs without
+            price data are left out.
+        """
+        if self.cache is None:
+            return self._fetch_prices(coin_ids, vs_currencies, map_fn)
+        
+        prices: Dict[str, Any] = {}
+        stale_ids: List[str] = []
+        missing_ids: List[str] = []
+        
+        # One lookup for all coins, a single round trip with a shared backend
+        keys = [self._price_cache_key(coin_id, vs_currencies) for coin_id in coin_ids]
+        for coin_id, (state, price) in zip(coin_ids, self.cache.get_many(keys)):
+            if state == FRESH:
+                prices[coin_id] = price
+            elif state == STALE:
+                prices[coin_id] = price
+                stale_ids.append(coin_id)
+            else:
+                missing_ids.append(coin_id)
+        
+        if stale_ids:
+            # Serve the stale prices now and refresh them with one background batch
+            def refresh():
+                return {
+                    self._price_cache_key(coin_id, vs_currencies): price
+                    for coin_id, price in self._fetch_prices(stale_ids, vs_currencies).items()
+                    if not isinstance(price, Exception)
+                }
+            self.cache.refresh_many(
+                [self._price_cache_key(coin_id, vs_currencies) for coin_id in stale_ids],
+                'price',
+                refresh
+            )
+        
+        if missing_ids:
+            fetched = self._fetch_prices(missing_ids, vs_currencies, map_fn)
+            for coin_id, price in fetched.items():
+                key = self._price_cache_key(coin_id, vs_currencies)
+                if not isinstance(price, Exception):
+                    self.cache.set(key, price, 'price')
+                    continue
+                # Serve an expired price rather than the error, when the cache allows it
+                state, cached = self.cache.get_if_error(key)
+                if state == STALE:
+                    fetched[coin_id] = cached
+            prices.update(fetched)
+        
+        return prices
+    
+    def _fetch_prices(self, coin_ids: List[str], vs_currencies: List[str],
+                      map_fn: Callable = map) -> Dict[str, Any]:
+        """
+        Fetch prices from /simple/price with as few requests as the URL limit allows.
+        
+        Args:
+            coin_ids: CoinGecko IDs of the coins
+            vs_currencies: List of currencies to get prices in
+            map_fn: Function mapping the request of each chunk, see _get_prices
+            
+        Returns:
+            Dictionary keyed by CoinGecko ID whose values are price dictionaries,
+            or the exception raised by the request for that ID's chunk
+        """
+        prices: Dict[str, Any] = {}
+        
+        def fetch(chunk):
+            try:
+                return self.api_client.get_coin_price(
+                    chunk,
+                    vs_currencies,
+                    include_24hr_change=True,
+                    include_market_cap=True
+                )
+            except Exception as e:
+                logger.error(f"Error getting prices for {len(chunk)} coins: {e}")
+                return e
+        
+        chunks = self._chunk_coin_ids(coin_ids)
+        for chunk, price_data in zip(chunks, map_fn(fetch, chunks)):
+            if isinstance(price_data, Exception):
+                for coin_id in chunk:
+                    prices[coin_id] = price_data
+                continue
+            
+            for coin_id in chunk:
+                if coin_id in price_data:
+                    prices[coin_id] = price_data[coin_id]
+        
+        return prices
+    
+    @staticmethod
+    def _chunk_coin_ids(coin_ids: List[str],
+                        max_length: int = MAX_IDS_PARAM_LENGTH) -> List[List[str]]:
+        """
+        Split CoinGecko IDs into chunks whose encoded ``ids`` parameter fits the URL limit.
+        
+        Args:
+            coin_ids: CoinGecko IDs to split
+            max_length: Maximum URL-encoded length of a chunk's ``ids`` parameter
+            
+        Returns:
+            List of ID chunks, preserving the input order
+        """
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_length = 0
+        
+        for coin_id in coin_ids:
+            # Separator is an encoded comma (%2C) for every ID but the first
+            added_length = len(coin_id) + (3 if current else 0)
+            if current and current_length + added_length > max_length:
+                chunks.append(current)
+                current, current_length = [], 0
+                added_length = len(coin_id)
+            current.append(coin_id)
+            current_length += added_length
+        
+        if current:
+            chunks.append(current)
+        
+        return chunks
+    
+    def stream_market_snapshot(self, vs_currency: str = 'usd', per_page: int = 250,
+                               max_pages: Optional[int] = None, limit: Optional[int] = None,
+                               prefetch: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream normalized market data for the whole market, one page at a time.
+        
+        Uses /coins/markets, which returns up to 250 coins per request, instead
+        of one /coins/{id} request per coin. Only the current page (and the
+        prefetched one) is held in memory, and closing the generator stops
+        further requests.
+        
+        Args:
+            vs_currency: Currency to get market data in
+            per_page: Number of coins per page (1-250)
+            max_pages: Maximum number of pages to fetch (None for all)
+            limit: Maximum number of coins to yield (None for all)
+            prefetch: Fetch the next page in a background thread while the
+                current page is being consumed
+            
+        Yields:
+            Lists of records with 'id', 'symbol', 'name', 'image', 'vs_currency'
+            and the MARKET_FIELDS values in vs_currency
+        """
+        if limit is not None and max_pages is None:
+            max_pages = -(-limit // per_page)
+        if limit == 0 or max_pages == 0:
+            return
+        
+        if prefetch:
+            pages = self._prefetch_market_pages(vs_currency, per_page, max_pages)
+        else:
+            pages = self.api_client.iter_markets(vs_currency, per_page=per_page, max_pages=max_pages)
+        
+        remaining = limit
+        try:
+            for markets in pages:
+                if remaining is not None:
+                    markets = markets[:remaining]
+                    remaining -= len(markets)
+                
+                if markets:
+                    yield [self._normalize_market(market, vs_currency) for market in markets]
+                
+                if remaining is not None and remaining <= 0:
+                    return
+        finally:
+            # Stops the page generator (and any prefetch) on early termination
+            close = getattr(pages, 'close', None)
+            if close is not None:
+                close()
+    
+    def _prefetch_market_pages(self, vs_currency: str, per_page: int,
+                               max_pages: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through /coins/markets, requesting the next page before yielding the current one.
+        
+        Args:
+            vs_currency: Currency to get market data in
+            per_page: Number of coins per page
+            max_pages: Maximum number of pages to fetch (None for all)
+            
+        Yields:
+            Lists of market data dictionaries, one list per page
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if max_pages is not None and max_pages <= 0:
+            return
+        
+        def fetch(page):
+            return self.api_client.get_coins_markets(vs_currency, per_page=per_page, page=page)
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='markets-prefetch')
+        page = 1
+        future = executor.submit(fetch, page)
+        try:
+            while future is not None:
+                markets = future.result()
+                last_page = len(markets) < per_page or (max_pages is not None and page >= max_pages)
+                
+                page += 1
+                future = None if last_page else executor.submit(fetch, page)
+                
+                if markets:
+                    yield markets
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _normalize_market(market: Dict[str, Any], vs_currency: str) -> Dict[str, Any]:
+        """
+        Normalize a /coins/markets record.
+        
+        Args:
+            market: Market data dictionary from /coins/markets
+            vs_currency: Currency the market data is in
+            
+        Returns:
+            Normalized record
+        """
+        record = {
+            'id': market.get('id'),
+            'symbol': (market.get('symbol') or '').upper(),
+            'name': market.get('name'),
+            'image': market.get('image'),
+            'vs_currency': vs_currency,
+        }
+        for field in MARKET_FIELDS:
+            record[field] = market.get(field)
+        return record
+    
+    @_with_deadline
+    def get_snapshot(self, symbols: List[str], vs_currencies: List[str] = None) -> 'PriceSnapshot':
+        """
+        Get a compact columnar snapshot of prices, market caps and volumes.
+        
+        Prices are fetched from /simple/price in as few requests as the URL
+        limit allows and written straight into the snapshot's columns, without
+        building a dictionary per coin. Symbols that cannot be resolved or
+        priced are left out.
+        
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            vs_currencies: List of currencies to get prices in (defaults to ['usd', 'eur', 'gbp'])
+            
+        Returns:
+            PriceSnapshot with current_price, market_cap and total_volume filled in
+        """
+        from .snapshot import PriceSnapshot
+        
+        if vs_currencies is None:
+            vs_currencies = ['usd', 'eur', 'gbp']
+        
+        coin_ids = []
+        for symbol in dict.fromkeys(symbols):
+            try:
+                coin_ids.append(self._get_coin_id(symbol))
+            except ValueError as e:
+                logger.warning(f"Skipping '{symbol}' in snapshot: {e}")
+        
+        snapshot = PriceSnapshot(vs_currencies)
+        for chunk in self._chunk_coin_ids(list(dict.fromkeys(coin_ids))):
+            try:
+                price_data = self.api_client.get_coin_price(
+                    chunk,
+                    vs_currencies,
+                    include_market_cap=True,
+                    include_24hr_vol=True,
+                    include_24hr_change=True,
+                    include_last_updated_at=True
+                )
+            except Exception as e:
+                logger.error(f"Error getting prices for {len(chunk)} coins: {e}")
+                continue
+            
+            for coin_id in chunk:
+                if coin_id in price_data:
+                    snapshot.add_price(coin_id, price_data[coin_id])
+        
+        return snapshot
+    
+    @_with_deadline
+    def get_market_snapshot(self, vs_currency: str = 'usd', max_pages: Optional[int] = None,
+                            limit: Optional[int] = None) -> 'PriceSnapshot':
+        """
+        Get a compact columnar snapshot of the whole market from /coins/markets.
+        
+        Args:
+            vs_currency: Currency to get market data in
+            max_pages: Maximum number of pages to fetch (None for all)
+            limit: Maximum number of coins (None for all)
+            
+        Returns:
+            PriceSnapshot with every per-currency field filled in for vs_currency
+        """
+        from .snapshot import PriceSnapshot
+        
+        per_page = 250
+        if limit is not None and max_pages is None:
+            max_pages = -(-limit // per_page)
+        
+        snapshot = PriceSnapshot([vs_currency])
+        for page in self.api_client.iter_markets(vs_currency, per_page=per_page, max_pages=max_pages):
+            for market in page:
+                if limit is not None and len(snapshot) >= limit:
+                    return snapshot
+                snapshot.add_market(market, vs_currency)
+        return snapshot
+    
+    def poller(self, symbols: List[str], vs_currencies: Optional[List[str]] = None,
+               callback: Optional[Callable[[PriceChange], None]] = None, **kwargs) -> PricePoller:
+        """
+        Create a poller reporting only the watchlist quotes that changed.
+        
+        Args:
+            symbols: Watchlist of cryptocurrency symbols
+            vs_currencies: Currencies to get prices in (defaults to ['usd'])
+            callback: Optional function called with each PriceChange
+            **kwargs: Extra PricePoller arguments (min_interval, max_interval)
+            
+        Returns:
+            PricePoller; call poll_once(), iterate iter_changes() or start() it
+        """
+        return PricePoller(self, symbols, vs_currencies, callback=callback, **kwargs)
+    
+    def subscribe(self, symbols: List[str], callback: Optional[Callable[[PriceChange], None]] = None,
+                  vs_currencies: Optional[List[str]] = None) -> 'Subscription':
+        """
+        Subscribe to price updates.
+        
+        All subscriptions in the same currencies share one upstream: the
+        stream_transport when it is connected, otherwise incremental polling.
+        A subscriber that falls behind receives only the latest update per coin.
+        
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            callback: Optional function called with each PriceChange; without
+                one, iterate the subscription (``for`` or ``async for``)
+            vs_currencies: Currencies to get prices in (defaults to ['usd'])
+            
+        Returns:
+            Subscription; close it (or use it as a context manager) to stop updates
+        """
+        # Imported here so importing this module does not load the streaming stack
+        from .streaming import PriceFeed
+        
+        key = tuple(sorted(currency.lower() for currency in vs_currencies or ['usd']))
+        with self._feeds_lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = PriceFeed(self, list(key), transport=self.stream_transport)
+        return feed.subscribe(symbols, callback)
+    
+    def close_subscriptions(self):
+        """Close every subscription and stop their upstream feeds."""
+        with self._feeds_lock:
+            feeds, self._feeds = list(self._feeds.values()), {}
+        for feed in feeds:
+            feed.close()
+
+    @_with_deadline
+    def portfolio(self, positions: Union[Dict[str, float], List[Tuple[str, float]]],
+                  vs_currencies: Optional[List[str]] = None) -> 'Portfolio':
+        """
+        Value holdings with one batched price request for all of their coins.
+
+        Args:
+            positions: Mapping of symbol to quantity, or (symbol, quantity) pairs
+            vs_currencies: Currencies to value the holdings in (defaults to ['usd'])
+
+        Returns:
+            Refreshed Portfolio; apply() later price changes to revalue it incrementally
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        # Imported here so NumPy is only needed when portfolios are used
+        from .portfolio import Portfolio
+
+        return Portfolio(self, positions, vs_currencies).refresh()
+
+    @_with_deadline
+    def get_history(self, symbol: str, start: 'Timestamp', end: Optional['Timestamp'] = None,
+                    interval: str = 'daily', vs_currency: str = 'usd') -> 'PriceHistory':
+        """
+        Get historical prices, market caps and volumes, fetching only what is not stored yet.
+        
+        Fetched ranges are kept in the history store, so later calls only
+        request the gaps. Buckets that are not over yet (the current day for
+        daily data) are fetched again on the next call.
+        
+        Args:
+            symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+            start: Start of the range (datetime or Unix timestamp in seconds)
+            end: End of the range (defaults to now)
+            interval: Row interval, one of '5m' (last 24 hours only), 'hourly' or 'daily'
+            vs_currency: Currency of the values
+            
+        Returns:
+            PriceHistory with one row per interval and the price, market_cap
+            and total_volume columns
+            
+        Raises:
+            ValueError: If the symbol cannot be found, the interval is unknown,
+                the range is older than the interval allows or the history
+                cannot be fetched
+        """
+        from .history import HistoryStore, INTERVALS, MAX_AGE, MAX_REQUEST_SPAN, PriceHistory, to_timestamp
+        
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown interval '{interval}', expected one of {', '.join(INTERVALS)}")
+        if self.history_store is None:
+            # Double-checked, so concurrent first calls share one store and its lock
+            with self._history_store_lock:
+                if self.history_store is None:
+                    self.history_store = HistoryStore()
+        
+        step = INTERVALS[interval]
+        now = int(time.time())
+        start = to_timestamp(start)
+        end = min(to_timestamp(end) if end is not None else now, now)
+        vs_currency = vs_currency.lower()
+        max_age = MAX_AGE[interval]
+        if max_age is not None and start < now - max_age:
+            raise ValueError(f"'{interval}' history is only available for the last {max_age // 3600} hours")
+        # Whole buckets only, so a stored row is never built from part of its bucket
+        fetch_start = start // step * step
+        if max_age is not None:
+            # The first bucket may begin before the oldest fine data
+            fetch_start = max(fetch_start, -(-(now - max_age) // step) * step)
+        
+        try:
+            coin_id = self._get_coin_id(symbol)
+            store = self.history_store
+            history = None
+            gaps = store.missing(coin_id, vs_currency, interval, fetch_start, -(-end // step) * step)
+            if gaps and max_age is not None:
+                # Fine data only comes back for windows ending now, so fetch
+                # every gap with one request up to the current bucket
+                gaps = [(gaps[0][0], -(-now // step) * step)]
+            for gap_start, gap_end in gaps:
+                span = MAX_REQUEST_SPAN[interval] or gap_end - gap_start
+                for window_start in range(gap_start, gap_end, span):
+                    window_end = min(window_start + span, gap_end)
+                    chart = self.api_client.get_market_chart_range(coin_id, vs_currency, window_start, window_end)
+                    history = store.add(coin_id, vs_currency, interval,
+                                        PriceHistory.from_chart(chart, interval),
+                                        (window_start, window_end), complete_until=now // step * step)
+            
+            if history is None:
+                history, _ = store.load(coin_id, vs_currency, interval)
+            return history.slice(start, end)
+        
+        except Exception as e:
+            logger.error(f"Error getting history for symbol '{symbol}': {e}")
+            raise ValueError(f"Failed to get history for cryptocurrency '{symbol}': {e}")
+    
+    @_with_deadline
+    def get_ohlc(self, symbol: str, days: Union[int, str] = 30, vs_currency: str = 'usd') -> 'PriceHistory':
+        """
+        Get open, high, low and close prices for the last days.
+        
+        Args:
+            symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
+            days: Number of days back from now (1, 7, 14, 30, 90, 180, 365 or 'max')
+            vs_currency: Currency of the prices
+            
+        Returns:
+            PriceHistory with the open, high, low and close columns
+            
+        Raises:
+            ValueError: If the symbol cannot be found or the candles cannot be fetched
+        """
+        from .history import PriceHistory
+        
+        try:
+            coin_id = self._get_coin_id(symbol)
+            return PriceHistory.from_ohlc(self.api_client.get_ohlc(coin_id, vs_currency.lower(), days))
+        except Exception as e:
+            logger.error(f"Error getting OHLC for symbol '{symbol}': {e}")
+            raise ValueError(f"Failed to get OHLC for cryptocurrency '{symbol}': {e}")
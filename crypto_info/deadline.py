@@ -0,0 +1,91 @@
+"""
+Per-call deadlines propagated through the call stack.
+
+``with deadline(2.0):`` bounds everything inside it, including symbol
+resolution, retries and rate limiter waits: API clients cap each request's
+timeouts at the time remaining and fail with ``DeadlineExceeded`` instead of
+starting work that cannot finish in time. The deadline lives in a context
+variable, so it follows the call into coroutines; work handed to a thread
+pool keeps it when the function is wrapped with ``propagate``.
+"""
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Absolute time.monotonic() value by which the current call must finish
+_deadline: 'contextvars.ContextVar[Optional[float]]' = contextvars.ContextVar('crypto_info_deadline', default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the call's deadline has passed before work could start or finish."""
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound the time of everything run inside the block.
+
+    A nested deadline never extends an outer one: the earlier of the two applies.
+
+    Args:
+        seconds: Time budget in seconds (None leaves the current deadline unchanged)
+
+    Yields:
+        Seconds remaining at the start of the block, or None without a deadline
+    """
+    if seconds is None:
+        yield remaining()
+        return
+
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield max(0.0, expires - time.monotonic())
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Seconds remaining (0 once expired), or None without a deadline
+    """
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return max(0.0, expires - time.monotonic())
+
+def check(operation: str = 'call'):
+    """
+    Fail if the current deadline has passed.
+
+    Args:
+        operation: Description of the work about to start, for the error message
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    if remaining() == 0.0:
+        raise DeadlineExceeded(f"Deadline exceeded before {operation}")
+
+def propagate(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a function so it runs with the caller's deadline in another thread.
+
+    Args:
+        fn: Function to submit to an executor
+
+    Returns:
+        Function running fn in a copy of the current context
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # A context can only be entered by one thread at a time, so each call gets its own copy
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,178 @@
+"""
+JSON decoding backends for API responses.
+
+Decoders take the raw response body as bytes, so no intermediate str is built
+for backends that parse bytes directly. The fastest installed backend is used
+by default: orjson, then ujson, then the standard library. Matching encoders
+(``get_encoder``) serialize cached values for the shared cache backends.
+"""
+import codecs
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+Decoder = Callable[[bytes], Any]
+Encoder = Callable[[Any], bytes]
+
+# Backends in order of preference
+PREFERRED_BACKENDS = ['orjson', 'ujson', 'json']
+
+def _load_backend(name: str) -> Optional[Decoder]:
+    """Import a backend and return its decode function, or None if it is not installed."""
+    if name == 'json':
+        # json.loads accepts bytes and detects their encoding
+        return json.loads
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    return module.loads
+
+def available_decoders() -> Dict[str, Decoder]:
+    """
+    Get the installed JSON backends.
+
+    Returns:
+        Dictionary of decode functions by backend name, in order of preference
+    """
+    decoders = {}
+    for name in PREFERRED_BACKENDS:
+        decoder = _load_backend(name)
+        if decoder is not None:
+            decoders[name] = decoder
+    return decoders
+
+def get_decoder(name: Optional[str] = None) -> Decoder:
+    """
+    Get a JSON decode function.
+
+    Args:
+        name: Backend name ('orjson', 'ujson' or 'json'), or None for the fastest installed one
+
+    Returns:
+        Function decoding a JSON document from bytes
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name is None:
+        for backend in PREFERRED_BACKENDS:
+            decoder = _load_backend(backend)
+            if decoder is not None:
+                return decoder
+
+    if name not in PREFERRED_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}', expected one of {PREFERRED_BACKENDS}")
+    decoder = _load_backend(name)
+    if decoder is None:
+        raise ValueError(f"JSON backend '{name}' is not installed")
+    return decoder
+
+def _load_encoder(name: str) -> Optional[Encoder]:
+    """Import a backend and return a function encoding to compact UTF-8 JSON, or None if it is not installed."""
+    if name == 'json':
+        return lambda value: json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    if name == 'orjson':
+        # orjson already returns bytes
+        return module.dumps
+    return lambda value: module.dumps(value, ensure_ascii=False).encode('utf-8')
+
+def get_encoder(name: Optional[str] = None) -> Encoder:
+    """
+    Get a JSON encode function.
+
+    Args:
+        name: Backend name ('orjson', 'ujson' or 'json'), or None for the fastest installed one
+
+    Returns:
+        Function encoding a value to JSON bytes
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name is None:
+        for backend in PREFERRED_BACKENDS:
+            encoder = _load_encoder(backend)
+            if encoder is not None:
+                return encoder
+
+    if name not in PREFERRED_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}', expected one of {PREFERRED_BACKENDS}")
+    encoder = _load_encoder(name)
+    if encoder is None:
+        raise ValueError(f"JSON backend '{name}' is not installed")
+    return encoder
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Incrementally parse a top-level JSON array from byte chunks.
+
+    Elements are yielded as soon as they are complete, so a large list
+    response is never held in memory as a whole.
+
+    Args:
+        chunks: Byte chunks of the document, e.g. from response.iter_content()
+
+    Yields:
+        Decoded array elements
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array
+    """
+    raw_decode = json.JSONDecoder().raw_decode
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    started = False
+    finished = False
+    chunks = iter(chunks)
+
+    while True:
+        chunk = next(chunks, None)
+        final = chunk is None
+        buffer = buffer[pos:] + utf8.decode(chunk or b'', final=final)
+        pos = 0
+
+        while True:
+            # Skip whitespace and the separators between elements
+            while pos < len(buffer) and (buffer[pos] in ' \t\r\n' or (started and buffer[pos] == ',')):
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Invalid response format: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+
+            if finished:
+                raise ValueError("Invalid response format: data after the end of the JSON array")
+            if buffer[pos] == ']':
+                finished = True
+                pos += 1
+                continue
+
+            try:
+                element, end = raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if final:
+                    raise ValueError(f"Invalid response format: {e}")
+                break
+            # A number or literal ending at the buffer end may continue in the next chunk
+            if end >= len(buffer) and not final:
+                break
+            yield element
+            pos = end
+
+        if final:
+            if not finished:
+                raise ValueError("Invalid response format: truncated JSON array")
+            return
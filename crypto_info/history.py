@@ -0,0 +1,383 @@
+"""
+Local columnar storage of historical market data.
+
+Market chart history is kept in one binary file per coin, currency and
+interval, with each column (timestamps, prices, market caps, volumes) stored
+as a contiguous block of 8-byte values next to the list of time ranges
+already fetched. Later requests only fetch the gaps between stored ranges,
+and results are returned as ``array`` columns rather than lists of
+``[timestamp, value]`` pairs. NumPy is optional and only used by
+``PriceHistory.to_numpy``.
+
+The directory defaults to ``crypto_info/data/history`` and can be set with the
+``CRYPTO_INFO_HISTORY_DIR`` environment variable.
+"""
+import bisect
+import logging
+import os
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DIR = os.environ.get(
+    'CRYPTO_INFO_HISTORY_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history')
+)
+
+# Bucket size in seconds per interval
+INTERVALS = {
+    '5m': 300,
+    'hourly': 3600,
+    'daily': 86400,
+}
+
+# Longest range a single /market_chart/range request may cover and still
+# return data at least as fine as the interval (None for no limit)
+MAX_REQUEST_SPAN = {
+    '5m': 86400,
+    'hourly': 90 * 86400,
+    'daily': None,
+}
+
+# How far back from now /market_chart/range returns data as fine as the
+# interval (None for no limit); older windows come back hourly
+MAX_AGE = {
+    '5m': 86400,
+    'hourly': None,
+    'daily': None,
+}
+
+# Columns of a market chart history, and the response keys they come from
+CHART_COLUMNS = {
+    'price': 'prices',
+    'market_cap': 'market_caps',
+    'total_volume': 'total_volumes',
+}
+
+OHLC_COLUMNS = ['open', 'high', 'low', 'close']
+
+_MAGIC = b'CIH1'
+# Magic, number of rows, number of stored ranges
+_HEADER = struct.Struct('<4sII')
+_NAN = float('nan')
+
+Timestamp = Union[int, float, datetime]
+Range = Tuple[int, int]
+
+def to_timestamp(value: Timestamp) -> int:
+    """Convert a datetime or Unix timestamp in seconds to integer seconds."""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+class PriceHistory:
+    """
+    Time series of market data as parallel columns.
+    """
+    def __init__(self, timestamps: Optional[array] = None,
+                 columns: Optional[Dict[str, array]] = None):
+        """
+        Initialize the history.
+
+        Args:
+            timestamps: Sorted Unix timestamps in seconds, array('q')
+            columns: Values per column name, array('d') of the same length with
+                NaN for missing values
+        """
+        self.timestamps = timestamps if timestamps is not None else array('q')
+        self.columns = columns if columns is not None else {name: array('d') for name in CHART_COLUMNS}
+
+    @classmethod
+    def from_chart(cls, chart: Dict[str, List[List[float]]], interval: str) -> 'PriceHistory':
+        """
+        Build a history from a /market_chart response, one row per interval bucket.
+
+        Timestamps are aligned down to the start of their bucket and the first
+        value of each bucket is kept. Coarser responses are sampled at the start
+        of each bucket (daily data at 00:00 UTC), so rows from responses of any
+        granularity down to the interval line up.
+
+        Args:
+            chart: Response with 'prices', 'market_caps' and 'total_volumes' lists
+            interval: One of INTERVALS
+
+        Returns:
+            PriceHistory with the price, market_cap and total_volume columns
+        """
+        step = INTERVALS[interval]
+        rows: Dict[int, List[float]] = {}
+        for i, key in enumerate(CHART_COLUMNS.values()):
+            # Points come in time order; going backwards leaves the first one of each bucket
+            for timestamp_ms, value in reversed(chart.get(key) or []):
+                bucket = int(timestamp_ms // 1000) // step * step
+                row = rows.get(bucket)
+                if row is None:
+                    row = rows[bucket] = [_NAN] * len(CHART_COLUMNS)
+                row[i] = _NAN if value is None else float(value)
+        return cls._from_rows(rows, list(CHART_COLUMNS))
+
+    @classmethod
+    def from_ohlc(cls, candles: List[List[float]]) -> 'PriceHistory':
+        """
+        Build a history from an /ohlc response.
+
+        Args:
+            candles: List of [timestamp_ms, open, high, low, close]
+
+        Returns:
+            PriceHistory with the open, high, low and close columns
+        """
+        rows = {int(candle[0] // 1000): [float(value) for value in candle[1:5]] for candle in candles}
+        return cls._from_rows(rows, OHLC_COLUMNS)
+
+    @classmethod
+    def _from_rows(cls, rows: Dict[int, List[float]], names: List[str]) -> 'PriceHistory':
+        """Build a history from rows keyed by timestamp."""
+        timestamps = array('q', sorted(rows))
+        columns = {name: array('d', (rows[t][i] for t in timestamps)) for i, name in enumerate(names)}
+        return cls(timestamps, columns)
+
+    def merge(self, other: 'PriceHistory') -> 'PriceHistory':
+        """
+        Combine two histories with the same columns; rows of other win on equal timestamps.
+
+        Args:
+            other: History to merge in
+
+        Returns:
+            New PriceHistory
+        """
+        names = list(self.columns)
+        rows = {t: [self.columns[name][i] for name in names] for i, t in enumerate(self.timestamps)}
+        for i, t in enumerate(other.timestamps):
+            rows[t] = [other.columns[name][i] for name in names]
+        return self._from_rows(rows, names)
+
+    def slice(self, start: Timestamp, end: Timestamp) -> 'PriceHistory':
+        """
+        Get the rows between two times.
+
+        Args:
+            start: First time included
+            end: Last time included
+
+        Returns:
+            New PriceHistory
+        """
+        lo = bisect.bisect_left(self.timestamps, to_timestamp(start))
+        hi = bisect.bisect_right(self.timestamps, to_timestamp(end))
+        return PriceHistory(self.timestamps[lo:hi], {name: column[lo:hi] for name, column in self.columns.items()})
+
+    def to_numpy(self, column: str) -> 'np.ndarray':
+        """
+        Get a column (or 'timestamp') as a NumPy array.
+
+        Args:
+            column: Column name, or 'timestamp' for the timestamps
+
+        Returns:
+            Copy of the column as a NumPy array
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("PriceHistory.to_numpy requires numpy: pip install crypto_info[numpy]")
+        if column == 'timestamp':
+            return np.array(self.timestamps, dtype=np.int64)
+        return np.array(self.columns[column], dtype=np.float64)
+
+    def __getitem__(self, column: str) -> array:
+        return self.columns[column]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Merge overlapping or touching ranges into a sorted list of disjoint ranges."""
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def missing_ranges(covered: List[Range], start: int, end: int) -> List[Range]:
+    """
+    Get the parts of a range not covered by stored ranges.
+
+    Args:
+        covered: Sorted disjoint ranges already stored
+        start: Start of the requested range
+        end: End of the requested range
+
+    Returns:
+        Sorted list of gaps
+    """
+    gaps: List[Range] = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+def _little_endian(values: array) -> bytes:
+    """Serialize an array as little-endian bytes."""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _read_array(typecode: str, data: memoryview, offset: int, count: int) -> Tuple[array, int]:
+    """Read count little-endian values from data at offset."""
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    if end > len(data):
+        raise ValueError("truncated file")
+    values.frombytes(data[offset:end])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values, end
+
+class HistoryStore:
+    """
+    Directory of per-coin market chart history files.
+    """
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR):
+        """
+        Initialize the store. Nothing is read or created until first use.
+
+        Args:
+            directory: Directory holding one subdirectory per coin
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def path(self, coin_id: str, vs_currency: str, interval: str) -> str:
+        """Get the file path of a series."""
+        return os.path.join(self.directory, coin_id, f"{vs_currency.lower()}-{interval}.bin")
+
+    def load(self, coin_id: str, vs_currency: str, interval: str) -> Tuple[PriceHistory, List[Range]]:
+        """
+        Read a series.
+
+        A missing or unreadable file results in an empty history.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the values
+            interval: One of INTERVALS
+
+        Returns:
+            Tuple of (stored history, sorted list of fetched (start, end) ranges)
+        """
+        path = self.path(coin_id, vs_currency, interval)
+        if not os.path.exists(path):
+            return PriceHistory(), []
+
+        try:
+            with open(path, 'rb') as f:
+                data = memoryview(f.read())
+            magic, rows, range_count = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                raise ValueError("not a history file")
+            offset = _HEADER.size
+            bounds, offset = _read_array('q', data, offset, 2 * range_count)
+            timestamps, offset = _read_array('q', data, offset, rows)
+            columns = {}
+            for name in CHART_COLUMNS:
+                columns[name], offset = _read_array('d', data, offset, rows)
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Failed to load history from {path}: {e}")
+            return PriceHistory(), []
+
+        ranges = [(bounds[i], bounds[i + 1]) for i in range(0, len(bounds), 2)]
+        return PriceHistory(timestamps, columns), ranges
+
+    def save(self, coin_id: str, vs_currency: str, interval: str,
+             history: PriceHistory, ranges: List[Range]):
+        """
+        Write a series, replacing the file atomically.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the values
+            interval: One of INTERVALS
+            history: History with the CHART_COLUMNS columns
+            ranges: Fetched (start, end) ranges
+        """
+        path = self.path(coin_id, vs_currency, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        bounds = array('q', [bound for fetched in ranges for bound in fetched])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, len(history), len(ranges)))
+            f.write(_little_endian(bounds))
+            f.write(_little_endian(history.timestamps))
+            for name in CHART_COLUMNS:
+                f.write(_little_endian(history.columns[name]))
+        os.replace(tmp_path, path)
+
+    def missing(self, coin_id: str, vs_currency: str, interval: str,
+                start: int, end: int) -> List[Range]:
+        """
+        Get the parts of a range that have not been fetched yet.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the values
+            interval: One of INTERVALS
+            start: Start of the range as a Unix timestamp in seconds
+            end: End of the range as a Unix timestamp in seconds
+
+        Returns:
+            Sorted list of (start, end) gaps
+        """
+        _, ranges = self.load(coin_id, vs_currency, interval)
+        return missing_ranges(ranges, start, end)
+
+    def add(self, coin_id: str, vs_currency: str, interval: str,
+            history: PriceHistory, fetched: Range, complete_until: Optional[int] = None) -> PriceHistory:
+        """
+        Merge fetched rows into a series.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+            vs_currency: Currency of the values
+            interval: One of INTERVALS
+            history: Fetched rows
+            fetched: (start, end) range the rows were fetched for
+            complete_until: Time up to which buckets are final; the rest of the
+                fetched range is stored but not marked as fetched, so it is
+                fetched again next time
+
+        Returns:
+            Whole stored history after the merge
+        """
+        start, end = fetched
+        if complete_until is not None:
+            end = min(end, complete_until)
+
+        with self._lock:
+            stored, ranges = self.load(coin_id, vs_currency, interval)
+            merged = stored.merge(history)
+            if end > start:
+                ranges = merge_ranges(ranges + [(start, end)])
+            self.save(coin_id, vs_currency, interval, merged, ranges)
+        return merged
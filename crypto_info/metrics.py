@@ -0,0 +1,245 @@
+"""
+Instrumentation sinks for API clients, caches and CryptoInfo.
+
+Instrumentation is disabled by default: components take an optional
+``metrics`` sink and skip all timing and bookkeeping when it is None. Pass a
+sink to collect:
+
+- ``crypto_info_request_seconds`` (histogram): HTTP latency by endpoint and status
+- ``crypto_info_response_bytes_total`` (counter): response body bytes by endpoint
+- ``crypto_info_decode_seconds`` (histogram): JSON decode time by endpoint
+- ``crypto_info_retries_total`` (counter): retries by endpoint and reason
+- ``crypto_info_cache_lookups_total`` (counter): response cache lookups by result
+- ``crypto_info_symbol_resolution_seconds`` (histogram): symbol to ID
+  resolution time by source (cache, index or search)
+"""
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds of the histogram buckets, from 100 us to 10 s
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+Labels = Dict[str, str]
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _series_key(name: str, labels: Optional[Labels]) -> SeriesKey:
+    """Build a hashable key for a metric name and its labels."""
+    return name, tuple(sorted(labels.items())) if labels else ()
+
+class MetricsSink:
+    """
+    Base class of instrumentation sinks.
+
+    Subclasses implement ``increment`` for counters and ``observe`` for
+    histogram samples. Both are called on the request path and must be cheap.
+    """
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Labels] = None):
+        """
+        Add to a counter.
+
+        Args:
+            name: Metric name
+            value: Amount to add
+            labels: Label values of the series
+        """
+        raise NotImplementedError
+
+    def observe(self, name: str, value: float, labels: Optional[Labels] = None):
+        """
+        Record a histogram sample.
+
+        Args:
+            name: Metric name
+            value: Observed value (seconds for timings)
+            labels: Label values of the series
+        """
+        raise NotImplementedError
+
+class _Histogram:
+    """Cumulative-bucket histogram of one series."""
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+class InMemorySink(MetricsSink):
+    """
+    Thread-safe sink keeping counters and bucketed histograms in memory.
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize the sink.
+
+        Args:
+            buckets: Sorted upper bounds of the histogram buckets
+        """
+        self.buckets = tuple(buckets)
+        self._counters: Dict[SeriesKey, float] = {}
+        self._histograms: Dict[SeriesKey, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Labels] = None):
+        key = _series_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Labels] = None):
+        key = _series_key(name, labels)
+        # Values above the last bound go to the implicit +Inf bucket
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def counter(self, name: str, **labels: str) -> float:
+        """
+        Get the value of a counter series.
+
+        Args:
+            name: Metric name
+            **labels: Label values of the series
+
+        Returns:
+            Counter value, 0 if the series was never incremented
+        """
+        with self._lock:
+            return self._counters.get(_series_key(name, labels), 0.0)
+
+    def histogram(self, name: str, **labels: str) -> Dict[str, float]:
+        """
+        Summarize a histogram series.
+
+        Quantiles are estimated by linear interpolation within buckets, like
+        Prometheus' histogram_quantile.
+
+        Args:
+            name: Metric name
+            **labels: Label values of the series
+
+        Returns:
+            Dictionary with count, sum, p50, p95 and p99 (NaN quantiles when empty)
+        """
+        with self._lock:
+            histogram = self._histograms.get(_series_key(name, labels))
+            if histogram is None:
+                counts, total, count = [], 0.0, 0
+            else:
+                counts, total, count = list(histogram.counts), histogram.sum, histogram.count
+        return {
+            'count': count,
+            'sum': total,
+            'p50': self._quantile(counts, count, 0.50),
+            'p95': self._quantile(counts, count, 0.95),
+            'p99': self._quantile(counts, count, 0.99),
+        }
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> float:
+        """Estimate a quantile from bucket counts."""
+        if not count:
+            return math.nan
+        rank = q * count
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Dict[SeriesKey, object]]:
+        """
+        Copy all series.
+
+        Returns:
+            Dictionary with 'counters' (value by series) and 'histograms'
+            (count, sum and per-bucket counts by series)
+        """
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {
+                    key: {'count': h.count, 'sum': h.sum, 'buckets': list(h.counts)}
+                    for key, h in self._histograms.items()
+                },
+            }
+
+    def reset(self):
+        """Remove all series."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = '') -> str:
+    """Format labels in the Prometheus text format."""
+    parts = ['%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{%s}' % ','.join(parts) if parts else ''
+
+class PrometheusSink(InMemorySink):
+    """
+    In-memory sink that renders its series in the Prometheus text exposition format.
+    """
+    def render(self) -> str:
+        """
+        Render all series.
+
+        Returns:
+            Metrics in the Prometheus text format (version 0.0.4)
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        seen = set()
+        for (name, labels), value in sorted(snapshot['counters'].items()):
+            if name not in seen:
+                lines.append('# TYPE %s counter' % name)
+                seen.add(name)
+            lines.append('%s%s %r' % (name, _format_labels(labels), value))
+
+        for (name, labels), histogram in sorted(snapshot['histograms'].items()):
+            if name not in seen:
+                lines.append('# TYPE %s histogram' % name)
+                seen.add(name)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), histogram['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(bound)
+                lines.append('%s_bucket%s %d' % (name, _format_labels(labels, 'le="%s"' % le), cumulative))
+            lines.append('%s_sum%s %r' % (name, _format_labels(labels), histogram['sum']))
+            lines.append('%s_count%s %d' % (name, _format_labels(labels), histogram['count']))
+
+        return '\n'.join(lines) + '\n'
+
+class CallbackSink(MetricsSink):
+    """
+    Sink forwarding every measurement to a function, e.g. a StatsD or OpenTelemetry bridge.
+    """
+    def __init__(self, callback: Callable[[str, str, float, Labels], None]):
+        """
+        Initialize the sink.
+
+        Args:
+            callback: Called with (kind, name, value, labels) where kind is
+                'counter' or 'histogram'
+        """
+        self.callback = callback
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Labels] = None):
+        self.callback('counter', name, value, labels or {})
+
+    def observe(self, name: str, value: float, labels: Optional[Labels] = None):
+        self.callback('histogram', name, value, labels or {})
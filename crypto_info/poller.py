@@ -0,0 +1,234 @@
+"""
+Incremental price polling for a watchlist of coins.
+
+``PricePoller`` requests /simple/price with ``include_last_updated_at`` and
+only reports coins whose ``last_updated_at`` changed since the previous poll.
+It learns how often each coin is updated upstream and leaves coins out of a
+poll until they are due for an update, so a watchlist of mostly slow-moving
+coins costs far fewer (and smaller) requests than polling everything. The
+interval between polls follows the soonest expected update and is stretched
+when the rate limiter is short of tokens.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, List, Callable, Iterator, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 5.0
+DEFAULT_MAX_INTERVAL = 60.0
+
+# Weight of the newest observation in the per-coin update period estimate
+PERIOD_SMOOTHING = 0.3
+
+class PriceChange(NamedTuple):
+    """A coin whose quote changed since the previous poll."""
+    coin_id: str
+    symbols: List[str]
+    price: Dict[str, Any]
+    last_updated_at: int
+    previous_updated_at: Optional[int]
+
+class _CoinState:
+    """Update tracking for one coin."""
+    __slots__ = ('last_updated_at', 'period', 'next_due', 'price')
+
+    def __init__(self):
+        self.last_updated_at: Optional[int] = None
+        self.period: Optional[float] = None
+        self.next_due = 0.0
+        self.price: Optional[Dict[str, Any]] = None
+
+class PricePoller:
+    """
+    Poll prices for a watchlist and emit only the quotes that changed.
+    """
+    def __init__(self, crypto_info, symbols: List[str], vs_currencies: Optional[List[str]] = None,
+                 callback: Optional[Callable[[PriceChange], None]] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the poller. Symbols are resolved on the first poll.
+
+        Args:
+            crypto_info: CryptoInfo used to resolve symbols and fetch prices
+            symbols: Watchlist of cryptocurrency symbols
+            vs_currencies: Currencies to get prices in (defaults to ['usd'])
+            callback: Optional function called with each PriceChange
+            min_interval: Shortest time in seconds between polls
+            max_interval: Longest time in seconds between polls
+            clock: Wall clock in Unix seconds (compared with last_updated_at)
+        """
+        self.crypto_info = crypto_info
+        self.symbols = list(dict.fromkeys(symbols))
+        self.vs_currencies = vs_currencies or ['usd']
+        self.callback = callback
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._clock = clock
+        self._symbols_by_id: Optional[Dict[str, List[str]]] = None
+        self._states: Dict[str, _CoinState] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.errors: Dict[str, str] = {}
+        self.stats = {'polls': 0, 'requests': 0, 'coins_requested': 0, 'changes': 0}
+
+    def _resolve(self):
+        """Resolve the watchlist to CoinGecko IDs, recording symbols that fail."""
+        symbols_by_id: Dict[str, List[str]] = {}
+        for symbol in self.symbols:
+            try:
+                coin_id = self.crypto_info._get_coin_id(symbol)
+            except ValueError as e:
+                self.errors[symbol] = str(e)
+                continue
+            symbols_by_id.setdefault(coin_id, []).append(symbol)
+        self._symbols_by_id = symbols_by_id
+        self._states = {coin_id: _CoinState() for coin_id in symbols_by_id}
+
+    def poll_once(self) -> List[PriceChange]:
+        """
+        Fetch the coins that are due and report those whose quote changed.
+
+        Returns:
+            Changes in watchlist order; the callback, if any, is called for each
+        """
+        if self._symbols_by_id is None:
+            self._resolve()
+
+        now = self._clock()
+        due = [coin_id for coin_id, state in self._states.items() if state.next_due <= now]
+        self.stats['polls'] += 1
+        if not due:
+            return []
+
+        changes: List[PriceChange] = []
+        for chunk in self.crypto_info._chunk_coin_ids(due):
+            self.stats['requests'] += 1
+            self.stats['coins_requested'] += len(chunk)
+            try:
+                price_data = self.crypto_info.api_client.get_coin_price(
+                    chunk,
+                    self.vs_currencies,
+                    include_market_cap=True,
+                    include_24hr_change=True,
+                    include_last_updated_at=True
+                )
+            except Exception as e:
+                logger.warning("Polling prices for %d coins failed: %s", len(chunk), e)
+                continue
+
+            for coin_id in chunk:
+                change = self._update(coin_id, price_data.get(coin_id), now)
+                if change is not None:
+                    changes.append(change)
+
+        self.stats['changes'] += len(changes)
+        if self.callback is not None:
+            for change in changes:
+                self.callback(change)
+        return changes
+
+    def _update(self, coin_id: str, price: Optional[Dict[str, Any]], now: float) -> Optional[PriceChange]:
+        """Record a fetched quote and schedule the coin's next poll."""
+        state = self._states[coin_id]
+        updated_at = price.get('last_updated_at') if price else None
+
+        if updated_at is None or updated_at == state.last_updated_at:
+            # Not updated yet: look again on the next poll
+            state.next_due = now + self.min_interval
+            return None
+
+        previous = state.last_updated_at
+        if previous is not None and updated_at > previous:
+            observed = updated_at - previous
+            state.period = observed if state.period is None else (
+                PERIOD_SMOOTHING * observed + (1 - PERIOD_SMOOTHING) * state.period
+            )
+        state.last_updated_at = updated_at
+        state.price = price
+        # Skip the coin until its next update is expected, checking it at least every max_interval
+        if state.period:
+            state.next_due = min(updated_at + state.period, now + self.max_interval)
+        else:
+            state.next_due = now + self.min_interval
+
+        return PriceChange(coin_id, self._symbols_by_id[coin_id], price, updated_at, previous)
+
+    def next_interval(self) -> float:
+        """
+        Get the delay before the next poll.
+
+        The delay runs until the first coin is due, within [min_interval,
+        max_interval], and is extended when the rate limiter does not have
+        enough tokens for the requests the next poll will make.
+
+        Returns:
+            Delay in seconds
+        """
+        now = self._clock()
+        next_due = min((state.next_due for state in self._states.values()), default=now + self.max_interval)
+        delay = min(max(next_due - now, self.min_interval), self.max_interval)
+
+        limiter = getattr(self.crypto_info.api_client, 'rate_limiter', None)
+        if limiter is not None:
+            due = [coin_id for coin_id, state in self._states.items() if state.next_due <= now + delay]
+            needed = len(self.crypto_info._chunk_coin_ids(due)) if due else 0
+            shortfall = needed - limiter.available
+            if shortfall > 0:
+                delay = max(delay, shortfall / limiter.rate)
+        return delay
+
+    @property
+    def quotes(self) -> Dict[str, Dict[str, Any]]:
+        """Latest known quote per watchlist symbol."""
+        quotes = {}
+        for coin_id, state in self._states.items():
+            if state.price is not None:
+                for symbol in self._symbols_by_id[coin_id]:
+                    quotes[symbol] = state.price
+        return quotes
+
+    def iter_changes(self, max_polls: Optional[int] = None) -> Iterator[PriceChange]:
+        """
+        Poll repeatedly and yield changes as they are found.
+
+        Args:
+            max_polls: Stop after this many polls (None polls until stop() is called)
+
+        Yields:
+            PriceChange for every changed quote
+        """
+        polls = 0
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            yield from self.poll_once()
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                self._stop.wait(self.next_interval())
+
+    def start(self) -> 'PricePoller':
+        """Poll in a background thread, delivering changes to the callback."""
+        if self.callback is None:
+            raise ValueError("A callback is required to poll in the background")
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error("Price poll failed: %s", e)
+                self._stop.wait(self.next_interval())
+
+        self._thread = threading.Thread(target=run, name='price-poller', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and wait for the background thread, if any."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
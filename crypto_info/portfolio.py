@@ -0,0 +1,310 @@
+"""
+Vectorized valuation of portfolios of many positions in several currencies.
+
+Prices are fetched for all held coins with batched /simple/price requests
+(through the response cache when enabled) into a coins x currencies matrix;
+values, weights and 24h P&L are NumPy array operations over it. When only a
+few prices change (e.g. from ``CryptoInfo.subscribe``), ``apply`` updates the
+affected rows and adjusts the totals by the difference, so revaluing costs
+time proportional to the changed positions, not the portfolio size.
+
+Requires NumPy (``pip install crypto_info[numpy]``).
+"""
+import logging
+from typing import Dict, Any, Optional, List, Iterable, Mapping, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# (symbol, quantity) pairs or a mapping of symbol to quantity
+Positions = Union[Mapping[str, float], Iterable[Tuple[str, float]]]
+
+class Portfolio:
+    """
+    Holdings of cryptocurrencies valued in one or more quote currencies.
+
+    Positions are keyed by symbol; a symbol listed twice has its quantities
+    summed. Positions whose symbol cannot be resolved are reported in
+    ``errors`` and left out; positions without a price are valued at 0 and
+    listed by ``unpriced``.
+    """
+    def __init__(self, crypto_info, positions: Positions, currencies: Optional[List[str]] = None):
+        """
+        Initialize the portfolio and resolve its symbols. Prices are fetched by refresh().
+
+        Args:
+            crypto_info: CryptoInfo used to resolve symbols and fetch prices
+            positions: Mapping of symbol to quantity, or (symbol, quantity) pairs
+            currencies: Quote currencies (defaults to ['usd'])
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("Portfolio requires numpy: pip install crypto_info[numpy]")
+
+        self.crypto_info = crypto_info
+        self.currencies = [currency.lower() for currency in currencies or ['usd']]
+        self._currency_index = {currency: col for col, currency in enumerate(self.currencies)}
+
+        items = positions.items() if isinstance(positions, Mapping) else positions
+        quantities: Dict[str, float] = {}
+        for symbol, quantity in items:
+            quantities[symbol] = quantities.get(symbol, 0.0) + float(quantity)
+
+        self.errors: Dict[str, str] = {}
+        self.symbols: List[str] = []
+        self.coin_ids: List[str] = []
+        coin_rows: Dict[str, int] = {}
+        position_coins: List[int] = []
+        for symbol in quantities:
+            try:
+                coin_id = crypto_info._get_coin_id(symbol)
+            except ValueError as e:
+                self.errors[symbol] = str(e)
+                continue
+            if coin_id not in coin_rows:
+                coin_rows[coin_id] = len(self.coin_ids)
+                self.coin_ids.append(coin_id)
+            self.symbols.append(symbol)
+            position_coins.append(coin_rows[coin_id])
+
+        self._coin_rows = coin_rows
+        self._position_rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self.quantities = np.array([quantities[symbol] for symbol in self.symbols], dtype=np.float64)
+        # Row of each position in the coin matrices
+        self._coin_of = np.array(position_coins, dtype=np.intp)
+        # Positions holding each coin, for incremental updates
+        order = np.argsort(self._coin_of, kind='stable')
+        bounds = np.searchsorted(self._coin_of[order], np.arange(len(self.coin_ids) + 1))
+        self._positions_of = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.coin_ids))]
+
+        shape = (len(self.coin_ids), len(self.currencies))
+        self.prices = np.full(shape, np.nan)
+        self.changes_24h = np.full(shape, np.nan)
+        self._values = np.zeros((len(self.symbols), len(self.currencies)))
+        self._pnl = np.zeros((len(self.symbols), len(self.currencies)))
+        self._totals = np.zeros(len(self.currencies))
+        self._pnl_totals = np.zeros(len(self.currencies))
+
+    def _set_price_row(self, row: int, price: Dict[str, Any], partial: bool = False):
+        """
+        Store a /simple/price entry in the price matrices.
+
+        Args:
+            row: Row of the coin in the matrices
+            price: Price entry of the coin
+            partial: Keep the stored price and 24h change of fields missing
+                from the entry, for updates quoted in fewer currencies or
+                fields than the portfolio
+        """
+        for col, currency in enumerate(self.currencies):
+            change_field = f"{currency}_24h_change"
+            if not partial or currency in price:
+                value = price.get(currency)
+                self.prices[row, col] = np.nan if value is None else value
+            if not partial or change_field in price:
+                change = price.get(change_field)
+                self.changes_24h[row, col] = np.nan if change is None else change
+
+    def _position_values(self, positions: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """Compute the values and 24h P&L of positions, with 0 for missing prices or changes."""
+        rows = self._coin_of[positions]
+        values = self.quantities[positions, None] * self.prices[rows]
+        # The value 24h ago was value / (1 + change), so the P&L is value * change / (1 + change)
+        changes = self.changes_24h[rows] / 100.0
+        pnl = values * changes / (1.0 + changes)
+        return np.nan_to_num(values), np.nan_to_num(pnl)
+
+    def refresh(self) -> 'Portfolio':
+        """
+        Fetch the prices of all held coins and revalue every position.
+
+        Returns:
+            The portfolio, for chaining
+        """
+        prices = self.crypto_info._get_prices_by_id(self.coin_ids, self.currencies)
+        for coin_id, row in self._coin_rows.items():
+            price = prices.get(coin_id)
+            if isinstance(price, Exception):
+                logger.warning("No price for '%s': %s", coin_id, price)
+                price = None
+            self._set_price_row(row, price or {})
+
+        everything = np.arange(len(self.symbols))
+        self._values, self._pnl = self._position_values(everything)
+        self._totals = self._values.sum(axis=0)
+        self._pnl_totals = self._pnl.sum(axis=0)
+        return self
+
+    def apply(self, changes: Union[Mapping[str, Dict[str, Any]], Iterable[Any]]) -> int:
+        """
+        Revalue only the positions whose coin prices changed.
+
+        Currencies missing from an update keep their previous price, so
+        changes from a USD-only subscription can be applied to a portfolio
+        valued in several currencies.
+
+        Args:
+            changes: Mapping of CoinGecko ID to /simple/price entry, or
+                PriceChange objects from a subscription or poller
+
+        Returns:
+            Number of positions revalued
+        """
+        if isinstance(changes, Mapping):
+            changes = changes.items()
+        else:
+            changes = ((change.coin_id, change.price) for change in changes)
+
+        rows = []
+        for coin_id, price in changes:
+            row = self._coin_rows.get(coin_id)
+            if row is not None:
+                self._set_price_row(row, price, partial=True)
+                rows.append(row)
+        if not rows:
+            return 0
+
+        positions = np.concatenate([self._positions_of[row] for row in set(rows)])
+        values, pnl = self._position_values(positions)
+        self._totals += (values - self._values[positions]).sum(axis=0)
+        self._pnl_totals += (pnl - self._pnl[positions]).sum(axis=0)
+        self._values[positions] = values
+        self._pnl[positions] = pnl
+        return len(positions)
+
+    def set_quantity(self, symbol: str, quantity: float):
+        """
+        Change the quantity of a held symbol, adjusting the totals.
+
+        Args:
+            symbol: Symbol of an existing position
+            quantity: New quantity
+
+        Raises:
+            KeyError: If the symbol is not a position of the portfolio
+        """
+        position = self._position_rows[symbol]
+        self.quantities[position] = quantity
+        positions = np.array([position])
+        values, pnl = self._position_values(positions)
+        self._totals += values[0] - self._values[position]
+        self._pnl_totals += pnl[0] - self._pnl[position]
+        self._values[position] = values[0]
+        self._pnl[position] = pnl[0]
+
+    def _col(self, currency: str) -> int:
+        """Get the column of a quote currency."""
+        try:
+            return self._currency_index[currency.lower()]
+        except KeyError:
+            raise ValueError(f"Currency '{currency}' is not one of the portfolio currencies {self.currencies}")
+
+    def values(self, currency: str = 'usd') -> 'np.ndarray':
+        """Value of each position (in ``symbols`` order) in a currency."""
+        return self._values[:, self._col(currency)].copy()
+
+    def total(self, currency: str = 'usd') -> float:
+        """Total value in a currency."""
+        return float(self._totals[self._col(currency)])
+
+    def totals(self) -> Dict[str, float]:
+        """Total value in every portfolio currency."""
+        return {currency: float(total) for currency, total in zip(self.currencies, self._totals)}
+
+    def weights(self, currency: str = 'usd') -> 'np.ndarray':
+        """Share of each position in the total value (0 when the portfolio is worth nothing)."""
+        col = self._col(currency)
+        total = self._totals[col]
+        if total == 0:
+            return np.zeros(len(self.symbols))
+        return self._values[:, col] / total
+
+    def pnl_24h(self, currency: str = 'usd') -> 'np.ndarray':
+        """Profit or loss of each position over the last 24 hours in a currency."""
+        return self._pnl[:, self._col(currency)].copy()
+
+    def total_pnl_24h(self, currency: str = 'usd') -> float:
+        """Profit or loss of the portfolio over the last 24 hours in a currency."""
+        return float(self._pnl_totals[self._col(currency)])
+
+    def conversion_rates(self, base: str = 'usd') -> Dict[str, float]:
+        """
+        Exchange rates from a base currency to the other portfolio currencies.
+
+        Each held coin quoted in both currencies gives a rate (its price in the
+        other currency over its price in the base); the median is used so one
+        stale quote does not skew the rate.
+
+        Args:
+            base: Currency to convert from
+
+        Returns:
+            Units of each portfolio currency per unit of base (NaN when no coin is quoted in both)
+        """
+        base_prices = self.prices[:, self._col(base)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = self.prices / base_prices[:, None]
+        ratios[~np.isfinite(ratios)] = np.nan
+        rates = {}
+        for col, currency in enumerate(self.currencies):
+            column = ratios[:, col]
+            column = column[~np.isnan(column)]
+            rates[currency] = float(np.median(column)) if len(column) else float('nan')
+        return rates
+
+    def convert(self, amounts: Union[float, 'np.ndarray'], from_currency: str,
+                to_currency: str) -> Union[float, 'np.ndarray']:
+        """
+        Convert amounts between portfolio currencies at the rates implied by coin prices.
+
+        Args:
+            amounts: Amount or array of amounts in from_currency
+            from_currency: Currency of the amounts
+            to_currency: Currency to convert to
+
+        Returns:
+            Converted amount or array
+        """
+        self._col(to_currency)
+        return amounts * self.conversion_rates(from_currency)[to_currency.lower()]
+
+    @property
+    def unpriced(self) -> List[str]:
+        """Symbols without a price in at least one portfolio currency."""
+        missing = np.isnan(self.prices).any(axis=1)[self._coin_of]
+        return [self.symbols[i] for i in np.flatnonzero(missing)]
+
+    def to_records(self, currency: str = 'usd') -> List[Dict[str, Any]]:
+        """
+        Get one dictionary per position, for reports and serialization.
+
+        Args:
+            currency: Currency of prices, values and P&L
+
+        Returns:
+            List of {'symbol', 'coin_id', 'quantity', 'price', 'value', 'weight', 'pnl_24h'}
+        """
+        col = self._col(currency)
+        prices = self.prices[self._coin_of, col]
+        weights = self.weights(currency)
+        return [
+            {
+                'symbol': symbol,
+                'coin_id': self.coin_ids[self._coin_of[i]],
+                'quantity': float(self.quantities[i]),
+                'price': None if np.isnan(prices[i]) else float(prices[i]),
+                'value': float(self._values[i, col]),
+                'weight': float(weights[i]),
+                'pnl_24h': float(self._pnl[i, col]),
+            }
+            for i, symbol in enumerate(self.symbols)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
@@ -0,0 +1,238 @@
+"""
+Market data providers and a composite client hedging between them.
+
+``PriceProvider`` is the interface ``CryptoInfo`` needs for prices and symbol
+search, implemented by ``CoinGeckoClient`` and ``CoinPaprikaClient``. Both
+return CoinGecko-shaped results keyed by CoinGecko IDs, so they are
+interchangeable as an ``api_client``.
+
+``MultiProviderClient`` sends each price or search call to the first
+provider whose circuit breaker is closed. If it has not answered within
+``hedge_after`` seconds the call is also sent to the next provider, and the
+first successful answer wins; a failed call falls back to the next provider.
+Other endpoints (full coin documents, markets, history) go to the primary.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, Optional, List
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .deadline import propagate
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a provider before also asking the next one
+DEFAULT_HEDGE_AFTER = 0.5
+
+class PriceProvider:
+    """
+    Base class of market data providers usable as a CryptoInfo api_client.
+
+    Subclasses set ``name`` and implement ``get_coin_price`` and
+    ``search_coins`` with CoinGecko's response shapes and coin IDs.
+    """
+    name = 'provider'
+
+    def get_coin_price(self, coin_ids: List[str], vs_currencies: List[str],
+                       include_market_cap: bool = False,
+                       include_24hr_vol: bool = False,
+                       include_24hr_change: bool = False,
+                       include_last_updated_at: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Get current price of coins in the specified currencies.
+
+        Args:
+            coin_ids: List of CoinGecko IDs of the coins
+            vs_currencies: List of currencies to get prices in
+            include_market_cap: Include '<currency>_market_cap' values
+            include_24hr_vol: Include '<currency>_24h_vol' values
+            include_24hr_change: Include '<currency>_24h_change' values
+            include_last_updated_at: Include 'last_updated_at' Unix timestamps
+
+        Returns:
+            Dictionary of coin prices by currency, keyed by CoinGecko ID;
+            coins the provider does not know are left out
+        """
+        raise NotImplementedError
+
+    def search_coins(self, query: str) -> Dict[str, Any]:
+        """
+        Search for coins by name or symbol.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Dictionary with a 'coins' list of {'id', 'symbol', 'name', 'market_cap_rank'}
+        """
+        raise NotImplementedError
+
+class MultiProviderClient(PriceProvider):
+    """
+    Client hedging price and search calls across providers, in order of preference.
+    """
+    name = 'multi'
+
+    def __init__(self, providers: List[PriceProvider],
+                 hedge_after: Optional[float] = DEFAULT_HEDGE_AFTER,
+                 breakers: Optional[Dict[str, CircuitBreaker]] = None,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_workers: int = 16):
+        """
+        Initialize the client.
+
+        Args:
+            providers: Providers in order of preference; the first is the primary
+            hedge_after: Seconds to wait for a provider before also calling the
+                next one (None only falls back after a failure)
+            breakers: Circuit breakers by provider name; missing ones are created
+            failure_threshold: Consecutive failures opening a created breaker
+            reset_timeout: Seconds a created breaker stays open before probing
+            max_workers: Threads making provider calls
+        """
+        if not providers:
+            raise ValueError("At least one provider is required")
+        self.providers = list(providers)
+        self.hedge_after = hedge_after
+        self.breakers = dict(breakers or {})
+        for provider in self.providers:
+            if provider.name not in self.breakers:
+                self.breakers[provider.name] = CircuitBreaker(
+                    provider.name, failure_threshold=failure_threshold, reset_timeout=reset_timeout
+                )
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'hedged': 0, 'fallbacks': 0, 'skipped': 0}
+        self._wins = {provider.name: 0 for provider in self.providers}
+
+    @property
+    def primary(self) -> PriceProvider:
+        """Preferred provider, serving the endpoints only it implements."""
+        return self.providers[0]
+
+    def __getattr__(self, name: str) -> Any:
+        # Endpoints other than price and search, and attributes such as
+        # rate_limiter, come from the primary
+        if name.startswith('_') or name == 'providers':
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    def get_coin_price(self, coin_ids: List[str], vs_currencies: List[str],
+                       include_market_cap: bool = False,
+                       include_24hr_vol: bool = False,
+                       include_24hr_change: bool = False,
+                       include_last_updated_at: bool = False) -> Dict[str, Dict[str, float]]:
+        return self._call('get_coin_price', coin_ids, vs_currencies,
+                          include_market_cap=include_market_cap,
+                          include_24hr_vol=include_24hr_vol,
+                          include_24hr_change=include_24hr_change,
+                          include_last_updated_at=include_last_updated_at)
+
+    def search_coins(self, query: str) -> Dict[str, Any]:
+        return self._call('search_coins', query)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='crypto-info-provider')
+            return self._executor
+
+    def _run(self, provider: PriceProvider, method: str, args: tuple, kwargs: dict) -> Any:
+        """Call a provider, recording the outcome on its breaker (also for abandoned hedges)."""
+        breaker = self.breakers[provider.name]
+        try:
+            result = getattr(provider, method)(*args, **kwargs)
+        except Exception as e:
+            breaker.record_error(e)
+            raise
+        breaker.record_success()
+        return result
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Call a method on the providers with hedging and fallback.
+
+        Args:
+            method: Name of the PriceProvider method
+            *args: Positional arguments of the method
+            **kwargs: Keyword arguments of the method
+
+        Returns:
+            First successful result
+
+        Raises:
+            CircuitOpenError: If every provider's breaker is open
+            Exception: The last provider error if all providers failed
+        """
+        executor = self._get_executor()
+        pending: Dict[Future, PriceProvider] = {}
+        remaining = list(self.providers)
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            """Send the call to the next provider whose breaker allows it."""
+            while remaining:
+                provider = remaining.pop(0)
+                breaker = self.breakers[provider.name]
+                if breaker.allow_request():
+                    future = executor.submit(propagate(self._run), provider, method, args, kwargs)
+                    pending[future] = provider
+                    return True
+                logger.debug("Skipping provider '%s' with open circuit breaker", provider.name)
+                self._count('skipped')
+            return False
+
+        self._count('calls')
+        if not launch():
+            breaker = self.breakers[self.primary.name]
+            raise CircuitOpenError(breaker.name, breaker.retry_after())
+
+        while pending:
+            timeout = self.hedge_after if remaining else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if launch():
+                    logger.debug("Hedging %s after %.3f seconds", method, timeout)
+                    self._count('hedged')
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning("Provider '%s' failed %s: %s", provider.name, method, e)
+                    last_error = e
+                    continue
+                with self._lock:
+                    self._wins[provider.name] += 1
+                return result
+
+            if not pending and launch():
+                self._count('fallbacks')
+
+        raise last_error
+
+    def _count(self, key: str):
+        """Increment a statistics counter."""
+        with self._lock:
+            self._stats[key] += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Call, hedge, fallback and skipped-provider counts, successful answers per provider and breaker states."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats, wins=dict(self._wins))
+        stats['breakers'] = {name: breaker.state for name, breaker in self.breakers.items()}
+        return stats
+
+    def close(self):
+        """Shut down the thread pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,246 @@
+"""
+Client-side rate limiting and retry scheduling for API clients.
+"""
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``. A
+    penalty (for example after a 429 response) blocks every caller sharing the
+    bucket until it expires.
+    """
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+            clock: Monotonic time source
+            sleep: Function used to wait for tokens
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accumulated since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens if available without waiting.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds to wait before retrying
+        """
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the tokens were taken, False if the timeout expired first
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self._sleep(wait)
+
+    def penalize(self, seconds: float):
+        """
+        Block all callers for the given number of seconds and drain the bucket.
+
+        Args:
+            seconds: Length of the pause
+        """
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0
+            self._updated = max(self._updated, self._paused_until)
+
+    @property
+    def available(self) -> float:
+        """Number of tokens currently available."""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return 0.0
+            self._refill(now)
+            return self._tokens
+
+_shared_limiters: Dict[str, TokenBucket] = {}
+_shared_limiters_lock = threading.Lock()
+
+def get_shared_limiter(name: str, rate: float, capacity: float) -> TokenBucket:
+    """
+    Get the process-wide token bucket for a provider, creating it on first use.
+
+    The first caller's rate and capacity win; later callers share that bucket.
+
+    Args:
+        name: Provider name (e.g., 'coingecko')
+        rate: Tokens added per second
+        capacity: Maximum number of tokens (burst size)
+
+    Returns:
+        Shared TokenBucket
+    """
+    with _shared_limiters_lock:
+        if name not in _shared_limiters:
+            _shared_limiters[name] = TokenBucket(rate, capacity)
+        return _shared_limiters[name]
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of the request volume.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so
+    during an outage retries add at most ``ratio`` extra load instead of
+    multiplying it. ``min_tokens`` allows a few retries at low request volume.
+    """
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10):
+        """
+        Initialize the retry budget.
+
+        Args:
+            ratio: Retries allowed per request
+            min_tokens: Initial and maximum number of banked retries
+        """
+        self.ratio = ratio
+        self.max_tokens = min_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Record a request."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """
+        Take a retry from the budget.
+
+        Returns:
+            True if the retry is allowed
+        """
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+class RetryPolicy:
+    """
+    Retry policy with jittered exponential backoff that honors Retry-After.
+    """
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+                 retry_on_timeout: bool = True,
+                 budget: Optional[RetryBudget] = None):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_retries: Maximum number of retries per request
+            backoff_base: Backoff ceiling in seconds for the first retry, doubled for each retry
+            backoff_max: Maximum backoff in seconds
+            retry_statuses: HTTP status codes that are retried
+            retry_on_timeout: Whether timeouts and connection errors are retried
+            budget: Retry budget shared by the requests using this policy
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.retry_on_timeout = retry_on_timeout
+        self.budget = budget or RetryBudget()
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before a retry.
+
+        Uses "full jitter": a uniform delay between zero and the exponential
+        ceiling, so clients that failed together do not retry together. A
+        Retry-After value from the server takes precedence, with a little
+        jitter added on top.
+
+        Args:
+            attempt: Number of retries already made
+            retry_after: Delay requested by the server in seconds
+
+        Returns:
+            Delay in seconds
+        """
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after) + random.uniform(0, self.backoff_base)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,101 @@
+"""
+Request coalescing for concurrent identical calls.
+"""
+import logging
+import threading
+from typing import Dict, Any, Callable, Hashable
+
+from . import deadline
+from .deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """An in-flight call whose outcome is shared with waiting callers."""
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and receive the same result, or the same exception. The
+    result object is shared between callers and must not be mutated.
+
+    Waiting callers give up with ``DeadlineExceeded`` when their own deadline
+    passes first. A leader that ran out of its deadline says nothing about the
+    followers' time budgets, so they start the call again instead of sharing
+    its ``DeadlineExceeded``.
+    """
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identity of the call
+            fn: Function to run if no identical call is in flight
+
+        Returns:
+            Result of fn
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline passes while waiting
+            Exception: Whatever fn raised, re-raised in every waiting caller
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    self._coalesced += 1
+                    leader = False
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    self._executed += 1
+                    leader = True
+
+            if leader:
+                break
+
+            if not call.event.wait(deadline.remaining()):
+                raise DeadlineExceeded("Deadline exceeded waiting for an identical call in flight")
+            if isinstance(call.error, DeadlineExceeded):
+                # The leader's deadline, not ours, cut the call short: run it again
+                logger.debug("In-flight call for %r hit its deadline, retrying", key)
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of executed and coalesced calls, and calls currently in flight."""
+        with self._lock:
+            return {
+                'executed': self._executed,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._calls),
+            }
@@ -0,0 +1,279 @@
+"""
+Compact columnar snapshot of market data for many coins and currencies.
+
+Per-currency values are stored in flat ``array('d')`` columns (8 bytes per
+value, NaN for missing data) laid out coin-major, instead of one dictionary
+per coin per field. NumPy is used for vectorized queries when installed
+(``pip install crypto_info[numpy]``) and is otherwise optional.
+"""
+import heapq
+import math
+from array import array
+from typing import Dict, Any, Optional, List, Tuple
+
+from .crypto_info import PER_CURRENCY_FIELDS, SIMPLE_PRICE_SUFFIXES, _format_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    np = None
+
+# Fields holding one numeric value per coin
+COIN_FIELDS = ['market_cap_rank', 'price_change_24h', 'price_change_percentage_24h']
+
+_NAN = float('nan')
+
+def _to_float(value: Any) -> float:
+    """Convert a JSON number to float, mapping missing values to NaN."""
+    return _NAN if value is None else float(value)
+
+def _from_float(value: float) -> Optional[float]:
+    """Convert a stored float back to a JSON value, mapping NaN to None."""
+    return None if math.isnan(value) else value
+
+class PriceSnapshot:
+    """
+    Columnar market data indexed by coin and currency.
+    """
+    def __init__(self, currencies: List[str]):
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            currencies: Currencies to keep; values in other currencies are skipped
+        """
+        self.currencies = [currency.lower() for currency in currencies]
+        self._currency_index = {currency: i for i, currency in enumerate(self.currencies)}
+        self.coin_ids: List[str] = []
+        self._coin_index: Dict[str, int] = {}
+        self.names: List[Optional[str]] = []
+        self.symbols: List[Optional[str]] = []
+        self.last_updated: List[Optional[str]] = []
+        self._values = {field: array('d') for field in PER_CURRENCY_FIELDS}
+        self._coin_values = {field: array('d') for field in COIN_FIELDS}
+
+    def _row(self, coin_id: str) -> int:
+        """Get the row of a coin, appending an empty row if it is new."""
+        row = self._coin_index.get(coin_id)
+        if row is not None:
+            return row
+
+        row = len(self.coin_ids)
+        self._coin_index[coin_id] = row
+        self.coin_ids.append(coin_id)
+        self.names.append(None)
+        self.symbols.append(None)
+        self.last_updated.append(None)
+        empty = array('d', [_NAN]) * len(self.currencies)
+        for column in self._values.values():
+            column.extend(empty)
+        for column in self._coin_values.values():
+            column.append(_NAN)
+        return row
+
+    def add_coin(self, coin_data: Dict[str, Any]):
+        """
+        Add or update a coin from a /coins/{id} document.
+
+        Args:
+            coin_data: Coin data as returned by get_coin_by_id
+        """
+        row = self._row(coin_data['id'])
+        self.names[row] = coin_data.get('name')
+        self.symbols[row] = (coin_data.get('symbol') or '').upper()
+        self.last_updated[row] = coin_data.get('last_updated')
+
+        market_data = coin_data.get('market_data') or {}
+        base = row * len(self.currencies)
+        for field, column in self._values.items():
+            for currency, value in (market_data.get(field) or {}).items():
+                col = self._currency_index.get(currency)
+                if col is not None:
+                    column[base + col] = _to_float(value)
+
+        self._coin_values['market_cap_rank'][row] = _to_float(coin_data.get('market_cap_rank'))
+        for field in ('price_change_24h', 'price_change_percentage_24h'):
+            self._coin_values[field][row] = _to_float(market_data.get(field))
+
+    def add_market(self, market: Dict[str, Any], vs_currency: str):
+        """
+        Add or update a coin from a /coins/markets record.
+
+        Args:
+            market: Market data dictionary (raw or normalized by stream_market_snapshot)
+            vs_currency: Currency the market data is in
+        """
+        row = self._row(market['id'])
+        self.names[row] = market.get('name')
+        self.symbols[row] = (market.get('symbol') or '').upper()
+        self.last_updated[row] = market.get('last_updated')
+
+        col = self._currency_index.get(vs_currency.lower())
+        if col is not None:
+            index = row * len(self.currencies) + col
+            for field, column in self._values.items():
+                column[index] = _to_float(market.get(field))
+
+        for field, column in self._coin_values.items():
+            column[row] = _to_float(market.get(field))
+
+    def add_price(self, coin_id: str, price_data: Dict[str, Any]):
+        """
+        Add or update a coin from a /simple/price entry.
+
+        Fills current price, market cap and volume for every tracked currency
+        present in the entry. The 24h change in USD, when present, is stored as
+        the coin's price_change_percentage_24h.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+            price_data: Entry of the /simple/price response for the coin
+        """
+        row = self._row(coin_id)
+        base = row * len(self.currencies)
+        for currency, col in self._currency_index.items():
+            for field, suffix in SIMPLE_PRICE_SUFFIXES.items():
+                value = price_data.get(f"{currency}{suffix}")
+                if value is not None:
+                    self._values[field][base + col] = float(value)
+
+        if price_data.get('usd_24h_change') is not None:
+            self._coin_values['price_change_percentage_24h'][row] = float(price_data['usd_24h_change'])
+        if price_data.get('last_updated_at') is not None:
+            self.last_updated[row] = _format_timestamp(price_data['last_updated_at'])
+
+    def value(self, coin_id: str, field: str, currency: str) -> Optional[float]:
+        """
+        Get one value.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+            field: One of PER_CURRENCY_FIELDS
+            currency: Currency of the value
+
+        Returns:
+            The value, or None if it is missing
+
+        Raises:
+            KeyError: If the coin, field or currency is not in the snapshot
+        """
+        index = self._coin_index[coin_id] * len(self.currencies) + self._currency_index[currency.lower()]
+        return _from_float(self._values[field][index])
+
+    def column(self, field: str, currency: str) -> array:
+        """
+        Get the values of one field in one currency for all coins, in coin_ids order.
+
+        Args:
+            field: One of PER_CURRENCY_FIELDS
+            currency: Currency of the values
+
+        Returns:
+            array('d') with NaN for missing values
+        """
+        col = self._currency_index[currency.lower()]
+        return self._values[field][col::len(self.currencies)]
+
+    def to_numpy(self, field: str, currency: Optional[str] = None) -> 'np.ndarray':
+        """
+        Get a field as a NumPy array.
+
+        The data is copied: a view would lock the underlying array and make
+        adding coins fail while the view is alive.
+
+        Args:
+            field: One of PER_CURRENCY_FIELDS or COIN_FIELDS
+            currency: Currency for per-currency fields (None returns the
+                whole coins x currencies matrix)
+
+        Returns:
+            NumPy array of the column
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("PriceSnapshot.to_numpy requires numpy: pip install crypto_info[numpy]")
+
+        if field in self._coin_values:
+            return np.array(self._coin_values[field], dtype=np.float64)
+
+        matrix = np.array(self._values[field], dtype=np.float64).reshape(
+            len(self.coin_ids), len(self.currencies)
+        )
+        if currency is None:
+            return matrix
+        return matrix[:, self._currency_index[currency.lower()]]
+
+    def top_n(self, n: int, field: str = 'market_cap', currency: str = 'usd') -> List[Tuple[str, float]]:
+        """
+        Get the coins with the largest values of a field.
+
+        Args:
+            n: Number of coins to return
+            field: One of PER_CURRENCY_FIELDS
+            currency: Currency of the values
+
+        Returns:
+            List of (coin_id, value) tuples, largest first, skipping missing values
+        """
+        if np is not None:
+            values = self.to_numpy(field, currency)
+            valid = np.flatnonzero(~np.isnan(values))
+            if len(valid) > n:
+                valid = valid[np.argpartition(-values[valid], n - 1)[:n]]
+            order = valid[np.argsort(-values[valid], kind='stable')]
+            return [(self.coin_ids[i], float(values[i])) for i in order]
+
+        values = self.column(field, currency)
+        best = heapq.nlargest(
+            n,
+            (i for i in range(len(values)) if not math.isnan(values[i])),
+            key=values.__getitem__
+        )
+        return [(self.coin_ids[i], values[i]) for i in best]
+
+    def to_dict(self, coin_id: str) -> Dict[str, Any]:
+        """
+        Convert one coin back to the dictionary shape returned by get_crypto_info.
+
+        Fields a snapshot does not hold (description, image) are left out.
+
+        Args:
+            coin_id: CoinGecko ID of the coin
+
+        Returns:
+            Dictionary containing cryptocurrency information
+        """
+        row = self._coin_index[coin_id]
+        base = row * len(self.currencies)
+        rank = _from_float(self._coin_values['market_cap_rank'][row])
+
+        result = {
+            'id': coin_id,
+            'name': self.names[row],
+            'symbol': self.symbols[row],
+            'market_cap_rank': int(rank) if rank is not None else None,
+            'price_change_24h': _from_float(self._coin_values['price_change_24h'][row]),
+            'price_change_percentage_24h': _from_float(self._coin_values['price_change_percentage_24h'][row]),
+            'last_updated': self.last_updated[row],
+        }
+        for field, column in self._values.items():
+            result[field] = {
+                currency: column[base + col]
+                for currency, col in self._currency_index.items()
+                if not math.isnan(column[base + col])
+            }
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        """Size in bytes of the numeric columns."""
+        columns = list(self._values.values()) + list(self._coin_values.values())
+        return sum(len(column) * column.itemsize for column in columns)
+
+    def __len__(self) -> int:
+        return len(self.coin_ids)
+
+    def __contains__(self, coin_id: str) -> bool:
+        return coin_id in self._coin_index
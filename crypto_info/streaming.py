@@ -0,0 +1,494 @@
+"""
+Streaming price subscriptions.
+
+``PriceFeed`` keeps one upstream connection for all local subscribers of a
+``CryptoInfo``: a ``StreamTransport`` pushing quotes when one is configured,
+otherwise (and while the stream is down) a ``PricePoller`` fetching only the
+quotes that changed. Each update is fanned out to the subscriptions watching
+the coin.
+
+Subscribers never slow the upstream down. Each subscription buffers at most
+one pending update per coin: an update arriving before the previous one was
+consumed replaces it (and is counted as coalesced), so a slow consumer sees
+the latest quote instead of a growing backlog.
+
+``NDJSONTransport`` speaks a minimal line protocol over TCP. The client sends
+
+    {"op": "subscribe", "ids": ["bitcoin", ...], "vs_currencies": ["usd"]}
+
+and the server answers with one message per line: quotes shaped like a
+/simple/price entry plus the coin ID, e.g.
+``{"id": "bitcoin", "usd": 50000.0, "last_updated_at": 1700000000}``,
+``{"op": "heartbeat"}`` to keep an idle connection alive and
+``{"op": "error", "message": "..."}`` before closing. Adapters for other feeds
+(e.g. a WebSocket API) subclass ``StreamTransport``.
+"""
+import json
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .decoders import get_decoder
+from .poller import PricePoller, PriceChange, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Seconds of polling after the first stream failure before reconnecting,
+# doubling with each consecutive failure up to the maximum
+DEFAULT_RETRY_DELAY = 1.0
+DEFAULT_MAX_RETRY_DELAY = 60.0
+
+# Seconds without any message (quotes or heartbeats) after which a stream is considered dead
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+STREAM = 'stream'
+POLLING = 'polling'
+
+class StreamTransport:
+    """
+    Base class of push price feeds.
+
+    ``stream`` connects, subscribes and yields quotes until the connection
+    ends; it raises OSError (or ValueError for malformed data) when the
+    connection fails. ``close`` may be called from another thread to
+    interrupt a stream blocked waiting for data.
+    """
+    name = 'transport'
+
+    def stream(self, coin_ids: List[str], vs_currencies: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream quotes for coins.
+
+        Args:
+            coin_ids: CoinGecko IDs to subscribe to
+            vs_currencies: Currencies to get prices in
+
+        Yields:
+            Tuples of (CoinGecko ID, quote shaped like a /simple/price entry)
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Close the current connection, ending its stream."""
+        raise NotImplementedError
+
+class NDJSONTransport(StreamTransport):
+    """
+    Newline-delimited JSON price feed over TCP.
+    """
+    name = 'ndjson'
+
+    def __init__(self, host: str, port: int, connect_timeout: float = 5.0,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT, json_backend: Optional[str] = None):
+        """
+        Initialize the transport. The connection is opened by stream().
+
+        Args:
+            host: Feed server host
+            port: Feed server port
+            connect_timeout: Seconds to wait for the connection
+            idle_timeout: Seconds without any message before the connection is considered dead
+            json_backend: JSON backend for messages ('orjson', 'ujson' or 'json')
+        """
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+        self._decode = get_decoder(json_backend)
+        self._sock: Optional[socket.socket] = None
+        self._closes = 0
+        self._lock = threading.Lock()
+
+    def stream(self, coin_ids: List[str], vs_currencies: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        # Counted now, so a close() while the connection is being opened still ends the stream
+        with self._lock:
+            closes = self._closes
+        return self._stream(coin_ids, vs_currencies, closes)
+
+    def _stream(self, coin_ids: List[str], vs_currencies: List[str],
+                closes: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Connect and yield quotes, unless close() was called since stream()."""
+        sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        with self._lock:
+            if self._closes != closes:
+                sock.close()
+                return
+            self._sock = sock
+        try:
+            sock.settimeout(self.idle_timeout)
+            request = {'op': 'subscribe', 'ids': list(coin_ids), 'vs_currencies': list(vs_currencies)}
+            sock.sendall(json.dumps(request, separators=(',', ':')).encode('utf-8') + b'\n')
+            for line in sock.makefile('rb'):
+                if not line.strip():
+                    continue
+                message = self._decode(line)
+                op = message.get('op')
+                if op == 'error':
+                    raise ConnectionError(f"Feed server error: {message.get('message')}")
+                if op is None and message.get('id'):
+                    yield message.pop('id'), message
+        finally:
+            self.close()
+
+    def close(self):
+        with self._lock:
+            sock, self._sock = self._sock, None
+            self._closes += 1
+        if sock is not None:
+            try:
+                # Wakes a thread blocked reading the socket
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+class Subscription:
+    """
+    Updates for a set of symbols, consumed with a callback, iteration or async iteration.
+
+    Iterating blocks until the next update and ends when the subscription is
+    closed. Use as a context manager to close it.
+    """
+    def __init__(self, feed: 'PriceFeed', symbols_by_id: Dict[str, List[str]], errors: Dict[str, str]):
+        self.feed = feed
+        self.symbols_by_id = symbols_by_id
+        self.errors = errors
+        self.stats = {'received': 0, 'delivered': 0, 'coalesced': 0}
+        self._pending: 'OrderedDict[str, PriceChange]' = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._waker = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _offer(self, coin_id: str, price: Dict[str, Any], updated_at: int, previous: Optional[int]):
+        """Queue an update, replacing one for the same coin that was not consumed yet."""
+        with self._cond:
+            if self._closed:
+                return
+            self.stats['received'] += 1
+            queued = self._pending.get(coin_id)
+            if queued is not None:
+                # The consumer never saw the queued update, so report the change since the one before
+                self.stats['coalesced'] += 1
+                previous = queued.previous_updated_at
+            self._pending[coin_id] = PriceChange(coin_id, self.symbols_by_id[coin_id], price, updated_at, previous)
+            self._cond.notify()
+            self._wake_async()
+
+    def _wake_async(self):
+        """Wake an async consumer waiting for updates (called with the condition held)."""
+        if self._waker is not None:
+            loop, event = self._waker
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The consumer's event loop is closed
+                self._waker = None
+
+    def _pop(self) -> PriceChange:
+        """Take the oldest queued update (called with the condition held)."""
+        _, change = self._pending.popitem(last=False)
+        self.stats['delivered'] += 1
+        return change
+
+    def get(self, timeout: Optional[float] = None) -> Optional[PriceChange]:
+        """
+        Wait for the next update.
+
+        Args:
+            timeout: Seconds to wait (None waits until an update arrives or the subscription is closed)
+
+        Returns:
+            PriceChange, or None on timeout or once closed
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending or self._closed, timeout):
+                return None
+            return self._pop() if self._pending else None
+
+    def __iter__(self) -> Iterator[PriceChange]:
+        while True:
+            change = self.get()
+            if change is None:
+                return
+            yield change
+
+    def __aiter__(self) -> 'Subscription':
+        return self
+
+    async def __anext__(self) -> PriceChange:
+        # Imported lazily so synchronous users do not pay for asyncio
+        import asyncio
+
+        while True:
+            with self._cond:
+                if self._pending:
+                    return self._pop()
+                if self._closed:
+                    raise StopAsyncIteration
+                if self._waker is None:
+                    self._waker = (asyncio.get_running_loop(), asyncio.Event())
+                event = self._waker[1]
+                event.clear()
+            await event.wait()
+
+    def _deliver(self, callback: Callable[[PriceChange], None]):
+        """Run a callback for every update in a dedicated thread, so a slow callback only delays itself."""
+        def run():
+            for change in self:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.error("Subscription callback failed: %s", e)
+
+        self._thread = threading.Thread(target=run, name='price-subscription', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop receiving updates; pending updates are dropped."""
+        self.feed._unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+            self._wake_async()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'Subscription':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class PriceFeed:
+    """
+    Single upstream price feed shared by many subscriptions.
+    """
+    def __init__(self, crypto_info, vs_currencies: Optional[List[str]] = None,
+                 transport: Optional[StreamTransport] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 retry_delay: float = DEFAULT_RETRY_DELAY,
+                 max_retry_delay: float = DEFAULT_MAX_RETRY_DELAY):
+        """
+        Initialize the feed. The upstream starts with the first subscription.
+
+        Args:
+            crypto_info: CryptoInfo used to resolve symbols and to poll
+            vs_currencies: Currencies to get prices in (defaults to ['usd'])
+            transport: Optional push feed; without one, prices are polled
+            min_interval: Shortest time in seconds between polls
+            max_interval: Longest time in seconds between polls
+            retry_delay: Seconds of polling after a stream failure before reconnecting,
+                doubled for each consecutive failure
+            max_retry_delay: Longest time in seconds between reconnection attempts
+        """
+        self.crypto_info = crypto_info
+        self.vs_currencies = [currency.lower() for currency in vs_currencies or ['usd']]
+        self.transport = transport
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.mode: Optional[str] = None
+        self.stats = {'updates': 0, 'duplicates': 0, 'stream_connects': 0, 'stream_failures': 0, 'polls': 0}
+        self._subscriptions: List[Subscription] = []
+        # coin_id -> (latest quote, last_updated_at)
+        self._latest: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._stream_retry_at = 0.0
+
+    def subscribe(self, symbols: List[str],
+                  callback: Optional[Callable[[PriceChange], None]] = None) -> Subscription:
+        """
+        Subscribe to price updates.
+
+        The latest known quotes of the symbols are delivered first, then every
+        update. Symbols that cannot be resolved are reported in the
+        subscription's ``errors``.
+
+        Args:
+            symbols: Cryptocurrency symbols
+            callback: Optional function called with each PriceChange in a
+                thread of the subscription; without one, iterate the subscription
+
+        Returns:
+            Subscription
+        """
+        symbols_by_id: Dict[str, List[str]] = {}
+        errors: Dict[str, str] = {}
+        for symbol in dict.fromkeys(symbols):
+            try:
+                coin_id = self.crypto_info._get_coin_id(symbol)
+            except ValueError as e:
+                errors[symbol] = str(e)
+                continue
+            symbols_by_id.setdefault(coin_id, []).append(symbol)
+
+        subscription = Subscription(self, symbols_by_id, errors)
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("The price feed is closed")
+            new_coins = set(symbols_by_id) - self._coin_ids()
+            self._subscriptions.append(subscription)
+            snapshot = [(coin_id, self._latest[coin_id]) for coin_id in symbols_by_id if coin_id in self._latest]
+            if self._thread is None:
+                # The new upstream starts with this subscription's coins
+                new_coins = set()
+                self._thread = threading.Thread(target=self._run, name='price-feed', daemon=True)
+                self._thread.start()
+
+        for coin_id, (price, updated_at) in snapshot:
+            subscription._offer(coin_id, price, updated_at, None)
+        if callback is not None:
+            subscription._deliver(callback)
+        if new_coins:
+            self._restart_upstream()
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        """Remove a subscription, narrowing the upstream subscription when coins are no longer watched."""
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            before = self._coin_ids()
+            self._subscriptions.remove(subscription)
+            narrowed = self._coin_ids() != before
+        if narrowed:
+            self._restart_upstream()
+
+    def _coin_ids(self) -> set:
+        """Coins watched by any subscription (called with the lock held)."""
+        return {coin_id for subscription in self._subscriptions for coin_id in subscription.symbols_by_id}
+
+    def _restart_upstream(self):
+        """Make the upstream loop pick up a new set of coins."""
+        self._changed.set()
+        if self.transport is not None and self.mode == STREAM:
+            self.transport.close()
+
+    def _publish(self, coin_id: str, price: Dict[str, Any]):
+        """Fan an upstream quote out to the subscriptions watching the coin."""
+        updated_at = price.get('last_updated_at')
+        if updated_at is None:
+            updated_at = int(time.time())
+        with self._lock:
+            latest = self._latest.get(coin_id)
+            previous = latest[1] if latest is not None else None
+            if previous is not None and updated_at <= previous:
+                # Already delivered, e.g. resent after a reconnect or seen by both stream and poller
+                self.stats['duplicates'] += 1
+                return
+            self._latest[coin_id] = (price, updated_at)
+            self.stats['updates'] += 1
+            subscriptions = [s for s in self._subscriptions if coin_id in s.symbols_by_id]
+        for subscription in subscriptions:
+            subscription._offer(coin_id, price, updated_at, previous)
+
+    def _run(self):
+        """Upstream loop: stream when possible, otherwise poll, until closed."""
+        while not self._stopped.is_set():
+            self._changed.clear()
+            with self._lock:
+                symbols_by_id = {}
+                for subscription in self._subscriptions:
+                    for coin_id, symbols in subscription.symbols_by_id.items():
+                        symbols_by_id.setdefault(coin_id, symbols[0])
+
+            try:
+                if not symbols_by_id:
+                    self.mode = None
+                    self._changed.wait()
+                elif self.transport is not None and time.monotonic() >= self._stream_retry_at:
+                    self._run_stream(sorted(symbols_by_id))
+                else:
+                    self._run_polling(list(symbols_by_id.values()))
+            except Exception as e:
+                # Keep the feed alive for its subscribers
+                logger.error("Price feed failed: %s", e)
+                self._changed.wait(self.min_interval)
+
+    def _run_stream(self, coin_ids: List[str]):
+        """Stream quotes until the connection ends or the coins change."""
+        self.mode = STREAM
+        self.stats['stream_connects'] += 1
+        stream = self.transport.stream(coin_ids, self.vs_currencies)
+        if self._changed.is_set():
+            # The coins changed before the transport could be interrupted
+            return
+        try:
+            for coin_id, price in stream:
+                self._failures = 0
+                self._publish(coin_id, price)
+                if self._changed.is_set():
+                    return
+            if not self._changed.is_set():
+                raise ConnectionError("Stream closed by the server")
+        except (OSError, ValueError) as e:
+            if self._changed.is_set():
+                # Closed on purpose to resubscribe
+                return
+            self._failures += 1
+            self.stats['stream_failures'] += 1
+            delay = min(self.max_retry_delay, self.retry_delay * 2 ** (self._failures - 1))
+            logger.warning("Price stream '%s' failed (%s), polling for %.1f seconds",
+                           self.transport.name, e, delay)
+            self._stream_retry_at = time.monotonic() + delay
+        finally:
+            # Generators are closed right away; a plain iterator may have no close()
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+            self.transport.close()
+
+    def _run_polling(self, symbols: List[str]):
+        """Poll changed quotes until the coins change or the stream is due for another try."""
+        self.mode = POLLING
+        poller = PricePoller(self.crypto_info, symbols, self.vs_currencies,
+                             min_interval=self.min_interval, max_interval=self.max_interval)
+        while not self._changed.is_set():
+            try:
+                for change in poller.poll_once():
+                    self._publish(change.coin_id, change.price)
+            except Exception as e:
+                logger.error("Price poll failed: %s", e)
+            self.stats['polls'] += 1
+
+            delay = poller.next_interval()
+            if self.transport is not None:
+                retry_in = self._stream_retry_at - time.monotonic()
+                if retry_in <= 0:
+                    return
+                delay = min(delay, retry_in)
+            self._changed.wait(delay)
+
+    @property
+    def quotes(self) -> Dict[str, Dict[str, Any]]:
+        """Latest known quote per CoinGecko ID."""
+        with self._lock:
+            return {coin_id: price for coin_id, (price, _) in self._latest.items()}
+
+    def close(self):
+        """Stop the upstream and close every subscription."""
+        with self._lock:
+            self._stopped.set()
+            subscriptions = list(self._subscriptions)
+            thread, self._thread = self._thread, None
+        for subscription in subscriptions:
+            subscription.close()
+        self._restart_upstream()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
@@ -0,0 +1,401 @@
+"""
+Persistent symbol to CoinGecko ID index.
+
+The index is built once from the full /coins/list response, serialized to a
+compact gzip-compressed JSON file and loaded lazily on first lookup. Ship the
+file in the deployment image or refresh it on a schedule with:
+
+    python -m crypto_info.symbol_index build --output /path/to/symbol_index.json.gz
+
+Tie-break policy for duplicate symbols (many coins share a ticker such as
+'btc' or 'eth'): candidates with a known market cap rank win over unranked
+coins, lower rank first; remaining ties go to the shorter CoinGecko ID
+(bridged and wrapped variants have longer IDs), then to the alphabetically
+smaller ID so the result is deterministic.
+
+``search`` serves autocomplete and fuzzy lookups from the same coin list:
+exact symbol matches first, then exact names, then symbol, name and ID
+prefixes, then names within a few typos (trigram similarity), each group
+ordered by the tie-break policy above, i.e. by market cap rank. The search
+structures are built on the first search, so plain lookups do not pay for them.
+"""
+import bisect
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    'CRYPTO_INFO_SYMBOL_INDEX',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'symbol_index.json.gz')
+)
+
+# Number of /coins/markets pages (250 coins each) fetched to rank coins when
+# building the index
+DEFAULT_RANK_PAGES = 4
+
+# (id, symbol, name, market_cap_rank)
+CoinEntry = Tuple[str, str, str, Optional[int]]
+
+# Search match groups, best first
+EXACT_SYMBOL = 0
+EXACT_NAME = 1
+PREFIX = 2
+FUZZY = 3
+
+# Minimum trigram similarity (Dice coefficient) of a fuzzy match
+MIN_SIMILARITY = 0.4
+
+_WORD_SPLIT = re.compile(r'[^0-9a-z]+')
+
+def _normalize(text: str) -> str:
+    """Lowercase a query or coin name and collapse whitespace."""
+    return ' '.join(text.lower().split())
+
+def _trigrams(term: str) -> set:
+    """Get the trigrams of a term, padded so that its start weighs more."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _sort_key(coin: CoinEntry) -> Tuple[int, int, int, str]:
+    """Sort key implementing the duplicate-symbol tie-break policy."""
+    coin_id, _, _, rank = coin
+    return (0 if rank is not None else 1, rank or 0, len(coin_id), coin_id)
+
+class SymbolIndex:
+    """
+    Symbol to CoinGecko ID index with O(1) lookups.
+    """
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH):
+        """
+        Initialize the symbol index.
+
+        The file is not read until the first lookup. A missing file results in
+        an empty index, so callers fall back to network search.
+
+        Args:
+            path: Path of the serialized index file, or None for an in-memory index
+        """
+        self.path = path
+        self.built_at: Optional[int] = None
+        self._coins: Optional[List[CoinEntry]] = None
+        self._by_symbol: Dict[str, List[CoinEntry]] = {}
+        self._search_index: Optional['_SearchIndex'] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_coins(cls, coins: List[Dict[str, Any]],
+                   ranks: Optional[Dict[str, int]] = None) -> 'SymbolIndex':
+        """
+        Create an in-memory index from a /coins/list response.
+
+        Args:
+            coins: Coins as dictionaries with 'id', 'symbol' and 'name' keys
+            ranks: Optional mapping of CoinGecko ID to market cap rank
+
+        Returns:
+            Loaded SymbolIndex
+        """
+        ranks = ranks or {}
+        index = cls(path=None)
+        index._set_coins([
+            (coin['id'], coin.get('symbol', '').lower(), coin.get('name', ''), ranks.get(coin['id']))
+            for coin in coins
+            if coin.get('id')
+        ], built_at=int(time.time()))
+        return index
+
+    @classmethod
+    def build(cls, api_client, rank_pages: int = DEFAULT_RANK_PAGES) -> 'SymbolIndex':
+        """
+        Build an index from the CoinGecko API.
+
+        Args:
+            api_client: CoinGeckoClient used to fetch the coin list and rankings
+            rank_pages: Number of /coins/markets pages used to rank coins
+
+        Returns:
+            Loaded SymbolIndex
+        """
+        coins = api_client.get_coins_list()
+        ranks: Dict[str, int] = {}
+
+        for page in range(1, rank_pages + 1):
+            markets = api_client.get_coins_markets('usd', per_page=250, page=page)
+            for market in markets:
+                if market.get('market_cap_rank') is not None:
+                    ranks[market['id']] = market['market_cap_rank']
+            if len(markets) < 250:
+                break
+
+        logger.info(f"Built symbol index with {len(coins)} coins ({len(ranks)} ranked)")
+        return cls.from_coins(coins, ranks)
+
+    def _set_coins(self, coins: List[CoinEntry], built_at: Optional[int] = None):
+        """Replace the indexed coins and rebuild the symbol map."""
+        by_symbol: Dict[str, List[CoinEntry]] = {}
+        for coin in coins:
+            by_symbol.setdefault(coin[1], []).append(coin)
+        for candidates in by_symbol.values():
+            candidates.sort(key=_sort_key)
+
+        self._by_symbol = by_symbol
+        self._coins = coins
+        self._search_index = None
+        self.built_at = built_at
+
+    def _ensure_loaded(self):
+        """Load the index file on first use."""
+        if self._coins is not None:
+            return
+
+        with self._lock:
+            if self._coins is not None:
+                return
+            if not self.path or not os.path.exists(self.path):
+                logger.debug(f"Symbol index file {self.path} not found, using an empty index")
+                self._set_coins([])
+                return
+
+            start = time.perf_counter()
+            try:
+                with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') != FORMAT_VERSION:
+                    raise ValueError(f"unsupported format version {data.get('version')}")
+                self._set_coins([tuple(coin) for coin in data['coins']], built_at=data.get('built_at'))
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Failed to load symbol index from {self.path}: {e}")
+                self._set_coins([])
+                return
+
+            logger.debug(f"Loaded {len(self._coins)} coins from {self.path} "
+                         f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index file has been read."""
+        return self._coins is not None
+
+    def load(self) -> 'SymbolIndex':
+        """
+        Read the index file now instead of on the first lookup.
+
+        Returns:
+            The index, for chaining
+        """
+        self._ensure_loaded()
+        return self
+
+    def save(self, path: Optional[str] = None):
+        """
+        Serialize the index to a gzip-compressed JSON file.
+
+        Args:
+            path: Destination path (defaults to the index path)
+
+        Raises:
+            ValueError: If no path is given and the index has none
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the symbol index")
+
+        self._ensure_loaded()
+        data = {
+            'version': FORMAT_VERSION,
+            'built_at': self.built_at,
+            'coins': [list(coin) for coin in self._coins]
+        }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial index
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def lookup(self, symbol: str) -> Optional[str]:
+        """
+        Get the CoinGecko ID for a symbol according to the tie-break policy.
+
+        Args:
+            symbol: Cryptocurrency symbol (case-insensitive)
+
+        Returns:
+            CoinGecko ID, or None if the symbol is not indexed
+        """
+        self._ensure_loaded()
+        candidates = self._by_symbol.get(symbol.lower())
+        return candidates[0][0] if candidates else None
+
+    def candidates(self, symbol: str) -> List[str]:
+        """
+        Get all CoinGecko IDs sharing a symbol, best candidate first.
+
+        Args:
+            symbol: Cryptocurrency symbol (case-insensitive)
+
+        Returns:
+            List of CoinGecko IDs
+        """
+        self._ensure_loaded()
+        return [coin[0] for coin in self._by_symbol.get(symbol.lower(), [])]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search coins by symbol, name or ID, allowing prefixes and small typos.
+
+        Args:
+            query: Search text (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            Coins as dictionaries with 'id', 'symbol', 'name' and
+            'market_cap_rank' keys, best match first
+        """
+        query = _normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        self._ensure_loaded()
+        search_index = self._search_index
+        if search_index is None:
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = _SearchIndex(self._coins)
+                search_index = self._search_index
+
+        return [
+            {'id': coin[0], 'symbol': coin[1], 'name': coin[2], 'market_cap_rank': coin[3]}
+            for coin in search_index.search(query, limit)
+        ]
+
+    @property
+    def coins(self) -> List[CoinEntry]:
+        """All indexed coins as (id, symbol, name, market_cap_rank) tuples."""
+        self._ensure_loaded()
+        return self._coins
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._coins)
+
+    def __contains__(self, symbol: str) -> bool:
+        self._ensure_loaded()
+        return symbol.lower() in self._by_symbol
+
+class _SearchIndex:
+    """
+    Prefix and trigram indexes over the symbols, names and IDs of coins.
+
+    Coins are numbered in tie-break order, so ranking matches within a group
+    is taking the smallest numbers. Prefixes are found by binary search in the
+    sorted list of terms, which behaves like a trie without per-node objects.
+    """
+    def __init__(self, coins: List[CoinEntry]):
+        start = time.perf_counter()
+        self.coins = sorted(coins, key=_sort_key)
+
+        entries = []
+        for position, (coin_id, symbol, name, _) in enumerate(self.coins):
+            name = _normalize(name)
+            entries.append((symbol, EXACT_SYMBOL, position))
+            terms = {name, coin_id} - {symbol}
+            entries.extend((term, EXACT_NAME, position) for term in terms if term)
+            # Name words only match as prefixes, so 'inu' finds 'Shiba Inu' below exact names
+            words = set(_WORD_SPLIT.split(name)) - terms - {symbol, ''}
+            entries.extend((word, PREFIX, position) for word in words)
+        entries.sort()
+        self.terms = [entry[0] for entry in entries]
+        self.refs = [(entry[1], entry[2]) for entry in entries]
+
+        # Trigram postings of symbols and full names, for fuzzy matching
+        self.fuzzy_terms: List[Tuple[int, int]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for position, (_, symbol, name, _) in enumerate(self.coins):
+            for term in {symbol, _normalize(name)}:
+                if len(term) < 3:
+                    continue
+                grams = _trigrams(term)
+                term_number = len(self.fuzzy_terms)
+                self.fuzzy_terms.append((position, len(grams)))
+                for gram in grams:
+                    self.postings[gram].append(term_number)
+
+        logger.debug("Built search index over %d coins in %.1f ms",
+                     len(self.coins), (time.perf_counter() - start) * 1000)
+
+    def search(self, query: str, limit: int) -> List[CoinEntry]:
+        """Get the best coins matching a normalized query."""
+        # Best (group, position) per coin position
+        best: Dict[int, Tuple[int, int]] = {}
+
+        low = bisect.bisect_left(self.terms, query)
+        high = bisect.bisect_left(self.terms, query + '\uffff', low)
+        for i in range(low, high):
+            kind, position = self.refs[i]
+            group = kind if self.terms[i] == query else PREFIX
+            if position not in best or group < best[position][0]:
+                best[position] = (group, position)
+
+        if len(best) < limit and len(query) >= 3:
+            # Not enough prefix matches, look for names with typos
+            for position, similarity in self._fuzzy(query):
+                if position not in best:
+                    # Within the fuzzy group, closer names come first
+                    best[position] = (FUZZY, -similarity, position)
+
+        return [self.coins[key[-1]] for key in heapq.nsmallest(limit, best.values())]
+
+    def _fuzzy(self, query: str) -> List[Tuple[int, float]]:
+        """Get (coin position, similarity) of terms sharing enough trigrams with the query."""
+        grams = _trigrams(query)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for term_number in self.postings.get(gram, ()):
+                shared[term_number] += 1
+
+        matches: Dict[int, float] = {}
+        for term_number, count in shared.items():
+            position, size = self.fuzzy_terms[term_number]
+            similarity = 2.0 * count / (len(grams) + size)
+            if similarity >= MIN_SIMILARITY and similarity > matches.get(position, 0.0):
+                # Rounded so that near-equal matches fall back to market cap order
+                matches[position] = round(similarity, 1)
+        return list(matches.items())
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point for building the symbol index file."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the crypto_info symbol index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Build the index from the CoinGecko API")
+    build_parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help="Destination file")
+    build_parser.add_argument('--rank-pages', type=int, default=DEFAULT_RANK_PAGES,
+                              help="Number of /coins/markets pages used to rank coins")
+
+    args = parser.parse_args(argv)
+
+    from .coingecko_client import CoinGeckoClient
+
+    index = SymbolIndex.build(CoinGeckoClient(), rank_pages=args.rank_pages)
+    index.save(args.output)
+    print(f"Wrote {len(index)} coins to {args.output}")
+
+if __name__ == "__main__":
+    main()
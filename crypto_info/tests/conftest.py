@@ -0,0 +1,23 @@
+"""
+Shared test helpers for crypto_info.
+"""
+import pytest
+
+class FakeClock:
+    """Manually advanced clock whose sleep advances time."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def fake_clock():
+    """Clock starting at 0 for components taking clock= (and sleep=) arguments."""
+    return FakeClock()
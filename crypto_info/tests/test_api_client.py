@@ -1,12 +1,19 @@
 """
 Tests for the APIClient class.
 """
+import time
 import pytest
 from unittest.mock import Mock, patch
 import requests
 from requests.exceptions import Timeout, HTTPError, RequestException
 
 from crypto_info.api_client import APIClient
+from crypto_info.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED
+from crypto_info.deadline import DeadlineExceeded, deadline
+from crypto_info.decoders import get_decoder
+from crypto_info.metrics import InMemorySink
+from crypto_info.rate_limit import RetryPolicy, RetryBudget
+from crypto_info.singleflight import SingleFlight
 
 class TestAPIClient:
     """Test cases for the APIClient class."""
@@ -83,3 +90,285 @@ class TestAPIClient:
         # Execute and verify
         with pytest.raises(ValueError):
             self.client._make_request("/test-endpoint")
+    
+    def _response(self, status_code, json_data=None, headers=None):
+        """Build a mock response with the given status."""
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.json.return_value = json_data
+        if status_code >= 400:
+            response.raise_for_status.side_effect = HTTPError(f"{status_code} Error", response=response)
+        else:
+            response.raise_for_status.return_value = None
+        return response
+    
+    @patch('crypto_info.api_client.time.sleep')
+    @patch('requests.Session.request')
+    def test_make_request_retries_429_with_retry_after(self, mock_request, mock_sleep):
+        """Test that a 429 is retried after the Retry-After delay."""
+        # Setup mocks
+        self.client.retry_policy = RetryPolicy(max_retries=2, backoff_base=0)
+        self.client.rate_limiter = Mock()
+        mock_request.side_effect = [
+            self._response(429, {"error": "rate limited"}, {"Retry-After": "2"}),
+            self._response(200, {"data": "ok"})
+        ]
+        
+        # Execute
+        result = self.client._make_request("/test-endpoint")
+        
+        # Verify
+        assert result == {"data": "ok"}
+        assert mock_request.call_count == 2
+        mock_sleep.assert_called_once_with(2)
+        self.client.rate_limiter.penalize.assert_called_once_with(2)
+        assert self.client.rate_limiter.acquire.call_count == 2
+    
+    @patch('crypto_info.api_client.time.sleep')
+    @patch('requests.Session.request')
+    def test_make_request_retries_timeouts_until_max(self, mock_request, mock_sleep):
+        """Test that timeouts are retried up to max_retries."""
+        # Setup mocks
+        self.client.retry_policy = RetryPolicy(max_retries=2)
+        mock_request.side_effect = Timeout("Request timed out")
+        
+        # Execute and verify
+        with pytest.raises(Timeout):
+            self.client._make_request("/test-endpoint")
+        assert mock_request.call_count == 3
+        assert mock_sleep.call_count == 2
+    
+    @patch('crypto_info.api_client.time.sleep')
+    @patch('requests.Session.request')
+    def test_make_request_no_retry_for_client_errors(self, mock_request, mock_sleep):
+        """Test that non-retryable statuses are raised immediately."""
+        # Setup mocks
+        self.client.retry_policy = RetryPolicy(max_retries=2)
+        mock_request.return_value = self._response(404, {"error": "Not found"})
+        
+        # Execute and verify
+        with pytest.raises(HTTPError):
+            self.client._make_request("/test-endpoint")
+        mock_request.assert_called_once()
+        mock_sleep.assert_not_called()
+    
+    @patch('crypto_info.api_client.time.sleep')
+    @patch('requests.Session.request')
+    def test_make_request_retry_budget_exhausted(self, mock_request, mock_sleep):
+        """Test that retries stop when the budget is empty."""
+        # Setup mocks
+        self.client.retry_policy = RetryPolicy(max_retries=5, budget=RetryBudget(ratio=0, min_tokens=1))
+        mock_request.return_value = self._response(503, {"error": "unavailable"})
+        
+        # Execute and verify
+        with pytest.raises(HTTPError):
+            self.client._make_request("/test-endpoint")
+        assert mock_request.call_count == 2
+    
+    @patch('requests.Session.request')
+    def test_make_request_single_flight(self, mock_request):
+        """Test that GET requests go through the single-flight group by URL and params."""
+        # Setup mocks
+        self.client.single_flight = Mock(wraps=SingleFlight())
+        mock_request.return_value = self._response(200, {"data": "ok"})
+        
+        # Execute
+        result = self.client._make_request("/test-endpoint", params={"b": "2", "a": "1"})
+        
+        # Verify
+        assert result == {"data": "ok"}
+        args, kwargs = self.client.single_flight.do.call_args
+        assert args[0] == ("https://test-api.com/test-endpoint", (("a", "1"), ("b", "2")), ())
+    
+    @patch('requests.Session.request')
+    def test_make_request_custom_decoder(self, mock_request):
+        """Test decoding the raw body with a pluggable decoder."""
+        # Setup mocks
+        self.client.json_decoder = Mock(wraps=get_decoder("json"))
+        mock_response = self._response(200)
+        mock_response.content = b'{"data": "test_data"}'
+        mock_request.return_value = mock_response
+        
+        # Execute
+        result = self.client._make_request("/test-endpoint")
+        
+        # Verify
+        assert result == {"data": "test_data"}
+        self.client.json_decoder.assert_called_once_with(b'{"data": "test_data"}')
+        mock_response.json.assert_not_called()
+    
+    @patch('requests.Session.request')
+    def test_stream_json_array(self, mock_request):
+        """Test streaming the elements of a list response."""
+        # Setup mocks
+        mock_response = self._response(200)
+        mock_response.__enter__ = Mock(return_value=mock_response)
+        mock_response.__exit__ = Mock(return_value=False)
+        mock_response.iter_content.return_value = iter([b'[{"id": "bit', b'coin"}, {"id": "ethereum"}]'])
+        mock_request.return_value = mock_response
+        
+        # Execute
+        result = list(self.client._stream_json_array("/coins/list"))
+        
+        # Verify
+        assert result == [{"id": "bitcoin"}, {"id": "ethereum"}]
+        args, kwargs = mock_request.call_args
+        assert kwargs["stream"] is True
+    
+    @patch('crypto_info.api_client.time.sleep')
+    @patch('requests.Session.request')
+    def test_make_request_metrics(self, mock_request, mock_sleep):
+        """Test that latency, bytes, decode time and retries are recorded."""
+        # Setup mocks
+        self.client.metrics = InMemorySink()
+        self.client.retry_policy = RetryPolicy(max_retries=1, backoff_base=0)
+        throttled = self._response(429, {"error": "rate limited"}, {"Retry-After": "0"})
+        throttled.content = b'{"error": "rate limited"}'
+        ok = self._response(200, {"data": "ok"})
+        ok.content = b'{"data": "ok"}'
+        mock_request.side_effect = [throttled, ok]
+        
+        # Execute
+        result = self.client._make_request("/test-endpoint")
+        
+        # Verify
+        metrics = self.client.metrics
+        assert result == {"data": "ok"}
+        assert metrics.histogram("crypto_info_request_seconds", endpoint="/test-endpoint", status="429")["count"] == 1
+        assert metrics.histogram("crypto_info_request_seconds", endpoint="/test-endpoint", status="200")["count"] == 1
+        assert metrics.histogram("crypto_info_decode_seconds", endpoint="/test-endpoint")["count"] == 1
+        assert metrics.counter("crypto_info_response_bytes_total", endpoint="/test-endpoint") == 39
+        assert metrics.counter("crypto_info_retries_total", endpoint="/test-endpoint", reason="429") == 1
+    
+    @patch('requests.Session.request')
+    def test_make_request_metrics_timeout(self, mock_request):
+        """Test that timeouts are recorded with a timeout status."""
+        # Setup mocks
+        self.client.metrics = InMemorySink()
+        mock_request.side_effect = Timeout("Request timed out")
+        
+        # Execute and verify
+        with pytest.raises(Timeout):
+            self.client._make_request("/test-endpoint")
+        assert self.client.metrics.histogram(
+            "crypto_info_request_seconds", endpoint="/test-endpoint", status="timeout"
+        )["count"] == 1
+    
+    @patch('requests.Session.request')
+    def test_connect_and_endpoint_timeouts(self, mock_request):
+        """Test that connect and per-endpoint read timeouts are passed to requests."""
+        # Setup mocks
+        self.client.connect_timeout = 3
+        self.client.endpoint_timeouts = {"/fast": 5}
+        mock_request.return_value = self._response(200, {"data": "ok"})
+        
+        # Execute
+        self.client._make_request("/fast")
+        self.client._make_request("/slow")
+        
+        # Verify
+        assert mock_request.call_args_list[0][1]["timeout"] == (3, 5)
+        assert mock_request.call_args_list[1][1]["timeout"] == (3, 30)
+    
+    @patch('requests.Session.request')
+    def test_deadline_caps_timeout(self, mock_request):
+        """Test that the request timeout is capped at the time left before the deadline."""
+        # Setup mocks
+        mock_request.return_value = self._response(200, {"data": "ok"})
+        
+        # Execute
+        with deadline(2):
+            self.client._make_request("/test-endpoint")
+        
+        # Verify
+        timeout = mock_request.call_args[1]["timeout"]
+        assert 1.5 < timeout <= 2
+    
+    @patch('requests.Session.request')
+    def test_deadline_exceeded_before_request(self, mock_request):
+        """Test that no request is sent once the deadline has passed."""
+        # Execute and verify
+        with deadline(0):
+            with pytest.raises(DeadlineExceeded):
+                self.client._make_request("/test-endpoint")
+        mock_request.assert_not_called()
+    
+    @patch('requests.Session.request')
+    def test_deadline_exceeded_during_request(self, mock_request):
+        """Test that a timeout cut short by the deadline is reported as DeadlineExceeded."""
+        # Setup mocks
+        def slow(**kwargs):
+            time.sleep(kwargs["timeout"])
+            raise Timeout("Request timed out")
+        mock_request.side_effect = slow
+        self.client.circuit_breaker = CircuitBreaker(failure_threshold=1)
+        
+        # Execute and verify
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                self.client._make_request("/test-endpoint")
+        assert self.client.circuit_breaker.state == CLOSED
+    
+    @patch('crypto_info.api_client.time.sleep')
+    @patch('requests.Session.request')
+    def test_no_retry_past_deadline(self, mock_request, mock_sleep):
+        """Test that a retry that cannot finish before the deadline is not attempted."""
+        # Setup mocks
+        self.client.retry_policy = RetryPolicy(max_retries=2, backoff_base=0)
+        mock_request.return_value = self._response(503, {"error": "unavailable"}, {"Retry-After": "10"})
+        
+        # Execute and verify
+        with deadline(1):
+            with pytest.raises(HTTPError):
+                self.client._make_request("/test-endpoint")
+        mock_request.assert_called_once()
+        mock_sleep.assert_not_called()
+    
+    @patch('requests.Session.request')
+    def test_circuit_breaker_fails_fast(self, mock_request):
+        """Test that an open breaker fails requests without sending them."""
+        # Setup mocks
+        self.client.circuit_breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        self.client.rate_limiter = Mock()
+        mock_request.return_value = self._response(500, {"error": "down"})
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                self.client._make_request("/test-endpoint")
+        
+        # Execute and verify
+        with pytest.raises(CircuitOpenError):
+            self.client._make_request("/test-endpoint")
+        assert mock_request.call_count == 2
+        assert self.client.rate_limiter.acquire.call_count == 2
+    
+    @patch('requests.Session.request')
+    def test_circuit_breaker_half_open_recovers(self, mock_request):
+        """Test that a successful probe after the reset timeout closes the breaker."""
+        # Setup mocks
+        clock = Mock(return_value=0.0)
+        self.client.circuit_breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+        mock_request.side_effect = [self._response(500, {"error": "down"}), self._response(200, {"data": "ok"})]
+        with pytest.raises(HTTPError):
+            self.client._make_request("/test-endpoint")
+        
+        # Execute
+        clock.return_value = 10.0
+        result = self.client._make_request("/test-endpoint")
+        
+        # Verify
+        assert result == {"data": "ok"}
+        assert self.client.circuit_breaker.state == CLOSED
+    
+    @patch('requests.Session.request')
+    def test_client_errors_do_not_open_breaker(self, mock_request):
+        """Test that 404 responses leave the breaker closed."""
+        # Setup mocks
+        self.client.circuit_breaker = CircuitBreaker("test", failure_threshold=1)
+        mock_request.return_value = self._response(404, {"error": "Not found"})
+        
+        # Execute and verify
+        for _ in range(3):
+            with pytest.raises(HTTPError):
+                self.client._make_request("/test-endpoint")
+        assert mock_request.call_count == 3
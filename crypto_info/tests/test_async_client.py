@@ -0,0 +1,181 @@
+"""
+Tests for the AsyncAPIClient and AsyncCoinGeckoClient classes.
+"""
+import asyncio
+import gc
+import http.server
+import json
+import threading
+import warnings
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from crypto_info.async_client import AsyncAPIClient, AsyncCoinGeckoClient
+
+def _serve_path():
+    """Start a local HTTP server answering every GET with the requested path as JSON."""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+class TestAsyncAPIClient:
+    """Test cases for the AsyncAPIClient class."""
+    
+    def test_make_request_against_local_server(self):
+        """Test a request against a local aiohttp server."""
+        web = pytest.importorskip("aiohttp.web")
+        
+        async def handler(request):
+            if request.path == "/missing":
+                return web.json_response({"error": "Not found"}, status=404)
+            return web.json_response({"query": dict(request.query)})
+        
+        async def run():
+            app = web.Application()
+            app.router.add_get("/{tail:.*}", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            
+            try:
+                async with AsyncAPIClient(base_url=f"http://127.0.0.1:{port}") as client:
+                    result = await client._make_request("/test", params={"page": 2, "flag": "true"})
+                    assert result == {"query": {"page": "2", "flag": "true"}}
+                    
+                    import aiohttp
+                    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+                        await client._make_request("/missing")
+                    assert exc_info.value.status == 404
+            finally:
+                await runner.cleanup()
+        
+        asyncio.run(run())
+    
+    def test_make_request_connection_error(self):
+        """Test that network failures raise ConnectionError."""
+        pytest.importorskip("aiohttp")
+        
+        async def run():
+            async with AsyncAPIClient(base_url="http://127.0.0.1:1") as client:
+                with pytest.raises(ConnectionError):
+                    await client._make_request("/test")
+        
+        asyncio.run(run())
+    
+    def test_reused_across_event_loops(self):
+        """Test that one client works from successive asyncio.run calls."""
+        pytest.importorskip("aiohttp")
+        
+        # Setup mocks
+        server = _serve_path()
+        # One request in flight, so the second waits on the semaphore
+        client = AsyncAPIClient(base_url=f"http://127.0.0.1:{server.server_address[1]}", max_concurrency=1)
+        
+        async def request():
+            async with client:
+                return await asyncio.gather(client._make_request("/ping"), client._make_request("/ping"))
+        
+        # Execute
+        try:
+            first = asyncio.run(request())
+            second = asyncio.run(request())
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        # Verify
+        assert first == second == [{"path": "/ping"}] * 2
+    
+    def test_session_of_previous_loop_is_closed(self):
+        """Test that moving to a new event loop does not leak the previous loop's session."""
+        pytest.importorskip("aiohttp")
+        
+        # Setup mocks
+        server = _serve_path()
+        client = AsyncAPIClient(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+        
+        async def request():
+            return await client._make_request("/ping")
+        
+        async def close():
+            await client.close()
+        
+        # Execute
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                asyncio.run(request())
+                first_session = client._session
+                asyncio.run(request())
+                asyncio.run(close())
+                del first_session
+                gc.collect()
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        # Verify
+        assert not [w for w in caught if "Unclosed" in str(w.message)]
+
+class TestAsyncCoinGeckoClient:
+    """Test cases for the AsyncCoinGeckoClient class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = AsyncCoinGeckoClient()
+    
+    @patch('crypto_info.async_client.AsyncAPIClient._make_request', new_callable=AsyncMock)
+    def test_get_coin_price(self, mock_make_request):
+        """Test getting coin price."""
+        # Setup mock
+        mock_make_request.return_value = {"bitcoin": {"usd": 50000}}
+        
+        # Execute
+        result = asyncio.run(self.client.get_coin_price(["bitcoin", "ethereum"], ["usd"]))
+        
+        # Verify
+        assert result == {"bitcoin": {"usd": 50000}}
+        args, kwargs = mock_make_request.call_args
+        assert args[0] == "/simple/price"
+        assert kwargs["params"]["ids"] == "bitcoin,ethereum"
+    
+    @patch('crypto_info.async_client.AsyncAPIClient._make_request', new_callable=AsyncMock)
+    def test_get_coin_by_id(self, mock_make_request):
+        """Test getting coin data by ID."""
+        # Setup mock
+        mock_make_request.return_value = {"id": "bitcoin"}
+        
+        # Execute
+        result = asyncio.run(self.client.get_coin_by_id("bitcoin"))
+        
+        # Verify
+        assert result == {"id": "bitcoin"}
+        args, kwargs = mock_make_request.call_args
+        assert args[0] == "/coins/bitcoin"
+    
+    @patch('crypto_info.async_client.AsyncAPIClient._make_request', new_callable=AsyncMock)
+    def test_search_coins(self, mock_make_request):
+        """Test searching for coins."""
+        # Setup mock
+        mock_make_request.return_value = {"coins": []}
+        
+        # Execute
+        asyncio.run(self.client.search_coins("bitcoin"))
+        
+        # Verify
+        args, kwargs = mock_make_request.call_args
+        assert kwargs["params"]["query"] == "bitcoin"
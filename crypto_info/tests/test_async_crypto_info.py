@@ -0,0 +1,131 @@
+"""
+Tests for the AsyncCryptoInfo class.
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from crypto_info.async_crypto_info import AsyncCryptoInfo
+from crypto_info.symbol_index import SymbolIndex
+
+class TestAsyncCryptoInfo:
+    """Test cases for the AsyncCryptoInfo class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_api_client = Mock()
+        self.mock_api_client.search_coins = AsyncMock()
+        self.mock_api_client.get_coin_price = AsyncMock()
+        self.mock_api_client.get_coin_by_id = AsyncMock()
+        self.crypto_info = AsyncCryptoInfo(
+            api_client=self.mock_api_client,
+            symbol_index=SymbolIndex.from_coins([
+                {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+                {"id": "ethereum", "symbol": "eth", "name": "Ethereum"}
+            ])
+        )
+    
+    def test_get_coin_id_search(self):
+        """Test resolving a symbol missing from the index."""
+        # Setup mock
+        self.mock_api_client.search_coins.return_value = {"coins": [{"id": "raydium", "symbol": "ray"}]}
+        
+        # Execute
+        result = asyncio.run(self.crypto_info._get_coin_id("RAY"))
+        
+        # Verify
+        assert result == "raydium"
+        self.mock_api_client.search_coins.assert_awaited_once_with("ray")
+    
+    def test_get_price(self):
+        """Test getting cryptocurrency price."""
+        # Setup mock
+        self.mock_api_client.get_coin_price.return_value = {"bitcoin": {"usd": 50000}}
+        
+        # Execute
+        result = asyncio.run(self.crypto_info.get_price("BTC", ["usd"]))
+        
+        # Verify
+        assert result == {"usd": 50000}
+        self.mock_api_client.search_coins.assert_not_awaited()
+    
+    def test_get_price_missing(self):
+        """Test getting a price missing from the response."""
+        # Setup mock
+        self.mock_api_client.get_coin_price.return_value = {}
+        
+        # Execute and verify
+        with pytest.raises(ValueError):
+            asyncio.run(self.crypto_info.get_price("BTC"))
+    
+    def test_get_crypto_info(self):
+        """Test getting cryptocurrency information."""
+        # Setup mock
+        self.mock_api_client.get_coin_by_id.return_value = {
+            "id": "bitcoin",
+            "symbol": "btc",
+            "market_data": {"current_price": {"usd": 50000}}
+        }
+        
+        # Execute
+        result = asyncio.run(self.crypto_info.get_crypto_info("BTC"))
+        
+        # Verify
+        assert result["symbol"] == "BTC"
+        assert result["current_price"] == {"usd": 50000}
+    
+    def test_get_prices(self):
+        """Test batched prices with per-symbol errors."""
+        # Setup mocks
+        self.mock_api_client.search_coins.return_value = {"coins": []}
+        self.mock_api_client.get_coin_price.return_value = {
+            "bitcoin": {"usd": 50000},
+            "ethereum": {"usd": 3000}
+        }
+        
+        # Execute
+        result = asyncio.run(self.crypto_info.get_prices(["BTC", "XYZ", "ETH"], ["usd"]))
+        
+        # Verify
+        self.mock_api_client.get_coin_price.assert_awaited_once()
+        assert result["BTC"] == {"usd": 50000}
+        assert result["ETH"] == {"usd": 3000}
+        assert "error" in result["XYZ"]
+    
+    def test_get_crypto_info_many(self):
+        """Test concurrent detailed lookups."""
+        # Setup mock
+        self.mock_api_client.get_coin_by_id.side_effect = [
+            {"id": "bitcoin", "symbol": "btc"},
+            Exception("404 Client Error")
+        ]
+        
+        # Execute
+        result = asyncio.run(self.crypto_info.get_crypto_info_many(["BTC", "ETH"]))
+        
+        # Verify
+        assert result["BTC"]["id"] == "bitcoin"
+        assert "error" in result["ETH"]
+    
+    def test_index_loaded_off_the_event_loop(self, tmp_path):
+        """Test that the symbol index file is read in an executor thread."""
+        # Setup mocks
+        path = str(tmp_path / "index.json.gz")
+        SymbolIndex.from_coins([{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"}]).save(path)
+        index = SymbolIndex(path)
+        load_threads = []
+        original_load = index.load
+        
+        def load():
+            load_threads.append(threading.current_thread())
+            return original_load()
+        index.load = load
+        crypto_info = AsyncCryptoInfo(api_client=self.mock_api_client, symbol_index=index)
+        
+        # Execute
+        result = asyncio.run(crypto_info._get_coin_id("BTC"))
+        
+        # Verify
+        assert result == "bitcoin"
+        assert load_threads and load_threads[0] is not threading.main_thread()
@@ -0,0 +1,158 @@
+"""
+Tests for the ResponseCache class.
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.cache import ResponseCache, FRESH, STALE, MISS
+from crypto_info.metrics import InMemorySink
+from crypto_info.tests.conftest import FakeClock
+
+class TestResponseCache:
+    """Test cases for the ResponseCache class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_entries=2, ttls={'price': 10}, stale_ttl=5, clock=self.clock)
+    
+    def test_fresh_stale_and_expired(self):
+        """Test entry states over time."""
+        self.cache.set("btc", 1, "price")
+        
+        assert self.cache.get("btc") == (FRESH, 1)
+        
+        self.clock.now = 12
+        assert self.cache.get("btc") == (STALE, 1)
+        
+        self.clock.now = 16
+        assert self.cache.get("btc") == (MISS, None)
+        assert len(self.cache) == 0
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        self.cache.set("a", 1, "price")
+        self.cache.set("b", 2, "price")
+        self.cache.get("a")
+        self.cache.set("c", 3, "price")
+        
+        assert self.cache.get("b") == (MISS, None)
+        assert self.cache.get("a") == (FRESH, 1)
+        assert self.cache.stats["evictions"] == 1
+    
+    def test_get_or_load_miss_then_hit(self):
+        """Test that a miss loads and a hit does not."""
+        loader = Mock(return_value={"usd": 1})
+        
+        assert self.cache.get_or_load("btc", "price", loader) == {"usd": 1}
+        assert self.cache.get_or_load("btc", "price", loader) == {"usd": 1}
+        
+        loader.assert_called_once()
+        stats = self.cache.stats
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["size"] == 1
+    
+    def test_get_or_load_stale_refreshes_in_background(self):
+        """Test stale-while-revalidate."""
+        self.cache.set("btc", "old", "price")
+        self.clock.now = 12
+        refreshed = threading.Event()
+        
+        def loader():
+            refreshed.set()
+            return "new"
+        
+        # The stale value is served immediately
+        assert self.cache.get_or_load("btc", "price", loader) == "old"
+        assert refreshed.wait(5)
+        self.cache._executor.shutdown(wait=True)
+        
+        assert self.cache.get("btc") == (FRESH, "new")
+        assert self.cache.stats["stale_hits"] == 1
+    
+    def test_refresh_many_single_flight(self):
+        """Test that a key is refreshed by one background call at a time."""
+        release = threading.Event()
+        
+        def loader():
+            release.wait(5)
+            return {"btc": "new"}
+        
+        future = self.cache.refresh_many(["btc"], "price", loader)
+        assert self.cache.refresh_many(["btc"], "price", loader) is None
+        
+        release.set()
+        future.result(timeout=5)
+        assert self.cache.get("btc") == (FRESH, "new")
+        assert self.cache.stats["refreshes"] == 1
+    
+    def test_refresh_error_keeps_entry(self):
+        """Test that a failed refresh keeps the stale entry."""
+        self.cache.set("btc", "old", "price")
+        self.clock.now = 12
+        
+        future = self.cache.refresh_many(["btc"], "price", Mock(side_effect=Exception("boom")))
+        future.result(timeout=5)
+        
+        assert self.cache.get("btc") == (STALE, "old")
+        assert self.cache.stats["refresh_errors"] == 1
+    
+    def test_metrics(self):
+        """Test that lookups are counted by result."""
+        self.cache.metrics = InMemorySink()
+        self.cache.get("btc")
+        self.cache.set("btc", 1, "price")
+        self.cache.get("btc")
+        self.clock.now = 12
+        self.cache.get("btc")
+        
+        assert self.cache.metrics.counter("crypto_info_cache_lookups_total", result=MISS) == 1
+        assert self.cache.metrics.counter("crypto_info_cache_lookups_total", result=FRESH) == 1
+        assert self.cache.metrics.counter("crypto_info_cache_lookups_total", result=STALE) == 1
+
+class TestStaleIfError:
+    """Test cases for serving expired entries when loading fails."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttls={'coin': 10}, stale_ttl=5, stale_if_error=60, clock=self.clock)
+    
+    def test_serves_expired_entry_on_error(self):
+        """Test that an expired entry is served when the loader fails."""
+        self.cache.set("btc", {"id": "bitcoin"}, "coin")
+        self.clock.now = 20
+        
+        value = self.cache.get_or_load("btc", "coin", Mock(side_effect=ConnectionError("down")))
+        
+        assert value == {"id": "bitcoin"}
+        assert self.cache.stats["errors_served_stale"] == 1
+    
+    def test_reloads_expired_entry(self):
+        """Test that an expired entry is replaced when the loader succeeds."""
+        self.cache.set("btc", 1, "coin")
+        self.clock.now = 20
+        
+        assert self.cache.get("btc") == (MISS, None)
+        assert self.cache.get_or_load("btc", "coin", Mock(return_value=2)) == 2
+        assert self.cache.get("btc") == (FRESH, 2)
+    
+    def test_error_window_ends(self):
+        """Test that the error is raised once the entry is past the stale_if_error window."""
+        self.cache.set("btc", 1, "coin")
+        self.clock.now = 75
+        
+        with pytest.raises(ConnectionError):
+            self.cache.get_or_load("btc", "coin", Mock(side_effect=ConnectionError("down")))
+        assert self.cache.get_if_error("btc") == (MISS, None)
+    
+    def test_disabled_by_default(self, fake_clock):
+        """Test that expired entries are dropped without stale_if_error."""
+        cache = ResponseCache(ttls={'coin': 10}, stale_ttl=5, clock=fake_clock)
+        cache.set("btc", 1, "coin")
+        fake_clock.now = 20
+        
+        assert cache.get("btc") == (MISS, None)
+        assert len(cache) == 0
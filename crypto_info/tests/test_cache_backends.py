@@ -0,0 +1,288 @@
+"""
+Tests for the response cache backends.
+"""
+import socket
+import socketserver
+import threading
+import time
+import pytest
+
+from crypto_info.cache import ResponseCache, FRESH, STALE, MISS
+from crypto_info.cache_backends import MemoryBackend, SQLiteBackend, RedisBackend, encode_key
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Handler speaking enough RESP2 for RedisBackend."""
+
+    def handle(self):
+        server = self.server
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            server.commands.append(args)
+            self.wfile.write(server.execute(args[0].upper().decode(), args[1:]))
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """In-memory stand-in for a Redis server on a local port."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(('127.0.0.1', 0), FakeRedisHandler)
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    @staticmethod
+    def bulk(value):
+        if value is None:
+            return b'$-1\r\n'
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def _get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and time.time() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, command, args):
+        with self.lock:
+            if command == 'AUTH':
+                return b'+OK\r\n' if args[0].decode() == self.password else b'-WRONGPASS invalid password\r\n'
+            if command in ('PING', 'SELECT'):
+                return b'+OK\r\n'
+            if command == 'GET':
+                return self.bulk(self._get(args[0]))
+            if command == 'MGET':
+                values = [self.bulk(self._get(key)) for key in args]
+                return b'*%d\r\n' % len(values) + b''.join(values)
+            if command == 'SET':
+                expires_at = None
+                if len(args) > 3 and args[2].upper() == b'PX':
+                    expires_at = time.time() + int(args[3]) / 1000.0
+                self.data[args[0]] = (args[1], expires_at)
+                return b'+OK\r\n'
+            if command == 'DEL':
+                deleted = sum(self.data.pop(key, None) is not None for key in args)
+                return b':%d\r\n' % deleted
+            if command == 'SCAN':
+                prefix = args[2][:-1]
+                keys = [self.bulk(key) for key in list(self.data) if key.startswith(prefix) and self._get(key)]
+                return b'*2\r\n' + self.bulk(b'0') + b'*%d\r\n' % len(keys) + b''.join(keys)
+            return b'-ERR unknown command\r\n'
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedisServer()
+    yield server
+    server.close()
+
+def make_backend(kind, tmp_path, redis_server):
+    if kind == 'sqlite':
+        return SQLiteBackend(str(tmp_path / 'cache' / 'crypto_info.db'))
+    return RedisBackend(port=redis_server.port)
+
+class TestEncodeKey:
+    """Test cases for cache key encoding."""
+
+    def test_strings_and_tuples(self):
+        """Test that string keys are kept and tuple keys become JSON arrays."""
+        assert encode_key('btc') == 'btc'
+        assert encode_key(('price', 'bitcoin', ('eur', 'usd'))) == '["price","bitcoin",["eur","usd"]]'
+
+class TestMemoryBackend:
+    """Test cases for the in-process backend."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        backend = MemoryBackend(max_entries=2)
+        backend.set('a', (1, 10, 20), 20)
+        backend.set('b', (2, 10, 20), 20)
+        backend.get('a')
+        backend.set('c', (3, 10, 20), 20)
+
+        assert backend.get('b') is None
+        assert backend.get_many(['a', 'c']) == [(1, 10, 20), (3, 10, 20)]
+        assert backend.evictions == 1
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+class TestSharedBackends:
+    """Test cases common to the SQLite and Redis backends."""
+
+    def test_round_trip(self, kind, tmp_path, redis_server):
+        """Test that entries are serialized and read back."""
+        backend = make_backend(kind, tmp_path, redis_server)
+        key = ('price', 'bitcoin', ('usd',))
+
+        # Execute
+        backend.set(key, ({'usd': 50000.5}, 100.0, 160.0), 60)
+
+        # Verify
+        assert backend.get(key) == ({'usd': 50000.5}, 100.0, 160.0)
+        assert backend.get_many([key, 'missing']) == [({'usd': 50000.5}, 100.0, 160.0), None]
+        assert len(backend) == 1
+
+        backend.delete(key)
+        assert backend.get(key) is None
+
+    def test_entries_expire_after_retention(self, kind, tmp_path, redis_server):
+        """Test that the backend drops entries once their retention has passed."""
+        backend = make_backend(kind, tmp_path, redis_server)
+        backend.set('short', ('a', 0.0, 0.0), 0.05)
+        backend.set('long', ('b', 0.0, 0.0), 60)
+
+        time.sleep(0.1)
+
+        assert backend.get('short') is None
+        assert backend.get('long') == ('b', 0.0, 0.0)
+
+    def test_clear(self, kind, tmp_path, redis_server):
+        """Test that clear removes every entry."""
+        backend = make_backend(kind, tmp_path, redis_server)
+        backend.set('a', (1, 0.0, 0.0), 60)
+        backend.set('b', (2, 0.0, 0.0), 60)
+
+        backend.clear()
+
+        assert backend.get_many(['a', 'b']) == [None, None]
+        assert len(backend) == 0
+
+    def test_caches_share_entries(self, kind, tmp_path, redis_server):
+        """Test that two caches on the same storage, as in two processes, see each other's entries."""
+        # Setup mocks
+        writer = ResponseCache(ttls={'price': 30}, stale_ttl=30,
+                               backend=make_backend(kind, tmp_path, redis_server))
+        reader = ResponseCache(ttls={'price': 30}, stale_ttl=30,
+                               backend=make_backend(kind, tmp_path, redis_server))
+
+        # Execute
+        writer.set(('price', 'bitcoin'), {'usd': 50000}, 'price')
+
+        # Verify
+        assert reader.get(('price', 'bitcoin')) == (FRESH, {'usd': 50000})
+        assert reader.get_many([('price', 'bitcoin'), ('price', 'ethereum')]) == [
+            (FRESH, {'usd': 50000}), (MISS, None)
+        ]
+
+    def test_shared_backend_uses_wall_clock(self, kind, tmp_path, redis_server):
+        """Test that entry deadlines are comparable between processes."""
+        cache = ResponseCache(ttls={'price': 30}, backend=make_backend(kind, tmp_path, redis_server))
+
+        cache.set('btc', 1, 'price')
+
+        _, fresh_until, _ = cache.backend.get('btc')
+        assert fresh_until == pytest.approx(time.time() + 30, abs=5)
+
+class TestSQLiteBackend:
+    """Test cases specific to the SQLite backend."""
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test that unreadable entries are ignored."""
+        backend = SQLiteBackend(str(tmp_path / 'cache.db'))
+        backend._connection().execute("INSERT INTO cache VALUES ('btc', x'0102', ?)", (time.time() + 60,))
+
+        assert backend.get('btc') is None
+
+    def test_threads_use_own_connections(self, tmp_path):
+        """Test that the backend can be used from several threads."""
+        backend = SQLiteBackend(str(tmp_path / 'cache.db'))
+
+        def worker(i):
+            backend.set(f'coin-{i}', (i, 0.0, 0.0), 60)
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(backend) == 8
+        backend.close()
+
+class TestRedisBackend:
+    """Test cases specific to the Redis backend."""
+
+    def test_from_url(self):
+        """Test that connection settings are read from a URL."""
+        backend = RedisBackend.from_url('redis://:s%40cret@cache.internal:6380/2', prefix='app:')
+
+        assert (backend.host, backend.port, backend.db) == ('cache.internal', 6380, 2)
+        assert backend.password == 's@cret'
+        assert backend.prefix == 'app:'
+
+        with pytest.raises(ValueError):
+            RedisBackend.from_url('memcached://localhost')
+
+    def test_sends_auth_and_reuses_connection(self):
+        """Test that a connection is authenticated once and pooled."""
+        server = FakeRedisServer(password='secret')
+        try:
+            backend = RedisBackend(port=server.port, password='secret')
+
+            backend.set('btc', (1, 0.0, 0.0), 60)
+            backend.get('btc')
+
+            assert [command[0] for command in server.commands] == [b'AUTH', b'SET', b'GET']
+            assert server.commands[1][1] == b'crypto_info:btc'
+            assert server.commands[1][3:] == [b'PX', b'60000']
+        finally:
+            server.close()
+
+    def test_clear_only_removes_prefixed_keys(self, redis_server):
+        """Test that clear leaves other applications' keys alone."""
+        backend = RedisBackend(port=redis_server.port)
+        redis_server.data[b'other:key'] = (b'value', None)
+        backend.set('btc', (1, 0.0, 0.0), 60)
+
+        backend.clear()
+
+        assert list(redis_server.data) == [b'other:key']
+
+    def test_unavailable_server_is_a_miss(self):
+        """Test that connection failures do not fail lookups."""
+        # Reserve a port nothing listens on
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        cache = ResponseCache(backend=RedisBackend(port=port, socket_timeout=0.5))
+
+        cache.set('btc', 1, 'price')
+
+        assert cache.get('btc') == (MISS, None)
+        assert cache.get_many(['btc', 'eth']) == [(MISS, None), (MISS, None)]
+
+    def test_reconnects_after_server_restart(self, redis_server):
+        """Test that a pooled connection closed by the server is replaced."""
+        backend = RedisBackend(port=redis_server.port)
+        backend.set('btc', (1, 0.0, 0.0), 60)
+        # Simulate the server dropping idle connections
+        for connection in backend._idle:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+
+        assert backend.get('btc') == (1, 0.0, 0.0)
+
+    def test_stale_entries_are_served(self, redis_server):
+        """Test that an expired entry is still served stale from the shared backend."""
+        now = [1000.0]
+        cache = ResponseCache(ttls={'price': 10}, stale_ttl=60,
+                              backend=RedisBackend(port=redis_server.port), clock=lambda: now[0])
+        cache.set('btc', 1, 'price')
+
+        now[0] += 20
+
+        assert cache.get('btc') == (STALE, 1)
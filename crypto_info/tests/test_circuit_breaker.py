@@ -0,0 +1,147 @@
+"""
+Tests for the circuit breaker.
+"""
+import pytest
+from unittest.mock import Mock
+from requests.exceptions import HTTPError, Timeout
+
+from crypto_info.circuit_breaker import (
+    CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN, is_failure
+)
+from crypto_info.deadline import DeadlineExceeded
+from crypto_info.tests.conftest import FakeClock
+
+def _http_error(status_code):
+    return HTTPError("error", response=Mock(status_code=status_code))
+
+class TestCircuitBreaker:
+    """Test cases for the CircuitBreaker class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=self.clock)
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the breaker opens only after the threshold of failures in a row."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        assert self.breaker.state == CLOSED
+        
+        self.breaker.record_failure()
+        
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow_request()
+        assert self.breaker.retry_after() == pytest.approx(10)
+    
+    def test_half_open_probe_closes(self):
+        """Test that a successful probe after the reset timeout closes the breaker."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        
+        assert self.breaker.state == HALF_OPEN
+        assert self.breaker.allow_request()
+        assert not self.breaker.allow_request()
+        
+        self.breaker.record_success()
+        assert self.breaker.state == CLOSED
+        assert self.breaker.allow_request()
+    
+    def test_half_open_probe_failure_reopens(self):
+        """Test that a failed probe reopens the breaker for another reset timeout."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        assert self.breaker.allow_request()
+        
+        self.breaker.record_failure()
+        
+        assert self.breaker.state == OPEN
+        self.clock.now = 19
+        assert self.breaker.state == OPEN
+        self.clock.now = 20
+        assert self.breaker.state == HALF_OPEN
+    
+    def test_call(self):
+        """Test calling through the breaker."""
+        failing = Mock(side_effect=ConnectionError("down"))
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                self.breaker.call(failing)
+        
+        with pytest.raises(CircuitOpenError) as excinfo:
+            self.breaker.call(failing)
+        assert failing.call_count == 3
+        assert excinfo.value.retry_after == pytest.approx(10)
+        
+        self.clock.now = 10
+        assert self.breaker.call(lambda x: x * 2, 21) == 42
+        assert self.breaker.stats == {'state': CLOSED, 'failures': 0}
+    
+    def test_client_errors_do_not_trip(self):
+        """Test that client errors are not counted as failures."""
+        for _ in range(5):
+            with pytest.raises(HTTPError):
+                self.breaker.call(Mock(side_effect=_http_error(404)))
+        
+        assert self.breaker.state == CLOSED
+
+    def test_deadline_cut_probe_stays_half_open(self):
+        """Test that a probe cut short by the caller's deadline neither closes nor reopens the breaker."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+
+        with pytest.raises(DeadlineExceeded):
+            self.breaker.call(Mock(side_effect=DeadlineExceeded("caller out of time")))
+
+        assert self.breaker.stats == {'state': HALF_OPEN, 'failures': 3}
+        assert self.breaker.allow_request()
+        assert not self.breaker.allow_request()
+
+    def test_deadline_does_not_reset_failures(self):
+        """Test that a deadline-cut call does not reset the consecutive failure count."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        self.breaker.record_error(DeadlineExceeded("caller out of time"))
+        self.breaker.record_failure()
+
+        assert self.breaker.state == OPEN
+
+    def test_client_error_response_closes_half_open(self):
+        """Test that a probe answered with a client error shows the upstream is back."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        assert self.breaker.allow_request()
+
+        self.breaker.record_error(_http_error(404))
+
+        assert self.breaker.stats == {'state': CLOSED, 'failures': 0}
+
+    def test_invalid_configuration(self):
+        """Test that a zero failure threshold is rejected."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+
+class TestIsFailure:
+    """Test cases for the is_failure function."""
+    
+    @pytest.mark.parametrize("error,expected", [
+        (_http_error(500), True),
+        (_http_error(429), True),
+        (_http_error(404), False),
+        (Timeout("slow"), True),
+        (ConnectionError("down"), True),
+        (ValueError("bad symbol"), False),
+        (CircuitOpenError("other"), True),
+        (DeadlineExceeded("caller out of time"), False),
+    ])
+    def test_is_failure(self, error, expected):
+        """Test which errors count against an upstream."""
+        assert is_failure(error) is expected
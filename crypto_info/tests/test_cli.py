@@ -0,0 +1,165 @@
+"""
+Tests for the bulk pricing command.
+"""
+import io
+import json
+import threading
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.cli import BulkPricer, main, read_symbols
+
+def fake_get_prices(symbols, vs_currencies):
+    """Price every symbol except 'BAD' at its length."""
+    return {
+        symbol: {'error': f"Unknown symbol '{symbol}'"} if symbol == 'BAD'
+        else {currency: float(len(symbol)) for currency in vs_currencies}
+        for symbol in symbols
+    }
+
+class TestReadSymbols:
+    """Test cases for symbol parsing."""
+
+    def test_separators_comments_and_duplicates(self):
+        """Test that symbols are split, upper-cased and deduplicated."""
+        lines = ["btc, eth\n", "# a comment\n", "sol  btc # trailing\n", "\n"]
+
+        assert list(read_symbols(lines)) == ["BTC", "ETH", "SOL"]
+
+class TestBulkPricer:
+    """Test cases for the BulkPricer class."""
+
+    def test_batches_and_bounded_concurrency(self):
+        """Test that symbols are priced in batches with at most workers in flight."""
+        # Setup mocks
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def get_prices(symbols, vs_currencies):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            try:
+                return fake_get_prices(symbols, vs_currencies)
+            finally:
+                with lock:
+                    in_flight.pop()
+        client = Mock()
+        client.get_prices.side_effect = get_prices
+        pricer = BulkPricer(client, ['usd'], batch_size=3, workers=2)
+
+        # Execute
+        results = dict(pricer.run(f"S{i}" for i in range(10)))
+
+        # Verify
+        assert len(results) == 10
+        assert results["S1"] == {"usd": 2.0}
+        assert client.get_prices.call_count == 4
+        assert max(peak) <= 2
+
+    def test_failed_batch_becomes_errors(self):
+        """Test that a batch raising an error yields an error per symbol."""
+        client = Mock()
+        client.get_prices.side_effect = ConnectionError("down")
+
+        results = dict(BulkPricer(client, ['usd']).run(["BTC", "ETH"]))
+
+        assert results == {"BTC": {"error": "down"}, "ETH": {"error": "down"}}
+
+class TestMain:
+    """Test cases for the command-line entry point."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = Mock()
+        self.client.get_prices.side_effect = fake_get_prices
+
+    def test_ndjson_to_stdout(self, monkeypatch, capsys):
+        """Test NDJSON records for symbols read from stdin."""
+        monkeypatch.setattr('sys.stdin', io.StringIO("btc\neth\nbad\n"))
+
+        # Execute
+        code = main(['-c', 'usd,EUR'], crypto_client=self.client)
+
+        # Verify
+        out, err = capsys.readouterr()
+        records = [json.loads(line) for line in out.splitlines()]
+        assert records[0] == {"symbol": "BTC", "usd": 3.0, "eur": 3.0}
+        assert records[2] == {"symbol": "BAD", "error": "Unknown symbol 'BAD'"}
+        assert code == 1
+        assert "2 priced, 1 failed" in err
+
+    def test_csv_output(self, tmp_path, capsys):
+        """Test CSV output with one column per price field."""
+        path = tmp_path / "symbols.txt"
+        path.write_text("BTC\nBAD\n")
+
+        code = main([str(path), '-f', 'csv', '-q'], crypto_client=self.client)
+
+        out, err = capsys.readouterr()
+        assert out.splitlines() == [
+            "symbol,usd,usd_market_cap,usd_24h_change,error",
+            "BTC,3.0,,,",
+            "BAD,,,,Unknown symbol 'BAD'",
+        ]
+        assert err == ""
+        assert code == 1
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        """Test that a resumed run skips priced symbols and appends to the output."""
+        # Setup mocks
+        checkpoint = tmp_path / "run.ckpt"
+        output = tmp_path / "prices.csv"
+        args = ['-s', 'BTC,ETH,SOL', '-f', 'csv', '-q', '--batch-size', '1',
+                '--checkpoint', str(checkpoint), '--output', str(output)]
+        calls = []
+
+        def interrupted(symbols, vs_currencies):
+            calls.append(symbols)
+            if symbols == ['SOL']:
+                raise KeyboardInterrupt
+            return fake_get_prices(symbols, vs_currencies)
+        self.client.get_prices.side_effect = interrupted
+
+        # Execute
+        first = main(args + ['--workers', '1'], crypto_client=self.client)
+        calls.clear()
+        self.client.get_prices.side_effect = lambda symbols, vs: calls.append(symbols) or fake_get_prices(symbols, vs)
+        second = main(args, crypto_client=self.client)
+
+        # Verify
+        assert first == 130
+        assert second == 0
+        assert calls == [['SOL']]
+        assert checkpoint.read_text().split() == ['BTC', 'ETH', 'SOL']
+        assert output.read_text().splitlines() == [
+            "symbol,usd,usd_market_cap,usd_24h_change,error",
+            "BTC,3.0,,,",
+            "ETH,3.0,,,",
+            "SOL,3.0,,,",
+        ]
+
+    def test_resume_after_failed_symbol(self, tmp_path):
+        """Test that a symbol retried on resume has a single record in the output."""
+        # Setup mocks
+        checkpoint = tmp_path / "run.ckpt"
+        output = tmp_path / "prices.ndjson"
+        args = ['-s', 'BTC,ETH', '-q', '--checkpoint', str(checkpoint), '--output', str(output)]
+        failing = {'ETH'}
+
+        def flaky(symbols, vs_currencies):
+            return {symbol: {'error': 'down'} if symbol in failing else {'usd': 1.0} for symbol in symbols}
+        self.client.get_prices.side_effect = flaky
+
+        # Execute
+        first = main(args, crypto_client=self.client)
+        errors_after_first = (tmp_path / "run.ckpt.errors").read_text()
+        failing.clear()
+        second = main(args, crypto_client=self.client)
+
+        # Verify
+        assert (first, second) == (1, 0)
+        assert json.loads(errors_after_first) == {"symbol": "ETH", "error": "down"}
+        assert [json.loads(line)["symbol"] for line in output.read_text().splitlines()] == ["BTC", "ETH"]
+        assert (tmp_path / "run.ckpt.errors").read_text() == ""
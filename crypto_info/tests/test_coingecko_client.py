@@ -69,3 +69,127 @@ class TestCoinGeckoClient:
         # Verify params
         args, kwargs = mock_make_request.call_args
         assert kwargs["params"]["query"] == "bitcoin"
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_get_coins_markets(self, mock_make_request):
+        """Test getting a page of market data."""
+        # Setup mock
+        mock_make_request.return_value = [{"id": "bitcoin", "market_cap_rank": 1}]
+        
+        # Execute
+        result = self.client.get_coins_markets("usd", ids=["bitcoin", "ethereum"], per_page=250, page=2)
+        
+        # Verify
+        assert result == [{"id": "bitcoin", "market_cap_rank": 1}]
+        args, kwargs = mock_make_request.call_args
+        assert args[0] == "/coins/markets"
+        assert kwargs["params"]["ids"] == "bitcoin,ethereum"
+        assert kwargs["params"]["page"] == 2
+        assert kwargs["params"]["per_page"] == 250
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_ping(self, mock_make_request):
+        """Test checking the API status."""
+        # Setup mock
+        mock_make_request.return_value = {"gecko_says": "(V3) To the Moon!"}
+        
+        # Execute
+        result = self.client.ping()
+        
+        # Verify
+        mock_make_request.assert_called_once_with("/ping")
+        assert "gecko_says" in result
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_iter_markets_stops_at_short_page(self, mock_make_request):
+        """Test paging until a short page."""
+        # Setup mock
+        mock_make_request.side_effect = [
+            [{"id": "bitcoin"}, {"id": "ethereum"}],
+            [{"id": "solana"}]
+        ]
+        
+        # Execute
+        pages = list(self.client.iter_markets("usd", per_page=2))
+        
+        # Verify
+        assert pages == [[{"id": "bitcoin"}, {"id": "ethereum"}], [{"id": "solana"}]]
+        assert [c.kwargs["params"]["page"] for c in mock_make_request.call_args_list] == [1, 2]
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_iter_markets_is_lazy(self, mock_make_request):
+        """Test that pages are only requested when consumed."""
+        # Setup mock
+        mock_make_request.return_value = [{"id": "bitcoin"}, {"id": "ethereum"}]
+        
+        # Execute
+        pages = self.client.iter_markets("usd", per_page=2, max_pages=10)
+        next(pages)
+        pages.close()
+        
+        # Verify
+        mock_make_request.assert_called_once()
+    
+    @patch('crypto_info.api_client.APIClient._stream_json_array')
+    def test_iter_coins_list(self, mock_stream):
+        """Test streaming the coin list."""
+        # Setup mock
+        mock_stream.return_value = iter([{"id": "bitcoin"}])
+        
+        # Execute
+        result = list(self.client.iter_coins_list())
+        
+        # Verify
+        assert result == [{"id": "bitcoin"}]
+        args, kwargs = mock_stream.call_args
+        assert args[0] == "/coins/list"
+    
+    def test_base_url(self):
+        """Test pointing the client at another API root."""
+        client = CoinGeckoClient(base_url="http://127.0.0.1:8080/api/v3")
+        
+        assert client.base_url == "http://127.0.0.1:8080/api/v3"
+        assert CoinGeckoClient().base_url == "https://api.coingecko.com/api/v3"
+    
+    def test_endpoint_label(self):
+        """Test that coin IDs are collapsed in metric labels."""
+        base = self.client.base_url
+        
+        assert self.client._endpoint_label(f"{base}/coins/bitcoin") == "/coins/{id}"
+        assert self.client._endpoint_label(f"{base}/coins/bitcoin/market_chart") == "/coins/{id}/market_chart"
+        assert self.client._endpoint_label(f"{base}/coins/markets") == "/coins/markets"
+        assert self.client._endpoint_label(f"{base}/simple/price") == "/simple/price"
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_get_market_chart_range(self, mock_make_request):
+        """Test getting market chart data between two times."""
+        # Setup mock
+        mock_make_request.return_value = {"prices": [[1000, 1.0]], "market_caps": [], "total_volumes": []}
+        
+        # Execute
+        result = self.client.get_market_chart_range("bitcoin", "usd", 1600000000, 1600086400.5)
+        
+        # Verify
+        mock_make_request.assert_called_once_with(
+            "/coins/bitcoin/market_chart/range",
+            params={"vs_currency": "usd", "from": "1600000000", "to": "1600086400"}
+        )
+        assert result["prices"] == [[1000, 1.0]]
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_get_market_chart_and_ohlc(self, mock_make_request):
+        """Test getting market chart data and OHLC candles for the last days."""
+        # Setup mock
+        mock_make_request.return_value = []
+        
+        # Execute
+        self.client.get_market_chart("bitcoin", "eur", 30, interval="daily")
+        self.client.get_ohlc("bitcoin", "usd", "max")
+        
+        # Verify
+        assert mock_make_request.call_args_list[0].args == ("/coins/bitcoin/market_chart",)
+        assert mock_make_request.call_args_list[0].kwargs["params"] == {
+            "vs_currency": "eur", "days": "30", "interval": "daily"
+        }
+        assert mock_make_request.call_args_list[1].args == ("/coins/bitcoin/ohlc",)
+        assert mock_make_request.call_args_list[1].kwargs["params"] == {"vs_currency": "usd", "days": "max"}
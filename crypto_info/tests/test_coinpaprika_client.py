@@ -0,0 +1,130 @@
+"""
+Tests for the CoinPaprikaClient class.
+"""
+import pytest
+from unittest.mock import Mock, patch
+from requests.exceptions import HTTPError
+
+from crypto_info.coinpaprika_client import CoinPaprikaClient
+
+COINS = [
+    {"id": "btc-bitcoin", "symbol": "BTC", "name": "Bitcoin", "rank": 1, "is_active": True},
+    {"id": "eth-ethereum", "symbol": "ETH", "name": "Ethereum", "rank": 2, "is_active": True},
+    {"id": "xbt-bitcoin", "symbol": "XBT", "name": "Fake Bitcoin", "rank": 0, "is_active": True},
+    {"id": "old-oldcoin", "symbol": "OLD", "name": "Old Coin", "rank": 0, "is_active": False},
+]
+
+def _ticker(paprika_id, price):
+    return {
+        "id": paprika_id,
+        "last_updated": "2024-01-01T00:00:00Z",
+        "quotes": {"USD": {"price": price, "market_cap": price * 100, "volume_24h": price * 10,
+                           "percent_change_24h": 1.5}},
+    }
+
+class TestCoinPaprikaClient:
+    """Test cases for the CoinPaprikaClient class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = CoinPaprikaClient(requests_per_minute=None)
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_paprika_id(self, mock_make_request):
+        """Test translating CoinGecko IDs through the slug map and overrides."""
+        # Setup mock
+        mock_make_request.return_value = COINS
+        self.client.id_map = {"binancecoin": "bnb-binance-coin"}
+        
+        # Execute / Verify
+        assert self.client.paprika_id("bitcoin") == "btc-bitcoin"
+        assert self.client.paprika_id("binancecoin") == "bnb-binance-coin"
+        assert self.client.paprika_id("oldcoin") is None
+        mock_make_request.assert_called_once_with("/coins")
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_get_coin_price(self, mock_make_request):
+        """Test that tickers are normalized to the /simple/price shape."""
+        # Setup mock
+        def respond(endpoint, params=None):
+            if endpoint == "/coins":
+                return COINS
+            if endpoint == "/tickers/btc-bitcoin":
+                return _ticker("btc-bitcoin", 50000)
+            raise AssertionError(endpoint)
+        mock_make_request.side_effect = respond
+        
+        # Execute
+        result = self.client.get_coin_price(["bitcoin", "unknown"], ["usd", "eur"],
+                                            include_market_cap=True, include_24hr_vol=True,
+                                            include_24hr_change=True, include_last_updated_at=True)
+        
+        # Verify
+        assert result == {
+            "bitcoin": {
+                "usd": 50000,
+                "usd_market_cap": 5000000,
+                "usd_24h_vol": 500000,
+                "usd_24h_change": 1.5,
+                "last_updated_at": 1704067200,
+            }
+        }
+        assert mock_make_request.call_args[1]["params"] == {"quotes": "USD,EUR"}
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_get_coin_price_skips_missing_ticker(self, mock_make_request):
+        """Test that a coin without a ticker is left out instead of failing the call."""
+        # Setup mock
+        def respond(endpoint, params=None):
+            if endpoint == "/coins":
+                return COINS
+            if endpoint == "/tickers/eth-ethereum":
+                raise HTTPError("not found", response=Mock(status_code=404))
+            return _ticker("btc-bitcoin", 50000)
+        mock_make_request.side_effect = respond
+        
+        # Execute
+        result = self.client.get_coin_price(["bitcoin", "ethereum"], ["usd"])
+        
+        # Verify
+        assert result == {"bitcoin": {"usd": 50000}}
+    
+    @patch('crypto_info.coinpaprika_client.BULK_TICKERS_THRESHOLD', 1)
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_get_coin_price_bulk(self, mock_make_request):
+        """Test that large batches use a single /tickers request."""
+        # Setup mock
+        def respond(endpoint, params=None):
+            if endpoint == "/coins":
+                return COINS
+            assert endpoint == "/tickers"
+            return [_ticker("btc-bitcoin", 50000), _ticker("eth-ethereum", 3000), _ticker("doge-dogecoin", 0.1)]
+        mock_make_request.side_effect = respond
+        
+        # Execute
+        result = self.client.get_coin_price(["bitcoin", "ethereum"], ["usd"])
+        
+        # Verify
+        assert result == {"bitcoin": {"usd": 50000}, "ethereum": {"usd": 3000}}
+        assert mock_make_request.call_count == 2
+    
+    @patch('crypto_info.api_client.APIClient._make_request')
+    def test_search_coins(self, mock_make_request):
+        """Test that search results are normalized to CoinGecko's /search shape."""
+        # Setup mock
+        mock_make_request.return_value = {
+            "currencies": [{"id": "btc-bitcoin", "symbol": "BTC", "name": "Bitcoin", "rank": 1}]
+        }
+        
+        # Execute
+        result = self.client.search_coins("btc")
+        
+        # Verify
+        assert result == {"coins": [
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "market_cap_rank": 1}
+        ]}
+    
+    def test_endpoint_label(self):
+        """Test that coin IDs are collapsed in metric labels."""
+        url = f"{self.client.base_url}/tickers/btc-bitcoin"
+        assert self.client._endpoint_label(url) == "/tickers/{id}"
@@ -0,0 +1,64 @@
+"""
+Tests for the pooled HTTP sessions.
+"""
+import socket
+from unittest.mock import Mock, patch
+
+from crypto_info.api_client import APIClient
+from crypto_info.coingecko_client import CoinGeckoClient
+from crypto_info.connection import PooledSession, accept_encoding, get_shared_session
+
+class TestPooledSession:
+    """Test cases for the PooledSession class."""
+    
+    def test_pool_size(self):
+        """Test that the adapters use the configured pool size."""
+        session = PooledSession(pool_connections=4, pool_maxsize=64, pool_block=True)
+        adapter = session.get_adapter("https://api.coingecko.com")
+        
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+        assert session.get_adapter("http://127.0.0.1") is adapter
+    
+    def test_tcp_keepalive(self):
+        """Test that pooled sockets enable keep-alive probes."""
+        session = PooledSession()
+        options = session.get_adapter("https://api.coingecko.com").poolmanager.connection_pool_kw["socket_options"]
+        
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+        assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+    
+    def test_compression(self):
+        """Test the Accept-Encoding header."""
+        assert "gzip" in accept_encoding()
+        assert PooledSession().headers["Accept-Encoding"] == accept_encoding()
+        assert PooledSession(compression=False).headers["Accept-Encoding"] == "identity"
+    
+    @patch('crypto_info.connection.time.monotonic')
+    @patch('requests.Session.request')
+    def test_idle_refresh(self, mock_request, mock_monotonic):
+        """Test that idle connections are dropped before the next request."""
+        session = PooledSession(idle_timeout=50)
+        session.refresh = Mock()
+        
+        mock_monotonic.return_value = 0
+        session.request("GET", "https://test-api.com")
+        mock_monotonic.return_value = 30
+        session.request("GET", "https://test-api.com")
+        session.refresh.assert_not_called()
+        
+        mock_monotonic.return_value = 90
+        session.request("GET", "https://test-api.com")
+        session.refresh.assert_called_once_with()
+        assert mock_request.call_count == 3
+    
+    def test_shared_session(self):
+        """Test that clients can share one session."""
+        session = get_shared_session("test-shared")
+        first = CoinGeckoClient(session=session)
+        second = CoinGeckoClient(session=get_shared_session("test-shared"))
+        
+        assert first.session is second.session
+        assert CoinGeckoClient().session is not first.session
+        assert isinstance(APIClient(base_url="https://test-api.com").session, PooledSession)
@@ -1,10 +1,17 @@
 """
 Tests for the CryptoInfo class.
 """
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch
 
+from crypto_info import deadline
+from crypto_info.cache import ResponseCache
+from crypto_info.circuit_breaker import CircuitOpenError
 from crypto_info.crypto_info import CryptoInfo
+from crypto_info.metrics import InMemorySink
+from crypto_info.symbol_index import SymbolIndex
 
 class TestCryptoInfo:
     """Test cases for the CryptoInfo class."""
@@ -12,7 +19,10 @@ class TestCryptoInfo:
     def setup_method(self):
         """Set up test fixtures."""
         self.mock_api_client = Mock()
-        self.crypto_info = CryptoInfo(api_client=self.mock_api_client)
+        self.crypto_info = CryptoInfo(
+            api_client=self.mock_api_client,
+            symbol_index=SymbolIndex.from_coins([])
+        )
     
     def test_get_coin_id_from_cache(self):
         """Test getting coin ID from cache."""
@@ -26,6 +36,21 @@ class TestCryptoInfo:
         assert result == "bitcoin"
         self.mock_api_client.search_coins.assert_not_called()
     
+    def test_get_coin_id_from_symbol_index(self):
+        """Test getting coin ID from the local symbol index."""
+        # Setup index
+        self.crypto_info.symbol_index = SymbolIndex.from_coins([
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"}
+        ])
+        
+        # Execute
+        result = self.crypto_info._get_coin_id("BTC")
+        
+        # Verify
+        assert result == "bitcoin"
+        self.mock_api_client.search_coins.assert_not_called()
+        assert self.crypto_info._id_cache["btc"] == "bitcoin"
+    
     def test_get_coin_id_exact_match(self):
         """Test getting coin ID with exact symbol match."""
         # Setup mock
@@ -71,6 +96,26 @@ class TestCryptoInfo:
         with pytest.raises(ValueError):
             self.crypto_info._get_coin_id("XYZ")
     
+    def test_get_coin_id_metrics(self):
+        """Test that symbol resolution is timed by source."""
+        # Setup mocks
+        self.crypto_info.metrics = InMemorySink()
+        self.crypto_info.symbol_index = SymbolIndex.from_coins([
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"}
+        ])
+        self.mock_api_client.search_coins.return_value = {"coins": []}
+        
+        # Execute
+        self.crypto_info._get_coin_id("BTC")
+        self.crypto_info._get_coin_id("BTC")
+        with pytest.raises(ValueError):
+            self.crypto_info._get_coin_id("XYZ")
+        
+        # Verify
+        metrics = self.crypto_info.metrics
+        for source in ("index", "cache", "error"):
+            assert metrics.histogram("crypto_info_symbol_resolution_seconds", source=source)["count"] == 1
+    
     def test_get_crypto_info(self):
         """Test getting cryptocurrency information."""
         # Setup mocks
@@ -130,3 +175,533 @@ class TestCryptoInfo:
         assert result["usd"] == 50000
         assert result["eur"] == 42000
         assert result["gbp"] == 36000
+    
+    def test_get_prices_single_request(self):
+        """Test getting prices for several symbols with one batched request."""
+        # Setup mocks
+        ids = {"BTC": "bitcoin", "ETH": "ethereum"}
+        self.crypto_info._get_coin_id = Mock(side_effect=lambda symbol: ids[symbol])
+        self.mock_api_client.get_coin_price.return_value = {
+            "bitcoin": {"usd": 50000},
+            "ethereum": {"usd": 3000}
+        }
+        
+        # Execute
+        result = self.crypto_info.get_prices(["BTC", "ETH"], ["usd"])
+        
+        # Verify
+        self.mock_api_client.get_coin_price.assert_called_once()
+        args, kwargs = self.mock_api_client.get_coin_price.call_args
+        assert args[0] == ["bitcoin", "ethereum"]
+        assert args[1] == ["usd"]
+        assert result == {"BTC": {"usd": 50000}, "ETH": {"usd": 3000}}
+    
+    def test_get_prices_per_symbol_errors(self):
+        """Test that unknown symbols and missing prices do not fail the batch."""
+        # Setup mocks
+        def get_coin_id(symbol):
+            if symbol == "XYZ":
+                raise ValueError("Could not find cryptocurrency with symbol 'xyz'")
+            return {"BTC": "bitcoin", "ETH": "ethereum"}[symbol]
+        
+        self.crypto_info._get_coin_id = Mock(side_effect=get_coin_id)
+        self.mock_api_client.get_coin_price.return_value = {"bitcoin": {"usd": 50000}}
+        
+        # Execute
+        result = self.crypto_info.get_prices(["BTC", "XYZ", "ETH"])
+        
+        # Verify
+        assert list(result) == ["BTC", "XYZ", "ETH"]
+        assert result["BTC"] == {"usd": 50000}
+        assert "error" in result["XYZ"]
+        assert "error" in result["ETH"]
+    
+    def test_get_prices_chunk_failure(self):
+        """Test that a failed chunk only marks its own symbols as errors."""
+        # Setup mocks
+        self.crypto_info._get_coin_id = Mock(side_effect=lambda symbol: symbol.lower())
+        self.crypto_info._chunk_coin_ids = Mock(return_value=[["aaa"], ["bbb"]])
+        self.mock_api_client.get_coin_price.side_effect = [
+            Exception("429 Too Many Requests"),
+            {"bbb": {"usd": 1.0}}
+        ]
+        
+        # Execute
+        result = self.crypto_info.get_prices(["AAA", "BBB"], ["usd"])
+        
+        # Verify
+        assert "error" in result["AAA"]
+        assert result["BBB"] == {"usd": 1.0}
+    
+    def test_get_prices_parallel(self):
+        """Test that searches and chunks run concurrently with per-symbol errors."""
+        # Setup mocks
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+        
+        def search_coins(query):
+            with lock:
+                in_flight.append(query)
+                peak.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(query)
+            if query == "xyz":
+                return {"coins": []}
+            return {"coins": [{"id": f"{query}-coin", "symbol": query}]}
+        
+        self.mock_api_client.search_coins.side_effect = search_coins
+        self.crypto_info._chunk_coin_ids = Mock(side_effect=lambda ids: [[coin_id] for coin_id in ids])
+        self.mock_api_client.get_coin_price.side_effect = lambda ids, *args, **kwargs: {ids[0]: {"usd": 1.0}}
+        
+        # Execute
+        result = self.crypto_info.get_prices_parallel(["AAA", "BBB", "CCC", "XYZ", "AAA"], ["usd"], max_workers=4)
+        
+        # Verify
+        assert list(result) == ["AAA", "BBB", "CCC", "XYZ"]
+        assert result["AAA"] == result["BBB"] == result["CCC"] == {"usd": 1.0}
+        assert "error" in result["XYZ"]
+        assert max(peak) > 1
+        assert self.mock_api_client.get_coin_price.call_count == 3
+    
+    def test_get_crypto_info_many(self):
+        """Test fetching several coin documents with per-symbol errors."""
+        # Setup mocks
+        self.crypto_info._get_coin_id = Mock(side_effect=lambda symbol: symbol.lower())
+        
+        def get_coin_by_id(coin_id, **kwargs):
+            if coin_id == "bad":
+                raise Exception("404 Not Found")
+            return {"id": coin_id, "name": coin_id.title(), "symbol": coin_id, "market_data": {}}
+        
+        self.mock_api_client.get_coin_by_id.side_effect = get_coin_by_id
+        
+        # Execute
+        result = self.crypto_info.get_crypto_info_many(["BTC", "BAD", "ETH"], max_workers=2,
+                                                       fields=["id", "name"])
+        
+        # Verify
+        assert result["BTC"] == {"id": "btc", "name": "Btc"}
+        assert result["ETH"] == {"id": "eth", "name": "Eth"}
+        assert "error" in result["BAD"]
+    
+    def test_shared_between_threads(self):
+        """Test resolving symbols from many threads sharing one instance."""
+        # Setup index
+        self.crypto_info.symbol_index = SymbolIndex.from_coins([
+            {"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}"} for i in range(200)
+        ])
+        errors = []
+        
+        def worker():
+            try:
+                for i in range(200):
+                    assert self.crypto_info._get_coin_id(f"C{i}") == f"coin-{i}"
+            except Exception as e:
+                errors.append(e)
+        
+        # Execute
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Verify
+        assert errors == []
+        assert len(self.crypto_info._id_cache) == 200
+    
+    def test_chunk_coin_ids(self):
+        """Test splitting IDs by encoded parameter length."""
+        coin_ids = ["a" * 10, "b" * 10, "c" * 10]
+        
+        # Two IDs plus an encoded comma fit in 23 characters, three do not
+        assert CryptoInfo._chunk_coin_ids(coin_ids, max_length=23) == [
+            ["a" * 10, "b" * 10],
+            ["c" * 10]
+        ]
+        assert CryptoInfo._chunk_coin_ids(coin_ids, max_length=1000) == [coin_ids]
+        assert CryptoInfo._chunk_coin_ids([]) == []
+    
+    def test_get_price_with_cache(self):
+        """Test that cached prices are served without a request."""
+        # Setup mocks
+        self.crypto_info.cache = ResponseCache()
+        self.crypto_info._get_coin_id = Mock(return_value="bitcoin")
+        self.mock_api_client.get_coin_price.return_value = {"bitcoin": {"usd": 50000}}
+        
+        # Execute
+        first = self.crypto_info.get_price("BTC", ["usd"])
+        second = self.crypto_info.get_price("BTC", ["USD"])
+        
+        # Verify
+        assert first == second == {"usd": 50000}
+        self.mock_api_client.get_coin_price.assert_called_once()
+        assert self.crypto_info.cache.stats["hits"] == 1
+    
+    def test_get_coin_id_shared_through_cache(self):
+        """Test that a symbol found by search is reused by another instance sharing the cache."""
+        # Setup mocks
+        cache = ResponseCache()
+        self.crypto_info.cache = cache
+        self.mock_api_client.search_coins.return_value = {
+            "coins": [{"id": "pepe", "symbol": "pepe", "name": "Pepe"}]
+        }
+        other_client = Mock()
+        other = CryptoInfo(api_client=other_client, symbol_index=SymbolIndex.from_coins([]), cache=cache)
+        
+        # Execute
+        first = self.crypto_info._resolve_coin_id("PEPE")
+        second = other._resolve_coin_id("pepe")
+        
+        # Verify
+        assert first == ("pepe", "search")
+        assert second == ("pepe", "cache")
+        other_client.search_coins.assert_not_called()
+        # Symbol lookups are counted apart from the response hit rate
+        assert (cache.stats["misses"], cache.stats["hits"]) == (0, 0)
+        assert (cache.stats["symbol_misses"], cache.stats["symbol_hits"]) == (1, 1)
+    
+    def test_search_uses_local_index(self):
+        """Test that search is served from the symbol index without a request."""
+        # Setup mocks
+        self.crypto_info.symbol_index = SymbolIndex.from_coins(
+            [{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+             {"id": "bitcoin-cash", "symbol": "bch", "name": "Bitcoin Cash"}],
+            ranks={"bitcoin": 1, "bitcoin-cash": 17}
+        )
+        
+        # Execute
+        results = self.crypto_info.search("bitc", limit=5)
+        
+        # Verify
+        assert [coin["id"] for coin in results] == ["bitcoin", "bitcoin-cash"]
+        self.mock_api_client.search_coins.assert_not_called()
+    
+    def test_search_without_index_uses_network(self):
+        """Test that search falls back to the API when no index is available."""
+        # Setup mocks
+        self.mock_api_client.search_coins.return_value = {"coins": [
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "market_cap_rank": 1, "thumb": "x"},
+            {"id": "bitcoin-cash", "symbol": "bch", "name": "Bitcoin Cash", "market_cap_rank": 17}
+        ]}
+        
+        # Execute
+        results = self.crypto_info.search("bitc", limit=1)
+        
+        # Verify
+        assert results == [{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "market_cap_rank": 1}]
+        self.mock_api_client.search_coins.assert_called_once_with("bitc")
+    
+    def test_get_price_serves_expired_cache_on_error(self):
+        """Test that an expired cached price is served when the request fails."""
+        # Setup mocks
+        clock = Mock(return_value=0.0)
+        self.crypto_info.cache = ResponseCache(ttls={"price": 10}, stale_ttl=0, stale_if_error=300, clock=clock)
+        self.crypto_info._get_coin_id = Mock(return_value="bitcoin")
+        self.mock_api_client.get_coin_price.return_value = {"bitcoin": {"usd": 50000}}
+        self.crypto_info.get_price("BTC", ["usd"])
+        clock.return_value = 60.0
+        self.mock_api_client.get_coin_price.side_effect = CircuitOpenError("coingecko", 30)
+        
+        # Execute
+        result = self.crypto_info.get_price("BTC", ["usd"])
+        
+        # Verify
+        assert result == {"usd": 50000}
+        assert self.mock_api_client.get_coin_price.call_count == 2
+    
+    def test_timeout_sets_deadline(self):
+        """Test that the per-call timeout bounds API calls made by public methods."""
+        # Setup mocks
+        seen = []
+        self.crypto_info.timeout = 5
+        self.crypto_info._id_cache["btc"] = "bitcoin"
+        self.crypto_info._id_cache["eth"] = "ethereum"
+        self.mock_api_client.get_coin_price.side_effect = (
+            lambda ids, vs, **kwargs: seen.append(deadline.remaining()) or {coin_id: {"usd": 1} for coin_id in ids}
+        )
+        
+        # Execute
+        self.crypto_info.get_price("BTC", ["usd"])
+        self.crypto_info.get_prices_parallel(["BTC", "ETH"], ["usd"])
+        
+        # Verify
+        assert len(seen) == 2
+        assert all(left is not None and 0 < left <= 5 for left in seen)
+        assert deadline.remaining() is None
+
+    def test_timeout_bounds_market_snapshot(self):
+        """Test that the per-call timeout also bounds paging through the whole market."""
+        # Setup mocks
+        seen = []
+        self.crypto_info.timeout = 5
+
+        def iter_markets(vs_currency, per_page, max_pages):
+            seen.append(deadline.remaining())
+            yield [{"id": "bitcoin", "symbol": "btc", "current_price": 50000}]
+
+        self.mock_api_client.iter_markets.side_effect = iter_markets
+
+        # Execute
+        snapshot = self.crypto_info.get_market_snapshot()
+
+        # Verify
+        assert len(snapshot) == 1
+        assert len(seen) == 1 and seen[0] is not None and 0 < seen[0] <= 5
+
+    def test_deadline_exceeded(self):
+        """Test that an expired deadline fails the call before any request."""
+        # Setup mocks
+        self.crypto_info.timeout = 0
+        
+        # Execute and verify
+        with pytest.raises(ValueError, match="Deadline exceeded"):
+            self.crypto_info.get_price("BTC", ["usd"])
+        self.mock_api_client.search_coins.assert_not_called()
+    
+    def test_get_prices_with_cache_fetches_only_misses(self):
+        """Test that batched prices only request uncached coins."""
+        # Setup mocks
+        self.crypto_info.cache = ResponseCache()
+        self.crypto_info._get_coin_id = Mock(side_effect=lambda symbol: symbol.lower())
+        self.mock_api_client.get_coin_price.return_value = {"aaa": {"usd": 1.0}}
+        self.crypto_info.get_price("AAA", ["usd"])
+        self.mock_api_client.get_coin_price.return_value = {"bbb": {"usd": 2.0}}
+        
+        # Execute
+        result = self.crypto_info.get_prices(["AAA", "BBB"], ["usd"])
+        
+        # Verify
+        assert result == {"AAA": {"usd": 1.0}, "BBB": {"usd": 2.0}}
+        args, kwargs = self.mock_api_client.get_coin_price.call_args
+        assert args[0] == ["bbb"]
+    
+    def test_get_crypto_info_with_cache(self):
+        """Test that coin information is cached."""
+        # Setup mocks
+        self.crypto_info.cache = ResponseCache()
+        self.crypto_info._get_coin_id = Mock(return_value="bitcoin")
+        self.mock_api_client.get_coin_by_id.return_value = {"id": "bitcoin", "symbol": "btc"}
+        
+        # Execute
+        self.crypto_info.get_crypto_info("BTC")
+        result = self.crypto_info.get_crypto_info("BTC")
+        
+        # Verify
+        assert result["id"] == "bitcoin"
+        self.mock_api_client.get_coin_by_id.assert_called_once_with("bitcoin")
+
+    def test_cached_results_are_copies(self):
+        """Test that changing a returned result does not change the cached one."""
+        # Setup mocks
+        self.crypto_info.cache = ResponseCache()
+        self.crypto_info._get_coin_id = Mock(side_effect=lambda symbol: "ethereum")
+        self.mock_api_client.get_coin_price.return_value = {"ethereum": {"usd": 3000.0}}
+        self.mock_api_client.get_coin_by_id.return_value = {
+            "id": "ethereum", "market_data": {"current_price": {"usd": 3000.0}}
+        }
+
+        # Execute
+        self.crypto_info.get_price("ETH", ["usd"])["usd"] = 999
+        prices = self.crypto_info.get_prices(["ETH", "eth"], ["usd"])
+        prices["ETH"]["usd"] = 999
+        self.crypto_info.get_crypto_info("ETH")["current_price"]["usd"] = 999
+
+        # Verify
+        assert self.crypto_info.get_price("ETH", ["usd"]) == {"usd": 3000.0}
+        assert prices["eth"] == {"usd": 3000.0}
+        assert self.crypto_info.get_crypto_info("ETH")["current_price"]["usd"] == 3000.0
+
+    def _market_page(self, start, count):
+        """Build a page of /coins/markets records."""
+        return [
+            {"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}",
+             "current_price": float(i), "market_cap_rank": i}
+            for i in range(start, start + count)
+        ]
+    
+    def test_stream_market_snapshot(self):
+        """Test streaming normalized market pages."""
+        # Setup mock
+        self.mock_api_client.iter_markets.return_value = iter([self._market_page(1, 2), self._market_page(3, 1)])
+        
+        # Execute
+        pages = list(self.crypto_info.stream_market_snapshot("eur", per_page=2))
+        
+        # Verify
+        assert [len(page) for page in pages] == [2, 1]
+        assert pages[0][0]["symbol"] == "C1"
+        assert pages[0][0]["vs_currency"] == "eur"
+        assert pages[1][0]["current_price"] == 3.0
+        assert pages[1][0]["total_volume"] is None
+    
+    def test_stream_market_snapshot_limit(self):
+        """Test that the limit caps pages and coins."""
+        # Setup mock
+        self.mock_api_client.iter_markets.return_value = iter([self._market_page(1, 2), self._market_page(3, 2)])
+        
+        # Execute
+        pages = list(self.crypto_info.stream_market_snapshot(per_page=2, limit=3))
+        
+        # Verify
+        assert [len(page) for page in pages] == [2, 1]
+        args, kwargs = self.mock_api_client.iter_markets.call_args
+        assert kwargs["max_pages"] == 2
+    
+    def test_stream_market_snapshot_zero_limit(self):
+        """Test that a zero limit yields nothing without any request."""
+        # Execute
+        prefetched = list(self.crypto_info.stream_market_snapshot(limit=0, prefetch=True))
+        paged = list(self.crypto_info.stream_market_snapshot(limit=0))
+        no_pages = list(self.crypto_info.stream_market_snapshot(max_pages=0, prefetch=True))
+
+        # Verify
+        assert prefetched == paged == no_pages == []
+        self.mock_api_client.get_coins_markets.assert_not_called()
+        self.mock_api_client.iter_markets.assert_not_called()
+
+    def test_stream_market_snapshot_skips_empty_pages(self):
+        """Test that empty pages are not yielded."""
+        self.mock_api_client.iter_markets.return_value = iter([self._market_page(1, 2), []])
+
+        pages = list(self.crypto_info.stream_market_snapshot(per_page=2))
+
+        assert [len(page) for page in pages] == [2]
+
+    def test_stream_market_snapshot_prefetch(self):
+        """Test prefetching the next page in the background."""
+        # Setup mock
+        pages_by_number = {1: self._market_page(1, 2), 2: self._market_page(3, 2), 3: self._market_page(5, 1)}
+        self.mock_api_client.get_coins_markets.side_effect = lambda vs, per_page, page: pages_by_number[page]
+        
+        # Execute
+        pages = list(self.crypto_info.stream_market_snapshot(per_page=2, prefetch=True))
+        
+        # Verify
+        assert [record["id"] for page in pages for record in page] == [f"coin-{i}" for i in range(1, 6)]
+        assert self.mock_api_client.get_coins_markets.call_count == 3
+    
+    def test_stream_market_snapshot_early_termination(self):
+        """Test that closing the stream stops further requests."""
+        # Setup mock
+        self.mock_api_client.get_coins_markets.side_effect = lambda vs, per_page, page: self._market_page(page, 2)
+        
+        # Execute
+        stream = self.crypto_info.stream_market_snapshot(per_page=2, prefetch=True)
+        next(stream)
+        stream.close()
+        
+        # Verify: the first page plus at most the prefetched one
+        assert self.mock_api_client.get_coins_markets.call_count <= 2
+    
+    def test_get_snapshot(self):
+        """Test building a columnar snapshot from batched prices."""
+        # Setup mocks
+        self.crypto_info._get_coin_id = Mock(side_effect=lambda symbol: {"BTC": "bitcoin", "ETH": "ethereum"}[symbol])
+        self.mock_api_client.get_coin_price.return_value = {
+            "bitcoin": {"usd": 50000, "usd_market_cap": 1000000000},
+            "ethereum": {"usd": 3000, "usd_market_cap": 400000000}
+        }
+        
+        # Execute
+        snapshot = self.crypto_info.get_snapshot(["BTC", "ETH", "BTC"], ["usd"])
+        
+        # Verify
+        self.mock_api_client.get_coin_price.assert_called_once()
+        assert snapshot.coin_ids == ["bitcoin", "ethereum"]
+        assert snapshot.top_n(1) == [("bitcoin", 1000000000)]
+    
+    def test_get_market_snapshot(self):
+        """Test building a columnar snapshot from market pages."""
+        # Setup mock
+        self.mock_api_client.iter_markets.return_value = iter([self._market_page(1, 3)])
+        
+        # Execute
+        snapshot = self.crypto_info.get_market_snapshot("usd", limit=2)
+        
+        # Verify
+        assert snapshot.coin_ids == ["coin-1", "coin-2"]
+        assert snapshot.value("coin-2", "current_price", "usd") == 2.0
+    
+    def test_get_crypto_info_projection_uses_simple_price(self):
+        """Test that price-only projections use /simple/price."""
+        # Setup mocks
+        self.crypto_info._get_coin_id = Mock(return_value="bitcoin")
+        self.mock_api_client.get_coin_price.return_value = {
+            "bitcoin": {"usd": 50000, "usd_market_cap": 1000000000, "usd_24h_change": 2.0}
+        }
+        
+        # Execute
+        result = self.crypto_info.get_crypto_info(
+            "BTC", fields=["price_change_percentage_24h", "current_price", "market_cap"], currencies=["USD"]
+        )
+        
+        # Verify
+        self.mock_api_client.get_coin_by_id.assert_not_called()
+        args, kwargs = self.mock_api_client.get_coin_price.call_args
+        assert args == (["bitcoin"], ["usd"])
+        assert kwargs["include_market_cap"] is True
+        assert kwargs["include_24hr_vol"] is False
+        assert result == {
+            "id": "bitcoin",
+            "current_price": {"usd": 50000},
+            "market_cap": {"usd": 1000000000},
+            "price_change_percentage_24h": 2.0
+        }
+    
+    def test_get_crypto_info_projection_uses_markets(self):
+        """Test that single-currency market projections use /coins/markets."""
+        # Setup mocks
+        self.crypto_info._get_coin_id = Mock(return_value="bitcoin")
+        self.mock_api_client.get_coins_markets.return_value = [
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "high_24h": 52000, "market_cap_rank": 1}
+        ]
+        
+        # Execute
+        result = self.crypto_info.get_crypto_info(
+            "BTC", fields=["symbol", "high_24h", "market_cap_rank"], currencies=["eur"]
+        )
+        
+        # Verify
+        self.mock_api_client.get_coins_markets.assert_called_once_with("eur", ids=["bitcoin"], per_page=1)
+        assert result == {"id": "bitcoin", "symbol": "BTC", "high_24h": {"eur": 52000}, "market_cap_rank": 1}
+    
+    def test_get_crypto_info_projection_uses_coin_document(self):
+        """Test that other projections use /coins/{id} and skip unrequested sections."""
+        # Setup mocks
+        self.crypto_info._get_coin_id = Mock(return_value="bitcoin")
+        self.mock_api_client.get_coin_by_id.return_value = {
+            "id": "bitcoin",
+            "description": {"en": "Bitcoin is a cryptocurrency."},
+            "market_data": {"current_price": {"usd": 50000, "eur": 42000, "gbp": 36000}}
+        }
+        
+        # Execute
+        description = self.crypto_info.get_crypto_info("BTC", fields=["description"])
+        prices = self.crypto_info.get_crypto_info("BTC", fields=["description", "current_price"],
+                                                  currencies=["usd", "eur"])
+        
+        # Verify
+        first, second = self.mock_api_client.get_coin_by_id.call_args_list
+        assert first.kwargs == {"market_data": False}
+        assert second.kwargs == {}
+        assert description == {"id": "bitcoin", "description": "Bitcoin is a cryptocurrency."}
+        assert prices["current_price"] == {"usd": 50000, "eur": 42000}
+    
+    def test_get_crypto_info_unknown_field(self):
+        """Test that unknown fields are rejected."""
+        with pytest.raises(ValueError):
+            self.crypto_info.get_crypto_info("BTC", fields=["tickers"])
+    
+    def test_choose_info_endpoint(self):
+        """Test endpoint selection for projections."""
+        choose = CryptoInfo._choose_info_endpoint
+        
+        assert choose(["id", "current_price"], ["usd", "eur"]) == "price"
+        assert choose(["current_price"], None) == "coin"
+        assert choose(["high_24h"], ["usd"]) == "markets"
+        assert choose(["high_24h"], ["usd", "eur"]) == "coin"
+        assert choose(["price_change_24h"], ["eur"]) == "coin"
+        assert choose(["description"], ["usd"]) == "coin"
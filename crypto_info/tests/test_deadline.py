@@ -0,0 +1,50 @@
+"""
+Tests for per-call deadlines.
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto_info.deadline import DeadlineExceeded, check, deadline, propagate, remaining
+
+class TestDeadline:
+    """Test cases for the deadline helpers."""
+    
+    def test_no_deadline(self):
+        """Test that there is no deadline by default."""
+        assert remaining() is None
+        check()
+        with deadline(None) as left:
+            assert left is None
+    
+    def test_remaining_and_reset(self):
+        """Test that the deadline applies inside the block only."""
+        with deadline(10) as left:
+            assert 9 < left <= 10
+            assert 9 < remaining() <= 10
+        assert remaining() is None
+    
+    def test_nested_deadline_never_extends(self):
+        """Test that the earlier of nested deadlines applies."""
+        with deadline(1):
+            with deadline(10):
+                assert remaining() <= 1
+            with deadline(0.5):
+                assert remaining() <= 0.5
+            assert 0.5 < remaining() <= 1
+    
+    def test_check_expired(self):
+        """Test that check raises once the deadline has passed."""
+        with deadline(0):
+            assert remaining() == 0
+            with pytest.raises(DeadlineExceeded, match="price lookup"):
+                check("price lookup")
+    
+    def test_propagate_to_threads(self):
+        """Test that wrapped functions see the caller's deadline in pool threads."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with deadline(5):
+                plain = executor.submit(remaining).result()
+                results = list(executor.map(propagate(lambda _: remaining()), range(4)))
+        
+        assert plain is None
+        assert all(0 < left <= 5 for left in results)
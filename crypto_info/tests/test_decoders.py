@@ -0,0 +1,87 @@
+"""
+Tests for the JSON decoding backends.
+"""
+import json
+import pytest
+
+from crypto_info.decoders import available_decoders, get_decoder, get_encoder, iter_json_array
+
+class TestDecoders:
+    """Test cases for decoder selection."""
+    
+    def test_stdlib_backend_decodes_bytes(self):
+        """Test that the stdlib backend decodes bytes."""
+        assert get_decoder("json")(b'{"usd": 1.5}') == {"usd": 1.5}
+    
+    def test_default_backend_is_preferred(self):
+        """Test that the default backend is the first installed one."""
+        decoders = available_decoders()
+        
+        assert "json" in decoders
+        assert get_decoder() is list(decoders.values())[0]
+        assert get_decoder()('{"ü": [1, 2]}'.encode()) == {"ü": [1, 2]}
+    
+    def test_unknown_backend(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            get_decoder("simplejson-fast")
+    
+    @pytest.mark.parametrize("name", [None, "json"])
+    def test_encoder_round_trip(self, name):
+        """Test that encoders produce compact UTF-8 JSON the decoders read back."""
+        value = {"bitcoin": {"usd": 1.5, "name": "ü"}}
+        
+        # Execute
+        encoded = get_encoder(name)(value)
+        
+        # Verify
+        assert isinstance(encoded, bytes)
+        assert b" " not in encoded
+        assert get_decoder(name)(encoded) == value
+
+class TestIterJsonArray:
+    """Test cases for incremental array parsing."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.elements = [
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+            {"id": "naïve-coin", "symbol": "nv", "name": "Naïve \"quoted\" [coin]"},
+            12345,
+            True,
+            None,
+            [1, {"a": "b"}]
+        ]
+        self.document = json.dumps(self.elements, ensure_ascii=False).encode("utf-8")
+    
+    def test_single_chunk(self):
+        """Test parsing a whole document."""
+        assert list(iter_json_array([self.document])) == self.elements
+    
+    def test_every_split_point(self):
+        """Test that elements split across chunks, even mid-character, are parsed."""
+        for split in range(1, len(self.document)):
+            chunks = [self.document[:split], self.document[split:]]
+            assert list(iter_json_array(chunks)) == self.elements
+    
+    def test_byte_by_byte(self):
+        """Test parsing one byte at a time."""
+        chunks = [self.document[i:i + 1] for i in range(len(self.document))]
+        assert list(iter_json_array(chunks)) == self.elements
+    
+    def test_empty_array(self):
+        """Test parsing an empty array."""
+        assert list(iter_json_array([b" [ ", b"] "])) == []
+    
+    def test_not_an_array(self):
+        """Test that objects are rejected."""
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'{"coins": []}']))
+    
+    def test_truncated(self):
+        """Test that a truncated document is rejected after yielding complete elements."""
+        parsed = []
+        with pytest.raises(ValueError):
+            for element in iter_json_array([b'[{"id": "bitcoin"}, {"id": "eth']):
+                parsed.append(element)
+        assert parsed == [{"id": "bitcoin"}]
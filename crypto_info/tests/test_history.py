@@ -0,0 +1,237 @@
+"""
+Tests for the historical market data storage.
+"""
+import math
+import threading
+import time
+import pytest
+from array import array
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from crypto_info.crypto_info import CryptoInfo
+from crypto_info.history import (
+    HistoryStore, PriceHistory, merge_ranges, missing_ranges
+)
+from crypto_info.symbol_index import SymbolIndex
+
+DAY = 86400
+
+def _chart(start, end, step):
+    """Build a /market_chart/range response with one point per step."""
+    points = range(start, end, step)
+    return {
+        "prices": [[t * 1000, float(t)] for t in points],
+        "market_caps": [[t * 1000, t * 10.0] for t in points],
+        "total_volumes": [[t * 1000, None] for t in points],
+    }
+
+class TestPriceHistory:
+    """Test cases for the PriceHistory class."""
+    
+    def test_from_chart_buckets(self):
+        """Test that points are aligned to buckets, keeping the first value."""
+        history = PriceHistory.from_chart(_chart(0, 2 * DAY, 3600), "daily")
+        
+        assert list(history.timestamps) == [0, DAY]
+        assert list(history["price"]) == [0.0, float(DAY)]
+        assert history["market_cap"][1] == DAY * 10.0
+        assert math.isnan(history["total_volume"][0])
+    
+    def test_hourly_and_daily_responses_line_up(self):
+        """Test that daily rows are the same whether built from hourly or daily points."""
+        hourly = PriceHistory.from_chart(_chart(0, 3 * DAY, 3600), "daily")
+        daily = PriceHistory.from_chart(_chart(0, 3 * DAY, DAY), "daily")
+        
+        assert list(hourly.timestamps) == list(daily.timestamps)
+        assert list(hourly["price"]) == list(daily["price"])
+    
+    def test_from_ohlc(self):
+        """Test building OHLC columns."""
+        history = PriceHistory.from_ohlc([[1000, 1, 2, 0.5, 1.5], [2000, 1.5, 3, 1, 2]])
+        
+        assert list(history.timestamps) == [1, 2]
+        assert list(history["close"]) == [1.5, 2]
+    
+    def test_merge_and_slice(self):
+        """Test merging overlapping histories and slicing by time."""
+        old = PriceHistory.from_chart(_chart(0, 3 * DAY, DAY), "daily")
+        new = PriceHistory.from_chart({"prices": [[2 * DAY * 1000, 99.0], [3 * DAY * 1000, 100.0]]}, "daily")
+        
+        merged = old.merge(new)
+        
+        assert list(merged.timestamps) == [0, DAY, 2 * DAY, 3 * DAY]
+        assert list(merged["price"]) == [0.0, DAY, 99.0, 100.0]
+        assert list(merged.slice(DAY, 2 * DAY).timestamps) == [DAY, 2 * DAY]
+        assert list(merged.slice(datetime.fromtimestamp(DAY, tz=timezone.utc), 10 * DAY)["price"]) == [DAY, 99.0, 100.0]
+    
+    def test_to_numpy(self):
+        """Test converting columns to NumPy arrays."""
+        np = pytest.importorskip("numpy")
+        history = PriceHistory.from_chart(_chart(0, 3 * DAY, DAY), "daily")
+        
+        assert history.to_numpy("timestamp").dtype == np.int64
+        assert history.to_numpy("price").tolist() == [0.0, DAY, 2 * DAY]
+
+class TestRanges:
+    """Test cases for the range helpers."""
+    
+    def test_merge_ranges(self):
+        """Test merging overlapping and touching ranges."""
+        assert merge_ranges([(5, 8), (0, 2), (2, 4), (7, 10)]) == [(0, 4), (5, 10)]
+    
+    def test_missing_ranges(self):
+        """Test finding gaps between covered ranges."""
+        covered = [(10, 20), (30, 40)]
+        
+        assert missing_ranges(covered, 0, 50) == [(0, 10), (20, 30), (40, 50)]
+        assert missing_ranges(covered, 12, 18) == []
+        assert missing_ranges(covered, 15, 35) == [(20, 30)]
+        assert missing_ranges([], 0, 5) == [(0, 5)]
+
+class TestHistoryStore:
+    """Test cases for the HistoryStore class."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test saving and loading a series."""
+        store = HistoryStore(str(tmp_path))
+        history = PriceHistory.from_chart(_chart(0, 3 * DAY, DAY), "daily")
+        
+        store.save("bitcoin", "usd", "daily", history, [(0, 3 * DAY)])
+        loaded, ranges = store.load("bitcoin", "usd", "daily")
+        
+        assert ranges == [(0, 3 * DAY)]
+        assert list(loaded.timestamps) == list(history.timestamps)
+        assert list(loaded["price"]) == list(history["price"])
+        assert (tmp_path / "bitcoin" / "usd-daily.bin").exists()
+    
+    def test_missing_and_corrupt_files(self, tmp_path):
+        """Test that missing or corrupt files load as empty."""
+        store = HistoryStore(str(tmp_path))
+        assert len(store.load("bitcoin", "usd", "daily")[0]) == 0
+        
+        path = tmp_path / "bitcoin" / "usd-daily.bin"
+        path.parent.mkdir()
+        path.write_bytes(b"CIH1\x05\x00\x00\x00\x00\x00\x00\x00")
+        history, ranges = store.load("bitcoin", "usd", "daily")
+        
+        assert len(history) == 0
+        assert ranges == []
+    
+    def test_add_keeps_incomplete_buckets_unfetched(self, tmp_path):
+        """Test that buckets after complete_until are stored but fetched again."""
+        store = HistoryStore(str(tmp_path))
+        history = PriceHistory.from_chart(_chart(0, 3 * DAY, DAY), "daily")
+        
+        merged = store.add("bitcoin", "usd", "daily", history, (0, 3 * DAY), complete_until=2 * DAY)
+        
+        assert len(merged) == 3
+        assert store.missing("bitcoin", "usd", "daily", 0, 3 * DAY) == [(2 * DAY, 3 * DAY)]
+
+class TestGetHistory:
+    """Test cases for CryptoInfo.get_history and get_ohlc."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_api_client = Mock()
+        self.mock_api_client.get_market_chart_range.side_effect = (
+            lambda coin_id, vs_currency, start, end: _chart(start, end, 3600)
+        )
+        self.crypto_info = CryptoInfo(
+            api_client=self.mock_api_client,
+            symbol_index=SymbolIndex.from_coins([{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"}])
+        )
+    
+    @patch('crypto_info.crypto_info.time.time', return_value=100 * DAY + 3600)
+    def test_fetches_only_gaps(self, mock_time, tmp_path):
+        """Test that stored ranges are not fetched again."""
+        self.crypto_info.history_store = HistoryStore(str(tmp_path))
+        
+        # Execute
+        first = self.crypto_info.get_history("BTC", 10 * DAY, 20 * DAY)
+        second = self.crypto_info.get_history("BTC", 10 * DAY, 20 * DAY)
+        extended = self.crypto_info.get_history("BTC", 5 * DAY, 25 * DAY)
+        
+        # Verify
+        calls = [c.args for c in self.mock_api_client.get_market_chart_range.call_args_list]
+        assert calls == [
+            ("bitcoin", "usd", 10 * DAY, 20 * DAY),
+            ("bitcoin", "usd", 5 * DAY, 10 * DAY),
+            ("bitcoin", "usd", 20 * DAY, 25 * DAY),
+        ]
+        assert isinstance(first.timestamps, array)
+        assert list(first.timestamps) == list(range(10 * DAY, 20 * DAY, DAY))
+        assert list(second.timestamps) == list(first.timestamps)
+        assert extended.timestamps[0] == 5 * DAY
+        assert extended.timestamps[-1] == 24 * DAY
+    
+    @patch('crypto_info.crypto_info.time.time', return_value=100 * DAY + 3600)
+    def test_splits_hourly_requests(self, mock_time, tmp_path):
+        """Test that hourly ranges are fetched in windows of at most 90 days."""
+        self.crypto_info.history_store = HistoryStore(str(tmp_path))
+        
+        history = self.crypto_info.get_history("BTC", 0, 100 * DAY, interval="hourly")
+        
+        calls = [c.args[2:] for c in self.mock_api_client.get_market_chart_range.call_args_list]
+        assert calls == [(0, 90 * DAY), (90 * DAY, 100 * DAY)]
+        assert len(history) == 100 * 24
+    
+    @patch('crypto_info.crypto_info.time.time', return_value=100 * DAY + 1000)
+    def test_5m_only_for_last_day(self, mock_time, tmp_path):
+        """Test that 5m history is fetched in one window ending now and refused beyond a day."""
+        # Setup mocks
+        self.crypto_info.history_store = HistoryStore(str(tmp_path))
+        self.mock_api_client.get_market_chart_range.side_effect = (
+            lambda coin_id, vs_currency, start, end: _chart(start, end, 300)
+        )
+        now = 100 * DAY + 1000
+        
+        # Execute
+        self.crypto_info.get_history("BTC", now - 3600, now, interval="5m")
+        history = self.crypto_info.get_history("BTC", now - 7200, now - 3600, interval="5m")
+        
+        # Verify
+        calls = [c.args[2:] for c in self.mock_api_client.get_market_chart_range.call_args_list]
+        assert calls == [(now // 300 * 300 - 3600, 100 * DAY + 1200),
+                         (now // 300 * 300 - 7200, 100 * DAY + 1200)]
+        assert len(history) == 12
+        with pytest.raises(ValueError):
+            self.crypto_info.get_history("BTC", now - 2 * DAY, now, interval="5m")
+    
+    @patch('crypto_info.crypto_info.time.time', return_value=100 * DAY + 3600)
+    def test_concurrent_first_calls_share_store(self, mock_time, tmp_path):
+        """Test that the default store is created once when first calls race."""
+        # Setup mocks
+        created = []
+
+        def slow_store():
+            time.sleep(0.05)
+            created.append(HistoryStore(str(tmp_path)))
+            return created[-1]
+
+        # Execute
+        with patch('crypto_info.history.HistoryStore', side_effect=slow_store):
+            threads = [threading.Thread(target=self.crypto_info.get_history, args=("BTC", 10 * DAY, 11 * DAY))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # Verify
+        assert len(created) == 1
+        assert self.crypto_info.history_store is created[0]
+
+    def test_unknown_interval(self):
+        """Test that unknown intervals are rejected."""
+        with pytest.raises(ValueError):
+            self.crypto_info.get_history("BTC", 0, DAY, interval="weekly")
+    
+    def test_get_ohlc(self):
+        """Test getting OHLC candles as columns."""
+        self.mock_api_client.get_ohlc.return_value = [[1000, 1, 2, 0.5, 1.5]]
+        
+        history = self.crypto_info.get_ohlc("BTC", days=1)
+        
+        self.mock_api_client.get_ohlc.assert_called_once_with("bitcoin", "usd", 1)
+        assert list(history["open"]) == [1.0]
@@ -0,0 +1,81 @@
+"""
+Tests for the Lambda entry point.
+"""
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+import lambda_function
+from crypto_info.deadline import remaining
+
+class TestLambdaHandler:
+    """Test cases for lambda_handler."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_crypto_info = Mock()
+        self.patcher = patch.object(lambda_function, 'crypto_info', self.mock_crypto_info)
+        self.patcher.start()
+    
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.patcher.stop()
+    
+    def test_single_symbol(self):
+        """Test pricing one symbol."""
+        self.mock_crypto_info.get_price.return_value = {"usd": 50000}
+        
+        response = lambda_function.lambda_handler({"queryStringParameters": {"symbol": "BTC"}}, None)
+        
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"usd": 50000}
+        assert "handler;dur=" in response["headers"]["Server-Timing"]
+        self.mock_crypto_info.get_price.assert_called_once_with("BTC")
+    
+    def test_deadline_from_context(self):
+        """Test that API calls are bounded by the invocation's remaining time."""
+        seen = []
+        self.mock_crypto_info.get_price.side_effect = lambda symbol: seen.append(remaining()) or {"usd": 1}
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 3000
+        
+        lambda_function.lambda_handler({"queryStringParameters": {"symbol": "BTC"}}, context)
+        
+        assert 2 < seen[0] <= 2.5
+    
+    def test_batched_symbols(self):
+        """Test pricing several symbols in one batch."""
+        self.mock_crypto_info.get_prices.return_value = {"BTC": {"usd": 50000}, "ETH": {"usd": 3000}}
+        
+        response = lambda_function.lambda_handler({"queryStringParameters": {"symbols": "BTC, ETH"}}, None)
+        
+        assert response["statusCode"] == 200
+        self.mock_crypto_info.get_prices.assert_called_once_with(["BTC", "ETH"])
+    
+    def test_missing_symbol(self):
+        """Test a request without symbols."""
+        response = lambda_function.lambda_handler({"queryStringParameters": None}, None)
+        
+        assert response["statusCode"] == 404
+        assert json.loads(response["body"]) == "input variable is missing"
+    
+    def test_error(self):
+        """Test that lookup failures are reported."""
+        self.mock_crypto_info.get_price.side_effect = ValueError("unknown symbol")
+        
+        response = lambda_function.lambda_handler({"queryStringParameters": {"symbol": "XYZ"}}, None)
+        
+        assert response["statusCode"] == 404
+        assert "unknown symbol" in json.loads(response["body"])
+    
+    def test_client_reused_across_invocations(self):
+        """Test that warm invocations reuse the module-level client and skip init timing."""
+        self.mock_crypto_info.get_price.return_value = {"usd": 1}
+        lambda_function._cold_start = True
+        
+        first = lambda_function.lambda_handler({"queryStringParameters": {"symbol": "BTC"}}, None)
+        second = lambda_function.lambda_handler({"queryStringParameters": {"symbol": "BTC"}}, None)
+        
+        assert first["headers"]["Server-Timing"].startswith("init;dur=")
+        assert not second["headers"]["Server-Timing"].startswith("init;dur=")
+        assert self.mock_crypto_info.get_price.call_count == 2
@@ -0,0 +1,88 @@
+"""
+Tests for the instrumentation sinks.
+"""
+import math
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.metrics import CallbackSink, InMemorySink, PrometheusSink
+
+class TestInMemorySink:
+    """Test cases for the InMemorySink class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.sink = InMemorySink(buckets=(0.1, 1.0, 10.0))
+    
+    def test_counters_by_labels(self):
+        """Test that counters are kept per label set."""
+        self.sink.increment("requests_total", labels={"endpoint": "/ping"})
+        self.sink.increment("requests_total", 2, {"endpoint": "/ping"})
+        self.sink.increment("requests_total", labels={"endpoint": "/search"})
+        
+        assert self.sink.counter("requests_total", endpoint="/ping") == 3
+        assert self.sink.counter("requests_total", endpoint="/search") == 1
+        assert self.sink.counter("requests_total", endpoint="/coins/list") == 0
+    
+    def test_histogram_quantiles(self):
+        """Test histogram counts and interpolated quantiles."""
+        for value in [0.05] * 50 + [0.5] * 45 + [5.0] * 5:
+            self.sink.observe("latency", value)
+        
+        summary = self.sink.histogram("latency")
+        
+        assert summary["count"] == 100
+        assert summary["sum"] == pytest.approx(50 * 0.05 + 45 * 0.5 + 5 * 5.0)
+        assert summary["p50"] == pytest.approx(0.1)
+        assert 0.1 < summary["p95"] <= 1.0
+        assert 1.0 < summary["p99"] <= 10.0
+    
+    def test_empty_histogram(self):
+        """Test the summary of a histogram without samples."""
+        summary = self.sink.histogram("latency")
+        
+        assert summary["count"] == 0
+        assert math.isnan(summary["p50"])
+    
+    def test_reset(self):
+        """Test removing all series."""
+        self.sink.increment("requests_total")
+        self.sink.observe("latency", 0.5)
+        self.sink.reset()
+        
+        assert self.sink.snapshot() == {"counters": {}, "histograms": {}}
+
+class TestPrometheusSink:
+    """Test cases for the PrometheusSink class."""
+    
+    def test_render(self):
+        """Test the text exposition format."""
+        sink = PrometheusSink(buckets=(0.1, 1.0))
+        sink.increment("crypto_info_retries_total", labels={"endpoint": "/ping", "reason": "429"})
+        sink.observe("crypto_info_request_seconds", 0.5, {"endpoint": "/ping"})
+        sink.observe("crypto_info_request_seconds", 2.0, {"endpoint": "/ping"})
+        
+        lines = sink.render().splitlines()
+        
+        assert "# TYPE crypto_info_retries_total counter" in lines
+        assert 'crypto_info_retries_total{endpoint="/ping",reason="429"} 1.0' in lines
+        assert "# TYPE crypto_info_request_seconds histogram" in lines
+        assert 'crypto_info_request_seconds_bucket{endpoint="/ping",le="0.1"} 0' in lines
+        assert 'crypto_info_request_seconds_bucket{endpoint="/ping",le="1.0"} 1' in lines
+        assert 'crypto_info_request_seconds_bucket{endpoint="/ping",le="+Inf"} 2' in lines
+        assert 'crypto_info_request_seconds_sum{endpoint="/ping"} 2.5' in lines
+        assert 'crypto_info_request_seconds_count{endpoint="/ping"} 2' in lines
+
+class TestCallbackSink:
+    """Test cases for the CallbackSink class."""
+    
+    def test_forwards_measurements(self):
+        """Test that counters and samples reach the callback."""
+        callback = Mock()
+        sink = CallbackSink(callback)
+        
+        sink.increment("requests_total", labels={"endpoint": "/ping"})
+        sink.observe("latency", 0.25)
+        
+        callback.assert_any_call("counter", "requests_total", 1.0, {"endpoint": "/ping"})
+        callback.assert_any_call("histogram", "latency", 0.25, {})
@@ -0,0 +1,46 @@
+"""
+Tests for the package import path.
+"""
+import subprocess
+import sys
+import pytest
+
+def _run(code):
+    """Run code in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+class TestPackageImport:
+    """Test cases for the lazy package import."""
+    
+    def test_import_does_not_load_http_stack(self):
+        """Test that importing the package and CryptoInfo does not import requests."""
+        output = _run(
+            "import sys, crypto_info; a = 'requests' in sys.modules; "
+            "from crypto_info import CryptoInfo; b = 'requests' in sys.modules; "
+            "print(a, b)"
+        )
+        assert output == "False False"
+    
+    def test_import_does_not_load_cache_backends(self):
+        """Test that importing CryptoInfo does not import the shared cache backends' modules."""
+        output = _run(
+            "import sys; from crypto_info import CryptoInfo; "
+            "print([name for name in ('sqlite3', 'socket') if name in sys.modules])"
+        )
+        assert output == "[]"
+    
+    def test_import_does_not_configure_logging(self):
+        """Test that importing the package leaves the root logger alone."""
+        output = _run("import logging, crypto_info; print(len(logging.getLogger().handlers))")
+        assert output == "0"
+    
+    def test_lazy_attribute(self):
+        """Test lazy attribute access."""
+        import crypto_info
+        from crypto_info.crypto_info import CryptoInfo
+        
+        assert crypto_info.CryptoInfo is CryptoInfo
+        
+        with pytest.raises(AttributeError):
+            crypto_info.DoesNotExist
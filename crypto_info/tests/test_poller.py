@@ -0,0 +1,202 @@
+"""
+Tests for the incremental price poller.
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.crypto_info import CryptoInfo
+from crypto_info.poller import PricePoller
+from crypto_info.rate_limit import TokenBucket
+from crypto_info.symbol_index import SymbolIndex
+from crypto_info.tests.conftest import FakeClock
+
+def _quote(price, updated_at):
+    return {"usd": price, "usd_market_cap": price * 10, "usd_24h_change": 0.1,
+            "last_updated_at": updated_at}
+
+class TestPricePoller:
+    """Test cases for the PricePoller class."""
+    
+    def setup_method(self):
+        """Set up a CryptoInfo with a mocked client and a local symbol index."""
+        self.mock_api_client = Mock()
+        self.mock_api_client.rate_limiter = None
+        index = SymbolIndex.from_coins([
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+            {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+        ])
+        self.crypto_info = CryptoInfo(api_client=self.mock_api_client, symbol_index=index)
+        self.clock = FakeClock(1000.0)
+        self.quotes = {"bitcoin": _quote(50000, 990), "ethereum": _quote(3000, 995)}
+        self.mock_api_client.get_coin_price.side_effect = (
+            lambda ids, vs, **kwargs: {coin_id: self.quotes[coin_id] for coin_id in ids}
+        )
+    
+    def _poller(self, symbols=("btc", "eth"), **kwargs):
+        return PricePoller(self.crypto_info, list(symbols), clock=self.clock,
+                           min_interval=5, max_interval=60, **kwargs)
+    
+    def test_first_poll_emits_all(self):
+        """Test that the first poll reports every resolved coin."""
+        # Setup mocks
+        self.mock_api_client.search_coins.return_value = {"coins": []}
+        poller = self._poller(["btc", "eth", "unknown"])
+        
+        # Execute
+        changes = poller.poll_once()
+        
+        # Verify
+        assert [change.coin_id for change in changes] == ["bitcoin", "ethereum"]
+        assert changes[0].symbols == ["btc"]
+        assert changes[0].last_updated_at == 990
+        assert changes[0].previous_updated_at is None
+        assert "unknown" in poller.errors
+        self.mock_api_client.get_coin_price.assert_called_once_with(
+            ["bitcoin", "ethereum"], ["usd"],
+            include_market_cap=True, include_24hr_change=True, include_last_updated_at=True
+        )
+        assert poller.quotes["btc"]["usd"] == 50000
+    
+    def test_unchanged_quotes_not_emitted(self):
+        """Test that coins with the same last_updated_at are not reported again."""
+        # Setup mocks
+        poller = self._poller()
+        poller.poll_once()
+        self.clock.now += 5
+        
+        # Execute
+        changes = poller.poll_once()
+        
+        # Verify
+        assert changes == []
+        assert poller.stats["changes"] == 2
+        assert self.mock_api_client.get_coin_price.call_count == 2
+    
+    def test_changed_quote_emitted(self):
+        """Test that an updated coin is reported with its previous timestamp."""
+        # Setup mocks
+        poller = self._poller()
+        poller.poll_once()
+        self.clock.now += 5
+        self.quotes["bitcoin"] = _quote(50100, 1003)
+        
+        # Execute
+        changes = poller.poll_once()
+        
+        # Verify
+        assert len(changes) == 1
+        assert changes[0].coin_id == "bitcoin"
+        assert changes[0].price["usd"] == 50100
+        assert changes[0].previous_updated_at == 990
+    
+    def test_skips_coins_until_due(self):
+        """Test that coins are left out of polls until their next update is expected."""
+        # Setup mocks
+        poller = self._poller()
+        poller.poll_once()
+        self.clock.now = 1005
+        self.quotes = {"bitcoin": _quote(50100, 1004), "ethereum": _quote(3010, 1004)}
+        poller.poll_once()
+        # Learned periods: bitcoin 14 s, ethereum 9 s; bitcoin due at 1018, ethereum at 1013
+        self.clock.now = 1014
+        self.mock_api_client.get_coin_price.reset_mock()
+        
+        # Execute
+        poller.poll_once()
+        
+        # Verify
+        args, _ = self.mock_api_client.get_coin_price.call_args
+        assert args[0] == ["ethereum"]
+        assert poller.next_interval() == 5
+    
+    def test_no_request_when_nothing_due(self):
+        """Test that a poll with no due coins makes no request."""
+        # Setup mocks
+        poller = self._poller()
+        poller.poll_once()
+        self.mock_api_client.get_coin_price.reset_mock()
+        
+        # Execute
+        changes = poller.poll_once()
+        
+        # Verify
+        assert changes == []
+        self.mock_api_client.get_coin_price.assert_not_called()
+    
+    def test_next_interval_clamped(self):
+        """Test that the delay stays within the configured bounds."""
+        # Setup mocks
+        poller = self._poller()
+        poller.poll_once()
+        self.clock.now = 1010
+        self.quotes = {"bitcoin": _quote(1, 1000 + 990), "ethereum": _quote(1, 1000 + 995)}
+        poller.poll_once()
+        
+        # Execute
+        delay = poller.next_interval()
+        
+        # Verify
+        assert delay == 60
+    
+    def test_next_interval_waits_for_rate_limit(self):
+        """Test that the delay is stretched when the rate limiter is out of tokens."""
+        # Setup mocks
+        limiter = TokenBucket(rate=0.1, capacity=1)
+        limiter.try_acquire()
+        self.mock_api_client.rate_limiter = limiter
+        poller = self._poller()
+        poller.poll_once()
+        
+        # Execute
+        delay = poller.next_interval()
+        
+        # Verify
+        assert delay == pytest.approx(10, abs=0.5)
+    
+    def test_callback_and_iter_changes(self):
+        """Test that changes are delivered to the callback and yielded."""
+        # Setup mocks
+        received = []
+        poller = self._poller(callback=received.append)
+        
+        # Execute
+        changes = list(poller.iter_changes(max_polls=1))
+        
+        # Verify
+        assert len(changes) == 2
+        assert received == changes
+        assert poller.stats["polls"] == 1
+    
+    def test_failed_request_is_skipped(self):
+        """Test that a failed price request does not raise or report changes."""
+        # Setup mocks
+        self.mock_api_client.get_coin_price.side_effect = Exception("API error")
+        poller = self._poller()
+        
+        # Execute
+        changes = poller.poll_once()
+        
+        # Verify
+        assert changes == []
+    
+    def test_start_requires_callback(self):
+        """Test that background polling needs a callback."""
+        with pytest.raises(ValueError):
+            self._poller().start()
+    
+    def test_start_and_stop(self):
+        """Test polling in a background thread."""
+        # Setup mocks
+        delivered = threading.Event()
+        poller = self.crypto_info.poller(["btc"], callback=lambda change: delivered.set())
+        
+        # Execute
+        poller.start()
+        try:
+            assert delivered.wait(5)
+        finally:
+            poller.stop()
+        
+        # Verify
+        assert poller._thread is None
@@ -0,0 +1,128 @@
+"""
+Tests for the Portfolio class.
+"""
+import math
+import pytest
+from unittest.mock import Mock, patch
+
+from crypto_info import portfolio as portfolio_module
+from crypto_info.crypto_info import CryptoInfo
+from crypto_info.poller import PriceChange
+from crypto_info.symbol_index import SymbolIndex
+
+np = pytest.importorskip("numpy")
+
+COINS = [
+    {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+    {"id": "solana", "symbol": "sol", "name": "Solana"},
+]
+
+PRICES = {
+    "bitcoin": {"usd": 50000.0, "eur": 40000.0, "usd_24h_change": 25.0, "eur_24h_change": 25.0},
+    "ethereum": {"usd": 3000.0, "eur": 2400.0, "usd_24h_change": -25.0, "eur_24h_change": -25.0},
+}
+
+class TestPortfolio:
+    """Test cases for the Portfolio class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.api_client = Mock()
+        self.api_client.get_coin_price.return_value = PRICES
+        self.crypto_info = CryptoInfo(api_client=self.api_client, symbol_index=SymbolIndex.from_coins(COINS))
+
+    def test_batched_valuation(self):
+        """Test that all coins are priced in one request and valued in every currency."""
+        # Setup mocks
+        positions = [("BTC", 1.0), ("ETH", 10.0), ("btc", 1.0), ("SOL", 5.0), ("XYZ", 1.0)]
+
+        # Execute
+        portfolio = self.crypto_info.portfolio(positions, ["USD", "eur"])
+
+        # Verify
+        self.api_client.get_coin_price.assert_called_once()
+        assert portfolio.symbols == ["BTC", "ETH", "btc", "SOL"]
+        assert portfolio.values("usd").tolist() == [50000.0, 30000.0, 50000.0, 0.0]
+        assert portfolio.totals() == {"usd": 130000.0, "eur": 104000.0}
+        assert portfolio.weights("usd").sum() == pytest.approx(1.0)
+        assert portfolio.unpriced == ["SOL"]
+        assert list(portfolio.errors) == ["XYZ"]
+
+    def test_pnl_24h(self):
+        """Test that the 24h P&L is derived from the percentage change."""
+        portfolio = self.crypto_info.portfolio({"BTC": 1.0, "ETH": 10.0})
+
+        # 50000 is +25% on 40000; 30000 is -25% on 40000
+        assert portfolio.pnl_24h().tolist() == [10000.0, -10000.0]
+        assert portfolio.total_pnl_24h() == 0.0
+
+    def test_incremental_update(self):
+        """Test that applying price changes revalues only the affected positions."""
+        # Setup mocks
+        portfolio = self.crypto_info.portfolio({"BTC": 2.0, "ETH": 10.0, "eth": 1.0}, ["usd", "eur"])
+        change = PriceChange("ethereum", ["ETH"], {"usd": 4000.0, "eur": 3200.0, "usd_24h_change": 0.0}, 2, 1)
+
+        # Execute
+        revalued = portfolio.apply([change])
+
+        # Verify
+        assert revalued == 2
+        assert portfolio.values("usd").tolist() == [100000.0, 40000.0, 4000.0]
+        assert portfolio.total("usd") == 144000.0
+        assert portfolio.total_pnl_24h("usd") == pytest.approx(20000.0)
+        assert portfolio.apply({"dogecoin": {"usd": 1.0}}) == 0
+
+    def test_update_in_fewer_currencies(self):
+        """Test that currencies missing from an update keep their previous price."""
+        # Setup mocks
+        portfolio = self.crypto_info.portfolio({"BTC": 1.0, "ETH": 10.0}, ["usd", "eur"])
+        change = PriceChange("bitcoin", ["BTC"], {"usd": 60000.0, "last_updated_at": 2}, 2, 1)
+
+        # Execute
+        portfolio.apply([change])
+
+        # Verify
+        assert portfolio.totals() == {"usd": 90000.0, "eur": 64000.0}
+        assert portfolio.prices[0].tolist() == [60000.0, 40000.0]
+        assert portfolio.changes_24h[0].tolist() == [25.0, 25.0]
+        assert portfolio.unpriced == []
+
+    def test_set_quantity(self):
+        """Test that changing a quantity adjusts the totals."""
+        portfolio = self.crypto_info.portfolio({"BTC": 1.0, "ETH": 10.0})
+
+        portfolio.set_quantity("ETH", 0.0)
+
+        assert portfolio.total() == 50000.0
+        assert portfolio.weights().tolist() == [1.0, 0.0]
+        with pytest.raises(KeyError):
+            portfolio.set_quantity("SOL", 1.0)
+
+    def test_conversion(self):
+        """Test cross-currency conversion at rates implied by coin prices."""
+        portfolio = self.crypto_info.portfolio({"BTC": 1.0, "ETH": 1.0}, ["usd", "eur"])
+
+        rates = portfolio.conversion_rates("eur")
+
+        assert rates == {"usd": 1.25, "eur": 1.0}
+        assert portfolio.convert(np.array([100.0, 8.0]), "usd", "eur").tolist() == [80.0, 6.4]
+        with pytest.raises(ValueError):
+            portfolio.total("gbp")
+
+    def test_to_records(self):
+        """Test per-position records."""
+        self.api_client.get_coin_price.return_value = {"bitcoin": {"usd": 10.0}}
+
+        records = self.crypto_info.portfolio({"BTC": 3.0, "ETH": 1.0}).to_records()
+
+        assert records[0] == {"symbol": "BTC", "coin_id": "bitcoin", "quantity": 3.0, "price": 10.0,
+                              "value": 30.0, "weight": 1.0, "pnl_24h": 0.0}
+        assert records[1]["price"] is None
+        assert math.isnan(self.crypto_info.portfolio({"BTC": 1.0}, ["usd", "eur"]).conversion_rates()["eur"])
+
+    def test_without_numpy(self):
+        """Test that a missing NumPy is reported with an install hint."""
+        with patch.object(portfolio_module, "np", None):
+            with pytest.raises(ImportError, match="pip install"):
+                self.crypto_info.portfolio({"BTC": 1.0})
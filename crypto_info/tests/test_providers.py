@@ -0,0 +1,166 @@
+"""
+Tests for the multi-provider client.
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+from crypto_info.coingecko_client import CoinGeckoClient
+from crypto_info.crypto_info import CryptoInfo
+from crypto_info.providers import MultiProviderClient, PriceProvider
+from crypto_info.symbol_index import SymbolIndex
+
+def _provider(name, **methods):
+    """Create a mock provider with the given method side effects or return values."""
+    provider = Mock(spec=CoinGeckoClient)
+    provider.name = name
+    for method, behaviour in methods.items():
+        if callable(behaviour) or isinstance(behaviour, Exception):
+            getattr(provider, method).side_effect = behaviour
+        else:
+            getattr(provider, method).return_value = behaviour
+    return provider
+
+class TestMultiProviderClient:
+    """Test cases for the MultiProviderClient class."""
+    
+    def teardown_method(self):
+        client = getattr(self, "client", None)
+        if client is not None:
+            client.close()
+    
+    def test_primary_answers(self):
+        """Test that a healthy primary serves the call alone."""
+        # Setup mocks
+        primary = _provider("primary", get_coin_price={"bitcoin": {"usd": 1}})
+        secondary = _provider("secondary")
+        self.client = MultiProviderClient([primary, secondary], hedge_after=5)
+        
+        # Execute
+        result = self.client.get_coin_price(["bitcoin"], ["usd"])
+        
+        # Verify
+        assert result == {"bitcoin": {"usd": 1}}
+        secondary.get_coin_price.assert_not_called()
+        assert self.client.stats["wins"] == {"primary": 1, "secondary": 0}
+    
+    def test_hedges_slow_primary(self):
+        """Test that a slow primary is hedged and the first answer wins."""
+        # Setup mocks
+        release = threading.Event()
+        
+        def slow(*args, **kwargs):
+            release.wait(5)
+            return {"bitcoin": {"usd": 1}}
+        
+        primary = _provider("primary", get_coin_price=slow)
+        secondary = _provider("secondary", get_coin_price={"bitcoin": {"usd": 2}})
+        self.client = MultiProviderClient([primary, secondary], hedge_after=0.01)
+        
+        # Execute
+        try:
+            result = self.client.get_coin_price(["bitcoin"], ["usd"], include_market_cap=True)
+        finally:
+            release.set()
+        
+        # Verify
+        assert result == {"bitcoin": {"usd": 2}}
+        secondary.get_coin_price.assert_called_once_with(
+            ["bitcoin"], ["usd"], include_market_cap=True, include_24hr_vol=False,
+            include_24hr_change=False, include_last_updated_at=False
+        )
+        assert self.client.stats["hedged"] == 1
+    
+    def test_falls_back_on_failure(self):
+        """Test that a failed primary call is retried on the next provider."""
+        # Setup mocks
+        primary = _provider("primary", search_coins=ConnectionError("down"))
+        secondary = _provider("secondary", search_coins={"coins": [{"id": "bitcoin", "symbol": "btc"}]})
+        self.client = MultiProviderClient([primary, secondary], hedge_after=None)
+        
+        # Execute
+        result = self.client.search_coins("btc")
+        
+        # Verify
+        assert result["coins"][0]["id"] == "bitcoin"
+        assert self.client.stats["fallbacks"] == 1
+    
+    def test_all_providers_fail(self):
+        """Test that the last error is raised when every provider fails."""
+        # Setup mocks
+        primary = _provider("primary", get_coin_price=ConnectionError("primary down"))
+        secondary = _provider("secondary", get_coin_price=ConnectionError("secondary down"))
+        self.client = MultiProviderClient([primary, secondary], hedge_after=None)
+        
+        # Execute / Verify
+        with pytest.raises(ConnectionError, match="secondary down"):
+            self.client.get_coin_price(["bitcoin"], ["usd"])
+    
+    def test_routes_around_open_breaker(self):
+        """Test that providers with open breakers are skipped."""
+        # Setup mocks
+        primary = _provider("primary", get_coin_price=ConnectionError("down"))
+        secondary = _provider("secondary", get_coin_price={"bitcoin": {"usd": 2}})
+        self.client = MultiProviderClient([primary, secondary], hedge_after=None,
+                                          failure_threshold=2, reset_timeout=60)
+        for _ in range(2):
+            self.client.get_coin_price(["bitcoin"], ["usd"])
+        assert self.client.breakers["primary"].state == OPEN
+        primary.get_coin_price.reset_mock()
+        
+        # Execute
+        result = self.client.get_coin_price(["bitcoin"], ["usd"])
+        
+        # Verify
+        assert result == {"bitcoin": {"usd": 2}}
+        primary.get_coin_price.assert_not_called()
+        assert self.client.stats["skipped"] == 1
+    
+    def test_all_breakers_open(self):
+        """Test that a call fails fast when no provider is available."""
+        # Setup mocks
+        breaker = CircuitBreaker("primary", failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        primary = _provider("primary")
+        self.client = MultiProviderClient([primary], breakers={"primary": breaker})
+        
+        # Execute / Verify
+        with pytest.raises(CircuitOpenError):
+            self.client.get_coin_price(["bitcoin"], ["usd"])
+        primary.get_coin_price.assert_not_called()
+    
+    def test_other_endpoints_use_primary(self):
+        """Test that endpoints outside the provider interface go to the primary."""
+        # Setup mocks
+        primary = _provider("primary", get_coin_by_id={"id": "bitcoin"})
+        primary.rate_limiter = Mock()
+        secondary = _provider("secondary")
+        self.client = MultiProviderClient([primary, secondary])
+        
+        # Execute / Verify
+        assert self.client.get_coin_by_id("bitcoin") == {"id": "bitcoin"}
+        assert self.client.rate_limiter is primary.rate_limiter
+        secondary.get_coin_by_id.assert_not_called()
+    
+    def test_requires_provider(self):
+        """Test that an empty provider list is rejected."""
+        with pytest.raises(ValueError):
+            MultiProviderClient([])
+    
+    def test_with_crypto_info(self):
+        """Test using the client as the CryptoInfo api_client."""
+        # Setup mocks
+        primary = _provider("primary", get_coin_price=ConnectionError("down"))
+        secondary = _provider("secondary", get_coin_price={"bitcoin": {"usd": 2}})
+        self.client = MultiProviderClient([primary, secondary], hedge_after=None)
+        index = SymbolIndex.from_coins([{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"}])
+        crypto_info = CryptoInfo(api_client=self.client, symbol_index=index)
+        
+        # Execute / Verify
+        assert crypto_info.get_price("btc") == {"usd": 2}
+
+def test_coingecko_client_is_provider():
+    """Test that the CoinGecko client implements the provider interface."""
+    assert issubclass(CoinGeckoClient, PriceProvider)
+    assert CoinGeckoClient.name == "coingecko"
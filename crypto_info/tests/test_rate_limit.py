@@ -0,0 +1,87 @@
+"""
+Tests for the rate limiting and retry helpers.
+"""
+import pytest
+from unittest.mock import patch
+
+from crypto_info.rate_limit import (
+    TokenBucket, RetryBudget, RetryPolicy, get_shared_limiter, parse_retry_after
+)
+from crypto_info.tests.conftest import FakeClock
+
+class TestTokenBucket:
+    """Test cases for the TokenBucket class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, capacity=2, clock=self.clock, sleep=self.clock.sleep)
+    
+    def test_burst_then_wait(self):
+        """Test that a burst is served immediately and later calls wait."""
+        assert self.bucket.try_acquire() == 0
+        assert self.bucket.try_acquire() == 0
+        assert self.bucket.try_acquire() == pytest.approx(0.5)
+        
+        assert self.bucket.acquire()
+        assert self.clock.sleeps == [pytest.approx(0.5)]
+    
+    def test_acquire_timeout(self):
+        """Test that acquire gives up after the timeout."""
+        self.bucket.penalize(10)
+        
+        assert not self.bucket.acquire(timeout=1)
+        assert self.clock.now == pytest.approx(1)
+    
+    def test_penalize_blocks_and_drains(self):
+        """Test that a penalty pauses callers and empties the bucket."""
+        self.bucket.penalize(3)
+        
+        assert self.bucket.available == 0
+        assert self.bucket.try_acquire() == pytest.approx(3)
+        
+        self.clock.now = 3.5
+        assert self.bucket.available == pytest.approx(1)
+    
+    def test_invalid_configuration(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+    
+    def test_shared_limiter(self):
+        """Test that limiters are shared per name."""
+        first = get_shared_limiter("test-provider", 1, 5)
+        
+        assert get_shared_limiter("test-provider", 100, 100) is first
+        assert first.rate == 1
+
+class TestRetryPolicy:
+    """Test cases for the retry policy helpers."""
+    
+    def test_compute_delay_full_jitter(self):
+        """Test that the exponential ceiling bounds the jittered delay."""
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+        
+        with patch('crypto_info.rate_limit.random.uniform', side_effect=lambda a, b: b):
+            assert policy.compute_delay(0) == 1
+            assert policy.compute_delay(2) == 4
+            assert policy.compute_delay(10) == 5
+            assert policy.compute_delay(0, retry_after=2) == 3
+    
+    def test_retry_budget(self):
+        """Test that retries are capped by the budget."""
+        budget = RetryBudget(ratio=0.5, min_tokens=1)
+        
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+        
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_withdraw()
+    
+    def test_parse_retry_after(self):
+        """Test parsing Retry-After values."""
+        assert parse_retry_after("120") == 120
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
@@ -0,0 +1,118 @@
+"""
+Tests for the SingleFlight class.
+"""
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto_info.deadline import DeadlineExceeded, deadline
+from crypto_info.singleflight import SingleFlight
+
+class TestSingleFlight:
+    """Test cases for the SingleFlight class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.group = SingleFlight()
+    
+    def _run_concurrently(self, fn, key="btc", callers=5):
+        """Start callers that block in fn until all of them have joined the call."""
+        release = threading.Event()
+        
+        def blocking():
+            release.wait(5)
+            return fn()
+        
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(self.group.do, key, blocking) for _ in range(callers)]
+            while self.group.stats["coalesced"] < callers - 1:
+                threading.Event().wait(0.001)
+            release.set()
+        return futures
+    
+    def test_concurrent_calls_share_result(self):
+        """Test that concurrent identical calls run once."""
+        calls = []
+        
+        def fn():
+            calls.append(1)
+            return {"usd": 50000}
+        
+        futures = self._run_concurrently(fn)
+        
+        assert [f.result() for f in futures] == [{"usd": 50000}] * 5
+        assert len(calls) == 1
+        assert self.group.stats == {"executed": 1, "coalesced": 4, "in_flight": 0}
+    
+    def test_concurrent_calls_share_exception(self):
+        """Test that every waiting caller receives the exception."""
+        def fn():
+            raise ConnectionError("upstream down")
+        
+        futures = self._run_concurrently(fn, callers=3)
+        
+        for future in futures:
+            with pytest.raises(ConnectionError):
+                future.result()
+    
+    def test_sequential_calls_are_not_coalesced(self):
+        """Test that a finished call does not serve later callers."""
+        assert self.group.do("btc", lambda: 1) == 1
+        assert self.group.do("btc", lambda: 2) == 2
+        assert self.group.stats["executed"] == 2
+    
+    def test_follower_gives_up_at_its_deadline(self):
+        """Test that a waiting caller stops at its own deadline while the leader carries on."""
+        # Setup mocks
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow():
+            started.set()
+            release.wait(5)
+            return 1
+        
+        def follower():
+            with deadline(0.05):
+                return self.group.do("btc", lambda: 2)
+        
+        # Execute
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(self.group.do, "btc", slow)
+            started.wait(5)
+            waiting = executor.submit(follower)
+            
+            # Verify
+            with pytest.raises(DeadlineExceeded):
+                waiting.result(timeout=5)
+            assert not leader.done()
+            release.set()
+            assert leader.result(timeout=5) == 1
+    
+    def test_leader_deadline_is_not_shared(self):
+        """Test that callers waiting on a leader cut short by its deadline run the call again."""
+        # Setup mocks
+        calls = []
+        
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                raise DeadlineExceeded("leader out of time")
+            # Hold the retried call until the other follower has joined it
+            while self.group.stats["coalesced"] < 3:
+                threading.Event().wait(0.001)
+            return {"usd": 50000}
+        
+        # Execute
+        futures = self._run_concurrently(fn, callers=3)
+        
+        # Verify
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except DeadlineExceeded:
+                results.append("deadline")
+        assert sorted(map(str, results)) == ["deadline"] + [str({"usd": 50000})] * 2
+        assert len(calls) == 2
+        assert self.group.stats["in_flight"] == 0
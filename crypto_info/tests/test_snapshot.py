@@ -0,0 +1,90 @@
+"""
+Tests for the PriceSnapshot class.
+"""
+import pytest
+from unittest.mock import patch
+
+from crypto_info import snapshot as snapshot_module
+from crypto_info.snapshot import PriceSnapshot
+
+class TestPriceSnapshot:
+    """Test cases for the PriceSnapshot class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.snapshot = PriceSnapshot(["usd", "eur"])
+        self.snapshot.add_coin({
+            "id": "bitcoin",
+            "name": "Bitcoin",
+            "symbol": "btc",
+            "market_cap_rank": 1,
+            "last_updated": "2023-01-01T00:00:00Z",
+            "market_data": {
+                "current_price": {"usd": 50000, "eur": 42000, "jpy": 7000000},
+                "market_cap": {"usd": 1000000000},
+                "price_change_24h": 1000,
+                "price_change_percentage_24h": 2.0
+            }
+        })
+        self.snapshot.add_price("ethereum", {
+            "usd": 3000, "usd_market_cap": 400000000, "usd_24h_vol": 1000, "usd_24h_change": -1.5,
+            "eur": 2500, "last_updated_at": 1672531200
+        })
+        self.snapshot.add_market({"id": "solana", "symbol": "sol", "name": "Solana",
+                                  "current_price": 20, "market_cap": 8000000,
+                                  "market_cap_rank": 5}, "usd")
+    
+    def test_value_and_column(self):
+        """Test point and column queries."""
+        assert self.snapshot.value("bitcoin", "current_price", "EUR") == 42000
+        assert self.snapshot.value("solana", "current_price", "eur") is None
+        assert list(self.snapshot.column("current_price", "usd")) == [50000, 3000, 20]
+        assert len(self.snapshot) == 3
+        assert "ethereum" in self.snapshot
+    
+    def test_untracked_currency_is_skipped(self):
+        """Test that values in other currencies are not stored."""
+        with pytest.raises(KeyError):
+            self.snapshot.value("bitcoin", "current_price", "jpy")
+        assert self.snapshot.nbytes == 3 * (5 * 2 + 3) * 8
+    
+    def test_top_n(self):
+        """Test ranking by market cap."""
+        assert self.snapshot.top_n(2) == [("bitcoin", 1000000000), ("ethereum", 400000000)]
+        assert self.snapshot.top_n(10, "total_volume") == [("ethereum", 1000)]
+    
+    def test_top_n_without_numpy(self):
+        """Test the pure Python ranking fallback."""
+        with patch.object(snapshot_module, "np", None):
+            assert self.snapshot.top_n(2) == [("bitcoin", 1000000000), ("ethereum", 400000000)]
+            with pytest.raises(ImportError):
+                self.snapshot.to_numpy("current_price")
+    
+    def test_to_numpy(self):
+        """Test NumPy conversion."""
+        pytest.importorskip("numpy")
+        
+        matrix = self.snapshot.to_numpy("current_price")
+        assert matrix.shape == (3, 2)
+        assert matrix[0, 1] == 42000
+        assert list(self.snapshot.to_numpy("current_price", "usd")) == [50000, 3000, 20]
+        assert list(self.snapshot.to_numpy("market_cap_rank"))[::2] == [1, 5]
+        
+        # Adding coins still works after a conversion
+        self.snapshot.add_price("dogecoin", {"usd": 0.1})
+        assert self.snapshot.value("dogecoin", "current_price", "usd") == 0.1
+    
+    def test_to_dict(self):
+        """Test conversion back to the get_crypto_info shape."""
+        bitcoin = self.snapshot.to_dict("bitcoin")
+        assert bitcoin["symbol"] == "BTC"
+        assert bitcoin["current_price"] == {"usd": 50000, "eur": 42000}
+        assert bitcoin["market_cap"] == {"usd": 1000000000}
+        assert bitcoin["total_volume"] == {}
+        assert bitcoin["market_cap_rank"] == 1
+        assert bitcoin["price_change_24h"] == 1000
+        
+        ethereum = self.snapshot.to_dict("ethereum")
+        assert ethereum["price_change_percentage_24h"] == -1.5
+        assert ethereum["market_cap_rank"] is None
+        assert ethereum["last_updated"] == "2023-01-01T00:00:00.000Z"
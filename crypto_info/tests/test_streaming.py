@@ -0,0 +1,325 @@
+"""
+Tests for streaming price subscriptions.
+"""
+import asyncio
+import json
+import socket
+import socketserver
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.crypto_info import CryptoInfo
+from crypto_info.streaming import NDJSONTransport, PriceFeed, StreamTransport, POLLING, STREAM
+from crypto_info.symbol_index import SymbolIndex
+
+COINS = [
+    {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+]
+
+def wait_until(condition, timeout=5.0):
+    """Wait for a condition set by another thread."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
+
+class FakeFeedHandler(socketserver.StreamRequestHandler):
+    """Handler serving one subscriber of the NDJSON feed protocol."""
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        assert request["op"] == "subscribe"
+        client = (self.wfile, set(request["ids"]), self.request)
+        with self.server.lock:
+            self.server.subscriptions.append(request["ids"])
+            self.server.clients.append(client)
+        try:
+            # Block until the client disconnects or the server drops it
+            while self.rfile.readline():
+                pass
+        except OSError:
+            pass
+        finally:
+            with self.server.lock:
+                if client in self.server.clients:
+                    self.server.clients.remove(client)
+
+class FakeFeedServer(socketserver.ThreadingTCPServer):
+    """Local NDJSON price feed whose quotes are published by the test."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeFeedHandler)
+        self.lock = threading.Lock()
+        self.clients = []
+        self.subscriptions = []
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def publish(self, coin_id, **quote):
+        """Send a quote to every client subscribed to the coin."""
+        line = (json.dumps(dict(quote, id=coin_id)) + "\n").encode()
+        with self.lock:
+            for wfile, ids, _ in self.clients:
+                if coin_id in ids:
+                    wfile.write(line)
+                    wfile.flush()
+
+    def drop_clients(self):
+        """Close every client connection, as a server restart would."""
+        with self.lock:
+            clients, self.clients = self.clients, []
+        for _, _, sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self):
+        self.drop_clients()
+        self.shutdown()
+        self.server_close()
+
+@pytest.fixture
+def feed_server():
+    server = FakeFeedServer()
+    yield server
+    server.close()
+
+def make_crypto_info(transport=None):
+    api_client = Mock()
+    api_client.rate_limiter = None
+    return CryptoInfo(api_client=api_client, symbol_index=SymbolIndex.from_coins(COINS),
+                      stream_transport=transport)
+
+class TestStreamingSubscriptions:
+    """Test cases for subscriptions backed by a stream."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.crypto_info = None
+
+    def teardown_method(self):
+        """Stop the feeds started by the test."""
+        if self.crypto_info is not None:
+            self.crypto_info.close_subscriptions()
+
+    def connect(self, feed_server):
+        self.crypto_info = make_crypto_info(NDJSONTransport("127.0.0.1", feed_server.port, idle_timeout=5))
+        return self.crypto_info
+
+    def test_updates_are_streamed(self, feed_server):
+        """Test that quotes pushed by the server reach the subscriber."""
+        # Setup mocks
+        subscription = self.connect(feed_server).subscribe(["BTC", "ETH"])
+        wait_until(lambda: feed_server.clients)
+
+        # Execute
+        feed_server.publish("bitcoin", usd=50000.0, last_updated_at=100)
+        change = subscription.get(timeout=5)
+
+        # Verify
+        assert change.coin_id == "bitcoin"
+        assert change.symbols == ["BTC"]
+        assert change.price == {"usd": 50000.0, "last_updated_at": 100}
+        assert feed_server.subscriptions == [["bitcoin", "ethereum"]]
+        self.crypto_info.api_client.get_coin_price.assert_not_called()
+
+    def test_fan_out_from_one_connection(self, feed_server):
+        """Test that subscribers to the same coins share one upstream connection."""
+        crypto_info = self.connect(feed_server)
+        first = crypto_info.subscribe(["BTC"])
+        wait_until(lambda: feed_server.clients)
+        second = crypto_info.subscribe(["btc"])
+
+        feed_server.publish("bitcoin", usd=1.0, last_updated_at=1)
+
+        assert first.get(timeout=5).price["usd"] == 1.0
+        assert second.get(timeout=5).symbols == ["btc"]
+        assert len(feed_server.subscriptions) == 1
+
+    def test_new_coin_resubscribes(self, feed_server):
+        """Test that subscribing to another coin widens the upstream subscription."""
+        crypto_info = self.connect(feed_server)
+        crypto_info.subscribe(["BTC"])
+        wait_until(lambda: feed_server.clients)
+
+        subscription = crypto_info.subscribe(["ETH"])
+        wait_until(lambda: len(feed_server.subscriptions) == 2 and feed_server.clients)
+        feed_server.publish("ethereum", usd=3000.0, last_updated_at=5)
+
+        assert subscription.get(timeout=5).coin_id == "ethereum"
+        assert sorted(feed_server.subscriptions[-1]) == ["bitcoin", "ethereum"]
+
+    def test_slow_consumer_gets_coalesced_updates(self, feed_server):
+        """Test that unconsumed updates for a coin are replaced by the latest one."""
+        subscription = self.connect(feed_server).subscribe(["BTC"])
+        wait_until(lambda: feed_server.clients)
+
+        # Execute
+        for second in range(1, 4):
+            feed_server.publish("bitcoin", usd=float(second), last_updated_at=second)
+        wait_until(lambda: subscription.stats["received"] == 3)
+        change = subscription.get(timeout=5)
+
+        # Verify
+        assert change.price["usd"] == 3.0
+        assert change.previous_updated_at is None
+        assert subscription.stats["coalesced"] == 2
+        assert subscription.get(timeout=0.05) is None
+
+    def test_duplicates_are_dropped(self, feed_server):
+        """Test that a resent quote is not delivered twice."""
+        subscription = self.connect(feed_server).subscribe(["BTC"])
+        wait_until(lambda: feed_server.clients)
+
+        feed_server.publish("bitcoin", usd=1.0, last_updated_at=10)
+        first = subscription.get(timeout=5)
+        feed_server.publish("bitcoin", usd=1.0, last_updated_at=10)
+        feed_server.publish("bitcoin", usd=2.0, last_updated_at=20)
+        second = subscription.get(timeout=5)
+
+        assert first.last_updated_at == 10
+        assert (second.last_updated_at, second.previous_updated_at) == (20, 10)
+        assert subscription.feed.stats["duplicates"] == 1
+
+    def test_callback_and_snapshot(self, feed_server):
+        """Test callback delivery and that new subscribers receive the latest quote."""
+        crypto_info = self.connect(feed_server)
+        received = []
+        crypto_info.subscribe(["BTC"], callback=received.append)
+        wait_until(lambda: feed_server.clients)
+        feed_server.publish("bitcoin", usd=7.0, last_updated_at=7)
+        wait_until(lambda: received)
+
+        late = crypto_info.subscribe(["BTC"])
+
+        assert received[0].price["usd"] == 7.0
+        assert late.get(timeout=5).price["usd"] == 7.0
+
+    def test_reconnects_after_disconnect(self, feed_server):
+        """Test that a dropped stream is reopened after polling in between."""
+        crypto_info = make_crypto_info()
+        crypto_info.api_client.get_coin_price.return_value = {}
+        feed = PriceFeed(crypto_info, transport=NDJSONTransport("127.0.0.1", feed_server.port),
+                         retry_delay=0.1, min_interval=0.05)
+        try:
+            subscription = feed.subscribe(["BTC"])
+            wait_until(lambda: feed_server.clients)
+
+            # Execute
+            feed_server.drop_clients()
+            wait_until(lambda: feed.stats["stream_failures"] == 1)
+            wait_until(lambda: feed_server.clients)
+            feed_server.publish("bitcoin", usd=2.0, last_updated_at=2)
+
+            # Verify
+            assert subscription.get(timeout=5).price["usd"] == 2.0
+            assert feed.stats["stream_connects"] == 2
+            assert feed.mode == STREAM
+        finally:
+            feed.close()
+
+    def test_async_iteration(self, feed_server):
+        """Test consuming a subscription with async for."""
+        subscription = self.connect(feed_server).subscribe(["BTC"])
+        wait_until(lambda: feed_server.clients)
+
+        async def consume():
+            changes = []
+            async for change in subscription:
+                changes.append(change.price["usd"])
+                if len(changes) == 2:
+                    subscription.close()
+            return changes
+
+        async def main():
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.05)
+            feed_server.publish("bitcoin", usd=1.0, last_updated_at=1)
+            await asyncio.sleep(0.05)
+            feed_server.publish("bitcoin", usd=2.0, last_updated_at=2)
+            return await asyncio.wait_for(task, 5)
+
+        assert asyncio.run(main()) == [1.0, 2.0]
+
+class TestPollingFallback:
+    """Test cases for subscriptions without a stream."""
+
+    def test_polls_without_transport(self):
+        """Test that subscriptions poll changed quotes when no stream is configured."""
+        # Setup mocks
+        crypto_info = make_crypto_info()
+        crypto_info.api_client.get_coin_price.return_value = {
+            "bitcoin": {"usd": 50000.0, "last_updated_at": 100}
+        }
+
+        # Execute
+        with crypto_info.subscribe(["BTC", "XYZ"]) as subscription:
+            change = subscription.get(timeout=5)
+
+        # Verify
+        assert change.price["usd"] == 50000.0
+        assert "XYZ" in subscription.errors
+        assert subscription.closed
+        crypto_info.close_subscriptions()
+
+    def test_unreachable_stream_falls_back_to_polling(self):
+        """Test that prices are polled while the stream cannot be reached."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        crypto_info = make_crypto_info()
+        crypto_info.api_client.get_coin_price.return_value = {
+            "bitcoin": {"usd": 1.0, "last_updated_at": 1}
+        }
+        feed = PriceFeed(crypto_info, transport=NDJSONTransport("127.0.0.1", port), retry_delay=60)
+        try:
+            subscription = feed.subscribe(["BTC"])
+
+            assert subscription.get(timeout=5).price["usd"] == 1.0
+            assert feed.mode == POLLING
+            assert feed.stats["stream_failures"] == 1
+        finally:
+            feed.close()
+
+    def test_plain_iterator_stream(self):
+        """Test that a transport may return an iterator without close()."""
+        # Setup mocks
+        class ListTransport(StreamTransport):
+            name = 'list'
+
+            def __init__(self):
+                self.closed = threading.Event()
+
+            def stream(self, coin_ids, vs_currencies):
+                return iter([("bitcoin", {"usd": 1.0, "last_updated_at": 1})])
+
+            def close(self):
+                self.closed.set()
+
+        transport = ListTransport()
+        crypto_info = make_crypto_info()
+        crypto_info.api_client.get_coin_price.return_value = {}
+        feed = PriceFeed(crypto_info, transport=transport, retry_delay=60)
+
+        # Execute
+        try:
+            subscription = feed.subscribe(["BTC"])
+            change = subscription.get(timeout=5)
+
+            # Verify
+            assert change.price["usd"] == 1.0
+            assert transport.closed.wait(5)
+            wait_until(lambda: feed.mode == POLLING)
+            assert feed.stats["stream_failures"] == 1
+        finally:
+            feed.close()
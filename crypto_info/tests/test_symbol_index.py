@@ -0,0 +1,124 @@
+"""
+Tests for the SymbolIndex class.
+"""
+import pytest
+from unittest.mock import Mock
+
+from crypto_info.symbol_index import SymbolIndex
+
+class TestSymbolIndex:
+    """Test cases for the SymbolIndex class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.coins = [
+            {"id": "bitcoin-avalanche-bridged-btc-b", "symbol": "btc.b", "name": "Bridged BTC"},
+            {"id": "batcat", "symbol": "btc", "name": "batcat"},
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+            {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+            {"id": "ethereum-wormhole", "symbol": "eth", "name": "Ethereum (Wormhole)"}
+        ]
+    
+    def test_lookup_prefers_ranked_coins(self):
+        """Test that ranked coins win ties over unranked ones."""
+        index = SymbolIndex.from_coins(self.coins, ranks={"bitcoin": 1})
+        
+        assert index.lookup("BTC") == "bitcoin"
+        assert index.candidates("btc") == ["bitcoin", "batcat"]
+    
+    def test_lookup_unranked_tie_break(self):
+        """Test that unranked ties go to the shortest, then smallest ID."""
+        index = SymbolIndex.from_coins(self.coins)
+        
+        assert index.lookup("eth") == "ethereum"
+        assert index.lookup("btc") == "batcat"
+        assert index.lookup("unknown") is None
+    
+    def test_save_and_lazy_load(self, tmp_path):
+        """Test round-tripping the index through its file."""
+        path = str(tmp_path / "symbol_index.json.gz")
+        SymbolIndex.from_coins(self.coins, ranks={"bitcoin": 1}).save(path)
+        
+        index = SymbolIndex(path)
+        assert index._coins is None
+        
+        assert index.lookup("btc") == "bitcoin"
+        assert len(index) == 5
+        assert "ETH" in index
+    
+    def test_missing_file_is_empty(self, tmp_path):
+        """Test that a missing index file yields an empty index."""
+        index = SymbolIndex(str(tmp_path / "missing.json.gz"))
+        
+        assert index.lookup("btc") is None
+        assert len(index) == 0
+    
+    def test_save_without_path(self):
+        """Test saving an in-memory index without a path."""
+        with pytest.raises(ValueError):
+            SymbolIndex.from_coins(self.coins).save()
+    
+    def test_build(self):
+        """Test building the index from the API."""
+        api_client = Mock()
+        api_client.get_coins_list.return_value = self.coins
+        api_client.get_coins_markets.return_value = [
+            {"id": "bitcoin", "market_cap_rank": 1},
+            {"id": "ethereum", "market_cap_rank": 2}
+        ]
+        
+        index = SymbolIndex.build(api_client, rank_pages=3)
+        
+        # A short page ends the ranking early
+        api_client.get_coins_markets.assert_called_once_with("usd", per_page=250, page=1)
+        assert index.lookup("btc") == "bitcoin"
+
+class TestSymbolSearch:
+    """Test cases for prefix and fuzzy search."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        coins = [
+            {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+            {"id": "bitcoin-cash", "symbol": "bch", "name": "Bitcoin Cash"},
+            {"id": "bitget-token", "symbol": "bgb", "name": "Bitget Token"},
+            {"id": "batcat", "symbol": "btc", "name": "batcat"},
+            {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+            {"id": "ethena", "symbol": "ena", "name": "Ethena"},
+            {"id": "shiba-inu", "symbol": "shib", "name": "Shiba Inu"},
+            {"id": "dogecoin", "symbol": "doge", "name": "Dogecoin"}
+        ]
+        ranks = {"bitcoin": 1, "ethereum": 2, "dogecoin": 8, "shiba-inu": 15,
+                 "bitcoin-cash": 17, "ethena": 30, "bitget-token": 40}
+        self.index = SymbolIndex.from_coins(coins, ranks)
+    
+    def ids(self, query, limit=10):
+        return [coin["id"] for coin in self.index.search(query, limit)]
+    
+    def test_exact_symbol_first(self):
+        """Test that exact symbol matches come first, by market cap rank."""
+        assert self.ids("BTC", limit=2) == ["bitcoin", "batcat"]
+    
+    def test_prefix_ranked_by_market_cap(self):
+        """Test that prefixes of names and IDs are ordered by market cap rank."""
+        assert self.ids("bit") == ["bitcoin", "bitcoin-cash", "bitget-token"]
+        assert self.ids("eth") == ["ethereum", "ethena"]
+    
+    def test_name_words(self):
+        """Test that later words of a name match as prefixes."""
+        assert self.ids("inu") == ["shiba-inu"]
+        assert self.ids("shiba i") == ["shiba-inu"]
+    
+    def test_typos(self):
+        """Test that misspelled names are found by trigram similarity."""
+        assert self.ids("bitcion")[0] == "bitcoin"
+        assert self.ids("dogecion") == ["dogecoin"]
+        assert self.ids("zzzzzz") == []
+    
+    def test_result_shape_and_limit(self):
+        """Test the returned coin dictionaries and the limit."""
+        results = self.index.search("b", limit=1)
+        
+        assert results == [{"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "market_cap_rank": 1}]
+        assert self.index.search("   ") == []
+        assert self.index.search("btc", limit=0) == []
@@ -81,9 +81,14 @@ def get_multiple_prices(symbols):
         print("Cryptocurrency Prices")
         print(f"{'=' * 50}")
         
+        # One batched request instead of one request per symbol
+        prices = crypto_client.get_prices(symbols)
+        
         for symbol in symbols:
             try:
-                price_data = crypto_client.get_price(symbol)
+                price_data = prices[symbol]
+                if 'error' in price_data:
+                    raise ValueError(price_data['error'])
                 print(f"{symbol}:")
                 if 'usd' in price_data:
                     print(f"  USD: ${price_data['usd']:,.2f}")
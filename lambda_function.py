@@ -1,46 +1,100 @@
+import time
+
+_INIT_START = time.perf_counter()
+
 import json
+import logging
+import os
 
 from crypto_info import CryptoInfo
+from crypto_info.deadline import deadline
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+HEADERS = {
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
+}
+
+# Set CRYPTO_INFO_PREWARM=1 to load the symbol index and open the TLS
+# connection during init instead of on the first invocation
+PREWARM = os.environ.get('CRYPTO_INFO_PREWARM', '0') == '1'
+
+# Time kept back from the invocation's remaining time to return a response
+# before Lambda kills the invocation
+DEADLINE_MARGIN_MS = 500
+
+# Kept at module scope so warm invocations reuse the HTTP session, its pooled
+# connections, the symbol index and the resolved symbol cache
+crypto_info = CryptoInfo()
+
+def _prewarm():
+    """Load the symbol index and open the connection to the API."""
+    crypto_info.symbol_index.lookup('btc')
+    try:
+        crypto_info.api_client.ping()
+    except Exception as err:
+        logger.warning(f"Pre-warming the API connection failed: {err}")
+
+if PREWARM:
+    _prewarm()
+
+INIT_MS = (time.perf_counter() - _INIT_START) * 1000
+_cold_start = True
+
+def _response(status_code, body, handler_ms, cold_start):
+    """Build an API Gateway response with init and handler timings."""
+    server_timing = f"handler;dur={handler_ms:.1f}"
+    if cold_start:
+        server_timing = f"init;dur={INIT_MS:.1f}, {server_timing}"
+
+    return {
+        'statusCode': status_code,
+        'headers': dict(HEADERS, **{'Server-Timing': server_timing}),
+        'body': json.dumps(body)
+    }
+
+def _time_budget(context):
+    """Get the seconds the handler may spend on API calls, or None outside Lambda."""
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if get_remaining is None:
+        return None
+    return max(0, get_remaining() - DEADLINE_MARGIN_MS) / 1000
 
 def lambda_handler(event, context):
+    global _cold_start
+    start = time.perf_counter()
+    cold_start, _cold_start = _cold_start, False
 
-    symbol = None
     try:
-        query_params = event.get('queryStringParameters', {})
-        print(query_params)
-        if query_params:
-            symbol = query_params.get('symbol', 'default_value_if_missing')
-
-        if symbol is None:
-            return {
-                    'statusCode': 404,
-                    'headers': {
-                        'Access-Control-Allow-Headers': '*',
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
-                    },
-                    'body': json.dumps("input variable is missing")
-            }
-
-
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Headers': '*',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
-            },
-            'body': json.dumps(CryptoInfo().get_price(symbol))
-        }
+        query_params = event.get('queryStringParameters') or {}
+        symbol = query_params.get('symbol')
+        symbols = query_params.get('symbols')
+
+        if symbols:
+            status_code = 200
+            with deadline(_time_budget(context)):
+                body = crypto_info.get_prices([s.strip() for s in symbols.split(',') if s.strip()])
+        elif symbol:
+            status_code = 200
+            with deadline(_time_budget(context)):
+                body = crypto_info.get_price(symbol)
+        else:
+            status_code = 404
+            body = "input variable is missing"
 
     except Exception as err:
-        return {
-            'statusCode': 404,
-            'headers': {
-                'Access-Control-Allow-Headers': '*',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
-            },
-            'body': json.dumps(f"Something is error while processing, {err}")
-        }
-    
\ No newline at end of file
+        status_code = 404
+        body = f"Something is error while processing, {err}"
+
+    handler_ms = (time.perf_counter() - start) * 1000
+    logger.info(json.dumps({
+        'cold_start': cold_start,
+        'init_ms': round(INIT_MS, 1) if cold_start else None,
+        'handler_ms': round(handler_ms, 1),
+        'status_code': status_code,
+    }))
+
+    return _response(status_code, body, handler_ms, cold_start)
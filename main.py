@@ -27,8 +27,6 @@ def example():
     print(f"VIRTUAL Price (USD): ${price_data['usd']}")
 
 def main(symbol: str) -> dict:
-    import _json
-
     from crypto_info import CryptoInfo
 
     # Initialize the client
@@ -37,4 +35,8 @@ def main(symbol: str) -> dict:
 
 
 if __name__ == "__main__":
-    print(main("VIRTUAL"))
+    import sys
+    from crypto_info.cli import main as cli_main
+
+    # e.g. python main.py BTC ETH (VIRTUAL by default); use python -m crypto_info for symbol files
+    sys.exit(cli_main(['--symbols', ','.join(sys.argv[1:]) or 'VIRTUAL']))